@@ -1,19 +1,138 @@
+import dis
+import itertools
+import sys
 import numpy as np
 
+# Seed vectors of scalar seeds, shared so that lazy variables created separately combine lazily
+_SEEDS = {}
+
+def _seedVector(n, seed):
+	try:
+		return _SEEDS[n, seed]
+	except KeyError:
+		vector = np.full(n, float(seed))
+		vector.flags.writeable = False
+		_SEEDS[n, seed] = vector
+		return vector
+
+def _identity(n, seed=1):
+	# seed times the n x n identity as a read-only view of one array of length 2n - 1,
+	# whose row k starts n - 1 - k entries before the seed
+	strip = np.zeros(2 * n - 1)
+	strip[n - 1] = seed
+	step = strip.strides[0]
+	return np.lib.stride_tricks.as_strided(strip[n - 1:], (n, n), (-step, step), writeable=False)
+
+def _broadcastShape(*shapes):
+	# The shape that arrays of the given shapes broadcast to, or None if they do not
+	# (np.broadcast_shapes needs NumPy 1.20)
+	ndim = max(len(shape) for shape in shapes)
+	result = []
+	for sizes in zip(*[(1,) * (ndim - len(shape)) + tuple(shape) for shape in shapes]):
+		sizes = set(sizes) - {1}
+		if len(sizes) > 1:
+			return None
+		result.append(sizes.pop() if sizes else 1)
+	return tuple(result)
+
+def _sharedSeed(a, b):
+	# The seed of a result is only known when both operands derive der from the same seed
+	seed = a.seed
+	return seed if seed is b.seed else None
+
+# Instructions of an augmented assignment: BINARY_OP with an NB_INPLACE_* argument from Python 3.11,
+# and the INPLACE_* opcodes before
+_BINARY_OP = dis.opmap.get('BINARY_OP')
+_INPLACE_ARGUMENTS = range(13, 26)
+_INPLACE_OPCODES = {dis.opmap[name] for name in ('INPLACE_ADD', 'INPLACE_SUBTRACT', 'INPLACE_MULTIPLY', 'INPLACE_TRUE_DIVIDE') if name in dis.opmap}
+
+# Whether the instruction at (code object, offset) is an augmented assignment. Reading co_code
+# copies the bytecode on newer Pythons, so each instruction is only looked at once.
+_AUGMENTED = {}
+
+def _augmented(code, offset):
+	try:
+		return _AUGMENTED[code, offset]
+	except KeyError:
+		bytecode = code.co_code
+		augmented = bytecode[offset] == _BINARY_OP and bytecode[offset + 1] in _INPLACE_ARGUMENTS or bytecode[offset] in _INPLACE_OPCODES
+		_AUGMENTED[code, offset] = augmented
+		return augmented
+
+# Augmented assignments update objects in place from this many jacobian entries. Below it, the checks
+# and NumPy's out= calls cost more than the new arrays of total = total + term.
+_INPLACE_ENTRIES = 4096
+
+# Reference counts _unshared sees for an object bound to a single name and for its arrays, measured by _Probe
+_REFERENCES = None
+
+def _unshared(obj, arrays, measure=False):
+	'''
+	Whether the in-place operator of obj that called this may write into obj and its arrays. That
+	is the case when the operator was called by an augmented assignment such as total += term (and
+	not by operator.iadd or a direct call, which may be given an object bound elsewhere), obj has no
+	more references than an object bound to one name, and every array is a writable float array
+	that owns its data and is only referenced by obj. Anything else, a list holding obj, another name
+	for it or a view of one of its arrays, adds a reference, so updating the arrays cannot change
+	what any other object or name sees. With measure, the reference counts are returned instead.
+	'''
+	try:
+		frame = sys._getframe(2)
+		references = sys.getrefcount(obj)
+	except AttributeError:
+		# No frames or reference counts (Python implementations other than CPython)
+		return False
+	if not _augmented(frame.f_code, frame.f_lasti):
+		return False
+	counts = [references]
+	for array in arrays:
+		# An array without a base owns its data
+		if not (type(array) is np.ndarray and array.base is None and array.dtype == float and array.flags.writeable):
+			return False
+		counts.append(sys.getrefcount(array))
+	if measure:
+		return counts
+	if _REFERENCES is None or references > _REFERENCES[0]:
+		return False
+	return all(count <= _REFERENCES[1] for count in counts[1:])
+
+class _Probe():
+	# An object with one array and no other references, whose augmented assignment measures _REFERENCES
+	__slots__ = ('array', 'counts')
+
+	def __iadd__(self, other):
+		self.counts = _unshared(self, (self.array,), measure=True)
+		return self
+
+def _measureReferences():
+	probe = _Probe()
+	probe.array = np.zeros(1)
+	probe.counts = False
+	probe += 0
+	# Without augmented assignments to recognise, nothing is updated in place
+	return probe.counts or None
+
+_REFERENCES = _measureReferences()
+
 class AutoDiff():
 	'''
 	An auto-differentiation object for scalar and vector functions
 	'''
+	# No per-instance __dict__: every operation creates a new AutoDiff
+	__slots__ = ('val', '_der', 'jacobian', 'n', 'seed')
 
-	def __init__(self, eval_value, der_value, n=1, k=1, jacobian_value = np.array([[None]])):
+	def __init__(self, eval_value, der_value, n=1, k=1, jacobian_value = np.array([[None]]), lazy=False):
 		'''
 		INPUTS
 		======
 		eval_value: 	value to be evaluated at
 		der_value: 		evaluated value of the derivative
 		n:				number of input variables the final function will use
-		k:				denotes that the autodiff uses the kth input variable in a vector of 1 to n variables
+		k:				denotes that the autodiff uses the kth input variable in a vector of 1 to n variables,
+						or a sequence giving the input variable of each row of a vector of values
 		jacob_value: 	denotes the evaluted value of the jacobian
+		lazy: 			only propagate the jacobian, and compute der as the jacobian scaled by a
+						seed vector (one seed per input variable) when it is first accessed
 
 		RETURNS
 		=======
@@ -28,12 +147,52 @@ class AutoDiff():
 		2
 		>>> myAutoDiff.jacobian
 		1
+		>>> x, y, z = AutoDiff([3, -2, 1], 1, n=3, k=[1, 2, 3])
+		>>> (x * z).jacobian
+		np.array([[1, 0, 3]])
 		'''
+		if np.ndim(k) > 0:
+			k = list(np.ravel(k))
 		# Convert int or float to array
 		self.val = self._convertNonArray(eval_value, k)
 		self.jacobian = self._calcJacobian(k, n, jacobian_value)
 		self.der = self._calcDerivative(der_value, k)
 		self.n = n
+		self.seed = self._calcSeed(der_value, k, n) if lazy else None
+
+	@classmethod
+	def _fromArrays(cls, eval_value, der_value, n, jacobian_value, seed=None):
+		'''
+		Wrap an already computed value, derivative and jacobian without the seed and jacobian
+		checks done by __init__. Used internally by the operators and elemFunctions, whose
+		results are always in final form. With a seed, der_value is None and der is computed on access.
+		'''
+		ad = cls.__new__(cls)
+		ad.val = eval_value
+		ad._der = der_value
+		ad.jacobian = jacobian_value
+		ad.n = n
+		ad.seed = seed
+		return ad
+
+	@property
+	def der(self):
+		if self._der is None:
+			# Lazy: every input variable contributes its jacobian column scaled by its seed
+			self._der = self.jacobian * self.seed
+		return self._der
+
+	@der.setter
+	def der(self, der_value):
+		self._der = der_value
+
+	def _unary(self, value, local):
+		'''
+		Result of an elementary function with the given value and derivative at self.val
+		'''
+		if self.seed is not None:
+			return AutoDiff._fromArrays(value, None, self.n, local * self.jacobian, self.seed)
+		return AutoDiff._fromArrays(value, local * self.der, self.n, local * self.jacobian)
 
 	def _convertNonArray(self, value, k):
 		# try:
@@ -54,19 +213,51 @@ class AutoDiff():
 			if k != 0:
 				rows = self.val.shape[0]
 				seed = np.zeros([rows, n])
-				seed[:, k-1] = 1
+				seed[np.arange(rows), np.subtract(k, 1)] = 1
 				return seed
 		else:
 			return jacobian_value
 
 	def _calcDerivative(self, der_value, k):
 		if k != 0:
-			jacobian = (np.array([self.jacobian[0]]))
+			# Scale the seed row of each value by its derivative
 			der = self._convertNonArray(der_value, k)
-			return np.dot(der, jacobian) * self.jacobian**0
+			return der * self.jacobian
 		else:
 			return self._convertNonArray(der_value, k)
 
+	def _calcSeed(self, der_value, k, n):
+		if np.ndim(der_value) == 0:
+			seed = _seedVector(n, der_value)
+		elif k == 0:
+			# Read the seed of each input variable off the nonzero jacobian entries of its column
+			try:
+				der, jacobian = np.broadcast_arrays(np.asarray(self.der, dtype=float), np.asarray(self.jacobian, dtype=float).reshape(-1, n))
+			except (TypeError, ValueError):
+				raise ValueError('lazy AutoDiff objects with k=0 need a derivative and a jacobian with n columns')
+			rows, columns = np.nonzero(jacobian)
+			seed = np.zeros(n)
+			seed[columns] = der[rows, columns] / jacobian[rows, columns]
+		else:
+			# Read the seed of each input variable off the rows that use it
+			rows = self.val.shape[0]
+			seed = np.zeros(n)
+			seed[np.subtract(k, 1)] = self.der[np.arange(rows), np.subtract(k, 1)]
+		if not np.allclose(self.jacobian * seed, self.der, rtol=1e-12, atol=0):
+			raise ValueError('lazy AutoDiff objects need a single seed for each input variable')
+		self._der = None
+		return seed
+
+	def __getitem__(self, index):
+		'''
+		Select rows (outputs) of a vector AutoDiff. An integer index keeps the row as a 1 x 1 value,
+		so a vector of variables can be unpacked into its components.
+		'''
+		rows = np.atleast_1d(np.arange(self.val.shape[-2])[index])
+		der = None if self._der is None else np.take(self._der, rows, axis=-2)
+		return AutoDiff._fromArrays(np.take(self.val, rows, axis=-2), der,
+				self.n, np.take(self.jacobian, rows, axis=-2), self.seed)
+
 	def __str__(self):
 		return "Value:\n{}\nDerivative:\n{}\nJacobian:\n{}\n".format(self.val, self.der, self.jacobian)
 
@@ -76,77 +267,215 @@ class AutoDiff():
 	def __add__(self, other):
 		try:
 			# If  AutoDiff of same variable, values and derivatives should both just add
-			return AutoDiff(self.val + other.val, self.der + other.der, self.n, 0, self.jacobian + other.jacobian)
+			seed = _sharedSeed(self, other)
+			return AutoDiff._fromArrays(self.val + other.val, None if seed is not None else self.der + other.der, self.n, self.jacobian + other.jacobian, seed)
 		except AttributeError:
 			# If trying to add a constant to AutoDiff, only add values. Constant has derivative of 0 so no addition needed.
-			return AutoDiff(self.val + other, self.der, self.n, 0, self.jacobian)
+			return AutoDiff._fromArrays(self.val + other, self._der, self.n, self.jacobian, self.seed)
 
 	# Account for reverse addition
 	def __radd__(self, other):
 		try:
-			return AutoDiff(self.val + other.val, self.der + other.der, self.n, 0, self.jacobian + other.jacobian)
+			seed = _sharedSeed(self, other)
+			return AutoDiff._fromArrays(self.val + other.val, None if seed is not None else self.der + other.der, self.n, self.jacobian + other.jacobian, seed)
 		except AttributeError:
-			return AutoDiff(self.val + other, self.der, self.n, 0, self.jacobian)
+			return AutoDiff._fromArrays(self.val + other, self._der, self.n, self.jacobian, self.seed)
 
 	def __sub__(self, other):
 		try:
 			# If  AutoDiff of same variable, values and derivatives should both just add
-			return AutoDiff(self.val - other.val, self.der - other.der, self.n, 0, self.jacobian - other.jacobian)
+			seed = _sharedSeed(self, other)
+			return AutoDiff._fromArrays(self.val - other.val, None if seed is not None else self.der - other.der, self.n, self.jacobian - other.jacobian, seed)
 		except AttributeError:
 			# If trying to add a constant to AutoDiff, only add values. Constant has derivative of 0 so no subtraction needed.
-			return AutoDiff(self.val - other, self.der, self.n, 0, self.jacobian)
+			return AutoDiff._fromArrays(self.val - other, self._der, self.n, self.jacobian, self.seed)
 
 	# Account for reverse subtraction
 	def __rsub__(self, other):
 		try:
-			return AutoDiff(other.val - self.val, other.der - self.der, self.n, 0, other.jacobian - self.jacobian)
+			seed = _sharedSeed(self, other)
+			return AutoDiff._fromArrays(other.val - self.val, None if seed is not None else other.der - self.der, self.n, other.jacobian - self.jacobian, seed)
 		except AttributeError:
-			return AutoDiff(other - self.val, self.der, self.n, 0, self.jacobian)
+			# A constant minus AutoDiff negates the derivative and jacobian
+			return AutoDiff._fromArrays(other - self.val, None if self.seed is not None else self.der * -1, self.n, self.jacobian * -1, self.seed)
 
 	def __mul__(self, other):
 		try:
 			# Use product rule
-			return AutoDiff(self.val * other.val, self.val * other.der + self.der * other.val, self.n, 0, self.val * other.jacobian + self.jacobian * other.val)
+			seed = _sharedSeed(self, other)
+			return AutoDiff._fromArrays(self.val * other.val, None if seed is not None else self.val * other.der + self.der * other.val, self.n, self.val * other.jacobian + self.jacobian * other.val, seed)
 		except AttributeError:
-			return AutoDiff(self.val * other, self.der * other, self.n, 0, self.jacobian * other)
+			return AutoDiff._fromArrays(self.val * other, None if self.seed is not None else self.der * other, self.n, self.jacobian * other, self.seed)
 
 	# Account for reverse multiplication
 	def __rmul__(self, other):
 		try:
 			# Use product rule
-			return AutoDiff(self.val * other.val, self.val * other.der + self.der * other.val, self.n, 0, self.val * other.jacobian + self.jacobian * other.val)
+			seed = _sharedSeed(self, other)
+			return AutoDiff._fromArrays(self.val * other.val, None if seed is not None else self.val * other.der + self.der * other.val, self.n, self.val * other.jacobian + self.jacobian * other.val, seed)
 		except AttributeError:
-			return AutoDiff(self.val * other, self.der * other, self.n, 0, self.jacobian * other)
+			return AutoDiff._fromArrays(self.val * other, None if self.seed is not None else self.der * other, self.n, self.jacobian * other, self.seed)
 
 	def __truediv__(self, other):
 		try:
 			# Use quotient rule
-			return AutoDiff(self.val / other.val, (self.der * other.val - self.val * other.der)/(other.val**2), self.n, 0, (self.jacobian * other.val - self.val * other.jacobian)/(other.val**2))
+			seed = _sharedSeed(self, other)
+			return AutoDiff._fromArrays(self.val / other.val, None if seed is not None else (self.der * other.val - self.val * other.der)/(other.val**2), self.n, (self.jacobian * other.val - self.val * other.jacobian)/(other.val**2), seed)
 		except AttributeError:
-			return AutoDiff(self.val / other, self.der / other, self.n, 0, self.jacobian / other)
+			return AutoDiff._fromArrays(self.val / other, None if self.seed is not None else self.der / other, self.n, self.jacobian / other, self.seed)
 
 	# Account for reverse true division
 	def __rtruediv__(self, other):
 		try:
 			# Use quotient rule
 			# other/self
-			return AutoDiff(other.val / self.val, (self.val * other.der - other.val * self.der)/(self.val**2), self.n, 0, (other.jacobian * self.val - other.val * self.jacobian)/(self.val**2) )
+			seed = _sharedSeed(self, other)
+			return AutoDiff._fromArrays(other.val / self.val, None if seed is not None else (self.val * other.der - other.val * self.der)/(self.val**2), self.n, (other.jacobian * self.val - other.val * self.jacobian)/(self.val**2), seed)
 		except AttributeError:
-			return AutoDiff(other / self.val, (self.val * 0 - other * self.der)/(self.val**2), self.n, 0, (self.val * 0 - other * self.jacobian)/(self.val**2))
+			return AutoDiff._fromArrays(other / self.val, None if self.seed is not None else (self.val * 0 - other * self.der)/(self.val**2), self.n, (self.val * 0 - other * self.jacobian)/(self.val**2), self.seed)
 
 	def __pow__(self, other):
 		# Convert to float so that negative integers will work
 		other = float(other) if type(other)==int else other
 		try:
-			return AutoDiff(self.val**other.val, other.val * (self.val ** (other.val-1)) * self.der + (self.val**other.val) *np.log(np.abs(self.val)) * other.der, self.n, 0, other.val * (self.val**(other.val-1)) * self.jacobian + (self.val**other.val * np.log(np.abs(self.val)) * other.jacobian))
+			seed = _sharedSeed(self, other)
+			return AutoDiff._fromArrays(self.val**other.val, None if seed is not None else other.val * (self.val ** (other.val-1)) * self.der + (self.val**other.val) *np.log(np.abs(self.val)) * other.der, self.n, other.val * (self.val**(other.val-1)) * self.jacobian + (self.val**other.val * np.log(np.abs(self.val)) * other.jacobian), seed)
 		except AttributeError:
-			return AutoDiff(self.val**other, other * (self.der) * self.val**(other-1), self.n, 0, other * (self.jacobian) * self.val**(other-1))
+			return AutoDiff._fromArrays(self.val**other, None if self.seed is not None else other * (self.der) * self.val**(other-1), self.n, other * (self.jacobian) * self.val**(other-1), self.seed)
 
 	def __rpow__(self, other):
 		try:
-			return AutoDiff(other.val**self.val, other.val * (self.val ** (other.val-1)) * self.der + (self.val**other.val) *np.log(np.abs(self.val)) * other.der, self.n, 0, other.val * (self.val**(other.val-1)) * self.jacobian + (self.val**other.val * np.log(np.abs(self.val)) * other.jacobian))
+			seed = _sharedSeed(self, other)
+			return AutoDiff._fromArrays(other.val**self.val, None if seed is not None else other.val * (self.val ** (other.val-1)) * self.der + (self.val**other.val) *np.log(np.abs(self.val)) * other.der, self.n, other.val * (self.val**(other.val-1)) * self.jacobian + (self.val**other.val * np.log(np.abs(self.val)) * other.jacobian), seed)
+		except AttributeError:
+			return AutoDiff._fromArrays(other**self.val, None if self.seed is not None else np.log(other) * other**self.val * self.der, self.n, np.log(other) * other**self.val * self.jacobian, self.seed)
+
+	# Matrix products with constant matrices and other AutoDiff vectors (see matmul)
+	def __matmul__(self, other):
+		return matmul(self, other)
+
+	def __rmatmul__(self, other):
+		return matmul(other, self)
+
+	# In-place operators: total += term writes into the arrays of total when the jacobian has at least
+	# _INPLACE_ENTRIES entries and nothing else can see them (see _unshared), and otherwise returns a
+	# new object like total = total + term. sumTerms and dotTerms write into an accumulator copied
+	# with _own, which nothing else references.
+	def _own(self):
+		return AutoDiff._fromArrays(np.array(self.val, dtype=float), None if self._der is None else np.array(self._der, dtype=float),
+				self.n, np.array(self.jacobian, dtype=float), self.seed)
+
+	def _buffers(self):
+		return (self.val, self.jacobian) if self._der is None else (self.val, self.jacobian, self._der)
+
+	def _fits(self, other):
+		# Whether the result of an operation with other keeps the shapes of this object and its seed
+		try:
+			other_val, other_jacobian = other.val, other.jacobian
+		except AttributeError:
+			shape = np.shape(other)
+			return shape == () or _broadcastShape(self.val.shape, shape) == self.val.shape
+		if _sharedSeed(self, other) is not self.seed:
+			return False
+		if other_val.shape == self.val.shape and other_jacobian.shape == self.jacobian.shape:
+			return True
+		return _broadcastShape(self.val.shape, other_val.shape) == self.val.shape and \
+			_broadcastShape(self.jacobian.shape, other_jacobian.shape, self.val.shape) == self.jacobian.shape
+
+	def _addInPlace(self, other, weight=1.0):
+		# Add weight * other into the arrays of this object, which other fits
+		try:
+			other_val, other_jacobian = other.val, other.jacobian
+			other_der = None if self.seed is not None else other.der
+		except AttributeError:
+			self.val += weight * other
+			return self
+		if self.seed is not None:
+			# Lazy: der follows from the updated jacobian
+			self._der = None
+		if weight == 1 or weight == -1:
+			update = np.add if weight == 1 else np.subtract
+			update(self.val, other_val, out=self.val)
+			update(self.jacobian, other_jacobian, out=self.jacobian)
+			if other_der is not None:
+				update(self._der, other_der, out=self._der)
+		else:
+			self.val += weight * other_val
+			self.jacobian += weight * other_jacobian
+			if other_der is not None:
+				self._der += weight * other_der
+		return self
+
+	def _accumulate(self, other, weight=1.0):
+		'''
+		Add weight * other into the arrays of this accumulator when the result has the same
+		shapes, or otherwise into a new accumulator.
+		'''
+		if not self._fits(other):
+			return (self + weight * other)._own()
+		return self._addInPlace(other, weight)
+
+	def __iadd__(self, other):
+		if self.jacobian.size >= _INPLACE_ENTRIES and _unshared(self, self._buffers()) and self._fits(other):
+			return self._addInPlace(other, 1.0)
+		return self + other
+
+	def __isub__(self, other):
+		if self.jacobian.size >= _INPLACE_ENTRIES and _unshared(self, self._buffers()) and self._fits(other):
+			return self._addInPlace(other, -1.0)
+		return self - other
+
+	def __imul__(self, other):
+		if other is self or not (self.jacobian.size >= _INPLACE_ENTRIES and _unshared(self, self._buffers()) and self._fits(other)):
+			return self * other
+		try:
+			other_val, other_jacobian = other.val, other.jacobian
+			other_der = None if self.seed is not None else other.der
 		except AttributeError:
-			return AutoDiff(other**self.val, np.log(other) * other**self.val * self.der, self.n, 0, np.log(other) * other**self.val * self.jacobian)
+			self.val *= other
+			self.jacobian *= other
+			if self.seed is None:
+				self._der *= other
+			else:
+				self._der = None
+			return self
+		# Product rule, using the value before it is updated
+		self.jacobian *= other_val
+		self.jacobian += self.val * other_jacobian
+		if other_der is not None:
+			self._der *= other_val
+			self._der += self.val * other_der
+		else:
+			self._der = None
+		self.val *= other_val
+		return self
+
+	def __itruediv__(self, other):
+		if other is self or not (self.jacobian.size >= _INPLACE_ENTRIES and _unshared(self, self._buffers()) and self._fits(other)):
+			return self / other
+		try:
+			other_val, other_jacobian = other.val, other.jacobian
+			other_der = None if self.seed is not None else other.der
+		except AttributeError:
+			self.val /= other
+			self.jacobian /= other
+			if self.seed is None:
+				self._der /= other
+			else:
+				self._der = None
+			return self
+		# Quotient rule, using the value before it is updated
+		self.jacobian *= other_val
+		self.jacobian -= self.val * other_jacobian
+		self.jacobian /= other_val**2
+		if other_der is not None:
+			self._der *= other_val
+			self._der -= self.val * other_der
+			self._der /= other_val**2
+		else:
+			self._der = None
+		self.val /= other_val
+		return self
 
 	# Unary operations
 	# Unary addition: identity
@@ -156,14 +485,23 @@ class AutoDiff():
 	# Unary subtration: negation
 	def __neg__(self):
 		# If  AutoDiff of same variable, values and derivatives should both just add
-		return AutoDiff(self.val * -1, self.der * -1, self.n, 0, self.jacobian * -1)
+		return AutoDiff._fromArrays(self.val * -1, None if self.seed is not None else self.der * -1, self.n, self.jacobian * -1, self.seed)
 
 	def __abs__(self):
-		return AutoDiff(abs(self.val), ((self.val * self.der) / abs(self.val)),
-				self.n, 0, ((self.val * self.jacobian) / abs(self.val)))
+		return AutoDiff._fromArrays(abs(self.val), None if self.seed is not None else ((self.val * self.der) / abs(self.val)),
+				self.n, ((self.val * self.jacobian) / abs(self.val)), self.seed)
 
 	def __invert__(self):
-		return AutoDiff(~self.val, self.der * -1, self.n, 0, self.jacobian * -1)
+		return AutoDiff._fromArrays(~self.val, None if self.seed is not None else self.der * -1, self.n, self.jacobian * -1, self.seed)
+
+	# NumPy protocols: np.sin(x), np.exp(x), x + array and similar calls use the elementary functions
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+		from ADPYNE.elemFunctions import _arrayUfunc
+		return _arrayUfunc(ufunc, method, inputs, kwargs)
+
+	def __array_function__(self, func, types, args, kwargs):
+		from ADPYNE.elemFunctions import _arrayFunction
+		return _arrayFunction(func, args, kwargs)
 
 	def __eq__(self, other):
 		try:
@@ -183,11 +521,31 @@ class AutoDiff():
 		except AttributeError:
 			return True
 
+def _collect(ad_functions):
+	# Gather the arrays of each function in a single pass, so ad_functions may be a generator.
+	# The derivatives of lazy functions are only computed when the functions turn out not to
+	# share a seed to compute them from.
+	vals, ders, jacobians = [], [], []
+	seed, shared = None, True
+	for f in ad_functions:
+		if not vals:
+			seed = f.seed
+		elif f.seed is not seed:
+			shared = False
+		vals.append(f.val)
+		ders.append(f._der if f._der is not None else f)
+		jacobians.append(f.jacobian)
+	if not vals:
+		raise ValueError('no AutoDiff functions to vectorize')
+	if shared and seed is not None:
+		return vals, None, jacobians, seed
+	return vals, [f.der if type(f) is AutoDiff else f for f in ders], jacobians, None
+
 def vectorize(ad_functions, n_inputs = 1, n_vectors = 1):
 	'''
 	INPUTS
 	======
-	ad_functions: 	a list or row vector of AutoDiff objects
+	ad_functions: 	a list, row vector or generator of AutoDiff objects, each with one or more rows
 	n_inputs:		number of input variables the final function will use
 	n_vectors: 		length of vector for input variables
 
@@ -209,24 +567,376 @@ def vectorize(ad_functions, n_inputs = 1, n_vectors = 1):
 	>>> f.jacobian
 	np.array([[3, 2, 4], [1, -1, 1], [0.5, 0, 0], [2, -2, 0]])
 	'''
+	vals, ders, jacobians, seed = _collect(ad_functions)
+	der = None
 	if n_vectors == 1:
-		val = np.zeros([len(ad_functions), n_vectors])
-		der = np.zeros([len(ad_functions), n_inputs])
-		jacobian = np.zeros([len(ad_functions), n_inputs])
-		for i, f in enumerate(ad_functions):
-			val[i, :] = f.val
-			der[i, :] = f.der
-			jacobian[i, :] = f.jacobian
+		# Functions with several rows contribute all of their rows
+		val = np.concatenate(vals).astype(float).reshape(-1, n_vectors)
+		if ders is not None:
+			der = np.concatenate(ders).astype(float).reshape(-1, n_inputs)
+		jacobian = np.concatenate(jacobians).astype(float).reshape(-1, n_inputs)
+	else:
+		# Functions are stacked as (m, n_vectors, n_inputs); the derivatives are laid out per input vector
+		val = np.array(vals, dtype=float).reshape(len(vals), n_vectors)
+		if ders is not None:
+			der = np.array(ders, dtype=float).swapaxes(0, 1)
+		jacobian = np.array(jacobians, dtype=float).swapaxes(0, 1)
+
+	return AutoDiff._fromArrays(val, der, n_inputs, jacobian, seed)
+
+def makeBatchVars(points, seed = 1, lazy = False):
+	'''
+	INPUTS
+	======
+	points: 	an array of B points of shape (B, n), or (B,) for a single input variable
+	seed: 		scalar seed for the derivative of each input variable
+	lazy: 		only propagate the jacobians, and compute der from them when it is accessed
+
+	RETURNS
+	=======
+	A list of n AutoDiff objects, one per input variable, each holding that variable's value at all B points.
+	Values have shape (B, 1) and jacobians shape (B, n), so any function built from them is evaluated and
+	differentiated at every point at once.
+
+	EXAMPLES
+	========
+	>>> x, y = makeBatchVars(np.array([[1, 2], [3, 4], [5, 6]]))
+	>>> f = x * y
+	>>> f.val
+	np.array([[2], [12], [30]])
+	>>> f.jacobian
+	np.array([[2, 1], [4, 3], [6, 5]])
+	'''
+	points = np.asarray(points, dtype=float)
+	if points.ndim == 1:
+		points = points.reshape(-1, 1)
+	n_points, n_inputs = points.shape
+	identity = _identity(n_inputs)
+	variables = []
+	for k in range(n_inputs):
+		# Every point shares the same seed row, so the jacobian is a read-only view rather than a copy
+		jacobian = np.broadcast_to(identity[k], (n_points, n_inputs))
+		if lazy:
+			variables.append(AutoDiff._fromArrays(points[:, k:k+1], None, n_inputs, jacobian, _seedVector(n_inputs, seed)))
+		else:
+			variables.append(AutoDiff._fromArrays(points[:, k:k+1], seed * jacobian, n_inputs, jacobian))
+	return variables
+
+def variables(values, seed = 1, lazy = False):
+	'''
+	INPUTS
+	======
+	values: 	the values of n input variables, a list or array
+	seed: 		scalar seed for the derivative of each input variable
+	lazy: 		only propagate the jacobians, and compute der from them when it is accessed
+
+	RETURNS
+	=======
+	A list of n AutoDiff objects, the same as AutoDiff(values[k-1], seed, n=n, k=k) for k = 1 to n.
+	Their jacobian (and derivative) rows are read-only views of one seed times identity held in
+	an array of length 2n - 1, instead of n rows of n entries each, so building them takes O(n)
+	time and memory.
+
+	EXAMPLES
+	========
+	>>> x, y, z = variables([3, -2, 1], 2)
+	>>> f = x * z + y
+	>>> f.der
+	np.array([[2., 2., 6.]])
+	>>> f.jacobian
+	np.array([[1., 1., 3.]])
+	'''
+	values = np.array(values, dtype=float).reshape(-1, 1)
+	n = len(values)
+	identity = _identity(n)
+	if lazy:
+		seed = _seedVector(n, seed)
+		return [AutoDiff._fromArrays(values[k:k+1], None, n, identity[k:k+1], seed) for k in range(n)]
+	der = _identity(n, seed)
+	return [AutoDiff._fromArrays(values[k:k+1], der[k:k+1], n, identity[k:k+1]) for k in range(n)]
+
+def vectorizeBatch(ad_functions):
+	'''
+	INPUTS
+	======
+	ad_functions: 	a list or generator of m AutoDiff objects built from the variables returned by makeBatchVars
+
+	RETURNS
+	=======
+	An AutoDiff object of the vector function at all B points. The value has shape (B, m, 1) and the
+	derivative and jacobian have shape (B, m, n). The trailing axis of the value lines up with the input
+	axis of the jacobian, so operators and elemFunctions keep broadcasting over the batch.
+
+	EXAMPLES
+	========
+	>>> x, y = makeBatchVars(np.array([[1, 2], [3, 4]]))
+	>>> f = vectorizeBatch([x * y, x + y])
+	>>> f.val[:, :, 0]
+	np.array([[2, 3], [12, 7]])
+	>>> f.jacobian[1]
+	np.array([[4, 3], [1, 1]])
+	'''
+	vals, ders, jacobians, seed = _collect(ad_functions)
+	val = np.stack(vals, axis=-2)
+	der = None if ders is None else np.stack(ders, axis=-2)
+	jacobian = np.stack(jacobians, axis=-2)
+	return AutoDiff._fromArrays(val, der, jacobian.shape[-1], jacobian, seed)
+
+# Small AutoDiff terms are stacked in chunks of up to this many jacobian entries, and terms that
+# would give chunks of fewer than _CHUNK_TERMS are added one at a time
+_CHUNK_ENTRIES = 1 << 15
+_CHUNK_TERMS = 16
+
+def _accumulator(value):
+	# A copy of value that sumTerms and dotTerms can update in place, when value is an AutoDiff or Dual object
+	try:
+		return value._own()
+	except AttributeError:
+		return value
+
+def _addTerm(total, term, weight):
+	# Add weight * term (or term, for a weight of None) to the accumulator
+	try:
+		return total._accumulate(term, 1.0 if weight is None else weight)
+	except AttributeError:
+		# The sum so far is a constant
+		return _accumulator(total + (term if weight is None else weight * term))
+
+def _addChunk(total, chunk, weights):
+	# Add the terms of a chunk, AutoDiff objects with the same shapes and seed, with one array
+	# operation per attribute: a sum over the stacked arrays, or a product with the weights
+	if len(chunk) < 2:
+		return _addTerm(total, chunk[0], weights[0]) if chunk else total
+	stack = lambda arrays: np.concatenate(arrays).reshape((len(arrays),) + arrays[0].shape)
+	if weights[0] is None:
+		combine = lambda arrays: np.add.reduce(stack(arrays))
 	else:
-		val = np.zeros([len(ad_functions), n_vectors])
-		der = np.zeros([n_vectors, len(ad_functions), n_inputs])
-		jacobian = np.zeros([n_vectors, len(ad_functions), n_inputs])
-		for j in range(n_vectors):
-			der_j = der[j]
-			jac_j = jacobian[j]
-			for i, f in enumerate(ad_functions):
-				val[i, :] = f.val.T
-				der_j[i, :] = f.der[j]
-				jac_j[i, :]	= f.jacobian[j]
-
-	return AutoDiff(val, der, n_inputs, 0, jacobian)
+		weights = np.array(weights, dtype=float)
+		combine = lambda arrays: np.tensordot(weights, stack(arrays), axes=1)
+	first = chunk[0]
+	der = None if first.seed is not None else combine([term.der for term in chunk])
+	return _addTerm(total, AutoDiff._fromArrays(combine([term.val for term in chunk]), der, first.n,
+			combine([term.jacobian for term in chunk]), first.seed), None)
+
+def _addTerms(total, terms, weights):
+	# total plus the terms, each times its weight unless the weights are None
+	chunk, chunk_weights, layout, length = [], [], None, 0
+	for weight, term in zip(weights, terms):
+		if type(term) is AutoDiff and term.val.ndim and (weight is None or isinstance(weight, (int, float, np.number))):
+			term_layout = (term.val.shape, term.jacobian.shape, id(term.seed))
+			if term_layout == layout and len(chunk) < length:
+				chunk.append(term)
+				chunk_weights.append(weight)
+				continue
+			total = _addChunk(total, chunk, chunk_weights)
+			chunk, chunk_weights = [term], [weight]
+			layout, length = term_layout, _CHUNK_ENTRIES // max(term.jacobian.size, 1)
+			if length < _CHUNK_TERMS:
+				length = 1
+			continue
+		total = _addTerm(_addChunk(total, chunk, chunk_weights), term, weight)
+		chunk, chunk_weights, layout = [], [], None
+	return _addChunk(total, chunk, chunk_weights)
+
+def sumTerms(terms, start=0):
+	'''
+	INPUTS
+	======
+	terms: 	a list or generator of AutoDiff objects (or Dual objects or constants) to add up
+	start: 	the value to start the sum from
+
+	RETURNS
+	=======
+	The sum of start and all terms. The sum is kept in a new object that no other object shares
+	arrays with, and the terms are added into its arrays in place, so the sum does not allocate a
+	new object and new arrays per term like total = total + term does. Runs of small AutoDiff
+	terms with the same shapes are stacked in chunks and each chunk is added with one NumPy sum
+	per attribute. Neither start nor the terms are changed.
+
+	EXAMPLES
+	========
+	>>> x, y = AutoDiff([3, 2], 1, n=2, k=[1, 2])
+	>>> f = sumTerms(x**i * y for i in range(4))
+	>>> f.val
+	np.array([[80.]])
+	>>> f.jacobian
+	np.array([[68., 40.]])
+	'''
+	return _addTerms(_accumulator(start), terms, itertools.repeat(None))
+
+def dotTerms(weights, terms):
+	'''
+	INPUTS
+	======
+	weights: 	a sequence of constant weights
+	terms: 		a list or generator of AutoDiff objects (or Dual objects or constants), one per weight
+
+	RETURNS
+	=======
+	The weighted sum of the terms, accumulated in place like sumTerms without forming
+	the products weight * term as separate objects. Each chunk of small AutoDiff terms
+	is added with one product of the weights and the stacked arrays per attribute.
+
+	EXAMPLES
+	========
+	>>> x, y = AutoDiff([3, 2], 1, n=2, k=[1, 2])
+	>>> f = dotTerms([2, -1], [x * y, y**2])
+	>>> f.jacobian
+	np.array([[4., 2.]])
+	'''
+	return _addTerms(0, terms, weights)
+
+# Reductions and products over the rows of vector AutoDiff objects. Each is a linear map of the
+# rows (or one weighted by the values), so the jacobian is propagated with a single array operation.
+def _linear(x, apply):
+	# Apply the same linear map over the rows to the value, derivative and jacobian of x
+	return AutoDiff._fromArrays(apply(x.val), None if x.seed is not None else apply(x.der), x.n, apply(x.jacobian), x.seed)
+
+def _weighted(x, value, weights):
+	# A scalar function of the rows of x with the given value and partial derivatives (one per row)
+	weights = np.swapaxes(weights, -1, -2)
+	return AutoDiff._fromArrays(value, None if x.seed is not None else weights @ x.der, x.n, weights @ x.jacobian, x.seed)
+
+def sum(x):
+	'''
+	INPUTS
+	======
+	x: 	a vector AutoDiff object
+
+	RETURNS
+	=======
+	An AutoDiff object holding the sum of the rows of x and its derivative and jacobian.
+
+	EXAMPLES
+	========
+	>>> x = AutoDiff([1, 2, 3], 1, n=3, k=[1, 2, 3])
+	>>> f = sum(x**2)
+	>>> f.val
+	np.array([[14.]])
+	>>> f.jacobian
+	np.array([[2., 4., 6.]])
+	'''
+	return _linear(x, lambda a: a.sum(axis=-2, keepdims=True))
+
+def matmul(a, b):
+	'''
+	INPUTS
+	======
+	a: 	a constant matrix or vector, or a vector AutoDiff object
+	b: 	a constant matrix or vector, or a vector AutoDiff object
+
+	RETURNS
+	=======
+	An AutoDiff object holding the matrix product a @ b, where a vector AutoDiff object takes
+	the place of a vector of its rows as in NumPy: A @ x is a vector with one row per row of A,
+	x @ B one row per column of B, and the product of two vectors is their inner product. The
+	jacobian is the same matrix product applied to the jacobian of the vector (by the product
+	rule for two AutoDiff vectors).
+
+	EXAMPLES
+	========
+	>>> x = AutoDiff([1, 2], 1, n=2, k=[1, 2])
+	>>> f = np.array([[1, 2], [3, 4], [5, 6]]) @ x
+	>>> f.val
+	np.array([[5], [11], [17]])
+	>>> f.jacobian
+	np.array([[1., 2.], [3., 4.], [5., 6.]])
+	>>> (x @ x).jacobian
+	np.array([[2., 4.]])
+	'''
+	try:
+		a_val = np.swapaxes(a.val, -1, -2)
+	except AttributeError:
+		# Constant matrix times a vector; a constant vector takes the inner product
+		a = np.asarray(a)
+		return _linear(b, lambda v: (a[np.newaxis, :] if a.ndim == 1 else a) @ v)
+	try:
+		b_val = np.swapaxes(b.val, -1, -2)
+	except AttributeError:
+		# Vector times a constant matrix, which is the transposed matrix times the vector
+		b = np.asarray(b)
+		weights = b[np.newaxis, :] if b.ndim == 1 else np.swapaxes(b, -1, -2)
+		return _linear(a, lambda v: weights @ v)
+	seed = _sharedSeed(a, b)
+	return AutoDiff._fromArrays(a_val @ b.val, None if seed is not None else a_val @ b.der + b_val @ a.der,
+			a.n, a_val @ b.jacobian + b_val @ a.jacobian, seed)
+
+def dot(a, b):
+	'''
+	INPUTS
+	======
+	a: 	a constant, matrix or vector, or a vector AutoDiff object
+	b: 	a constant, matrix or vector, or a vector AutoDiff object
+
+	RETURNS
+	=======
+	An AutoDiff object holding the dot product of a and b: the product with a scalar constant,
+	and otherwise the matrix product (see matmul), as np.dot for arrays of at most two dimensions.
+
+	EXAMPLES
+	========
+	>>> x = AutoDiff([1, 2, 3], 1, n=3, k=[1, 2, 3])
+	>>> f = dot([1, 0, -1], x)
+	>>> f.val
+	np.array([[-2]])
+	>>> f.jacobian
+	np.array([[1., 0., -1.]])
+	'''
+	if np.ndim(a) == 0 and not isinstance(a, AutoDiff) or np.ndim(b) == 0 and not isinstance(b, AutoDiff):
+		return a * b
+	return matmul(a, b)
+
+def norm(x, ord=None):
+	'''
+	INPUTS
+	======
+	x: 		a vector AutoDiff object
+	ord: 	None or 2 for the Euclidean norm, 1 for the sum of absolute values
+
+	RETURNS
+	=======
+	An AutoDiff object holding the norm of the rows of x and its derivative and jacobian. As for
+	sqrt and abs, the derivative is not defined where the norm (or a row, for ord=1) is 0.
+
+	EXAMPLES
+	========
+	>>> x = AutoDiff([3, 4], 1, n=2, k=[1, 2])
+	>>> f = norm(x)
+	>>> f.val
+	np.array([[5.]])
+	>>> f.jacobian
+	np.array([[0.6, 0.8]])
+	'''
+	if ord is None or ord == 2:
+		value = np.sqrt(np.sum(x.val * x.val, axis=-2, keepdims=True))
+		return _weighted(x, value, x.val / value)
+	if ord == 1:
+		return _weighted(x, np.sum(np.abs(x.val), axis=-2, keepdims=True), x.val / np.abs(x.val))
+	raise ValueError("ord must be None, 1 or 2")
+
+def prod(x):
+	'''
+	INPUTS
+	======
+	x: 	a vector AutoDiff object
+
+	RETURNS
+	=======
+	An AutoDiff object holding the product of the rows of x and its derivative and jacobian.
+	The partial derivative for each row is the product of all other rows, computed from
+	running products so that rows equal to 0 need no division.
+
+	EXAMPLES
+	========
+	>>> x = AutoDiff([2, 3, 4], 1, n=3, k=[1, 2, 3])
+	>>> f = prod(x)
+	>>> f.val
+	np.array([[24]])
+	>>> f.jacobian
+	np.array([[12., 8., 6.]])
+	'''
+	val = np.asarray(x.val, dtype=float)
+	ones = np.ones_like(val[..., :1, :])
+	before = np.concatenate([ones, np.cumprod(val[..., :-1, :], axis=-2)], axis=-2)
+	after = np.concatenate([np.cumprod(val[..., :0:-1, :], axis=-2)[..., ::-1, :], ones], axis=-2)
+	return _weighted(x, np.prod(x.val, axis=-2, keepdims=True), before * after)
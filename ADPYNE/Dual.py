@@ -1,10 +1,25 @@
 import numpy as np
+from ADPYNE.AutoDiff import _unshared, _broadcastShape, _INPLACE_ENTRIES
 
 class Dual():
+	# No per-instance __dict__, and coefficients are only stored once buildCoefficients is called,
+	# since makeHighestOrder creates a large number of intermediate Duals
+	__slots__ = ('Real', 'Dual', '_coefficients')
+
 	def __init__(self, Real, Dual = 1):
 		self.Real = Real
 		self.Dual = Dual
-		self.coefficients = []
+
+	@property
+	def coefficients(self):
+		try:
+			return self._coefficients
+		except AttributeError:
+			return []
+
+	@coefficients.setter
+	def coefficients(self, coeffs):
+		self._coefficients = coeffs
 
 	def makeHighestOrder(self, order):
 		theLongdual = self._createNestedduals(self.Real, self.Dual, order)**1
@@ -97,6 +112,90 @@ class Dual():
 		except AttributeError:
 			return Dual(other ** self.Real, self.Dual * np.log(other) * (other ** self.Real))
 
+	# In-place operators: total += term writes into large Real and Dual arrays of total when nothing
+	# else can see them (see AutoDiff._unshared). Scalar parts have no buffers to reuse, and other
+	# cases return a new Dual like total = total + term.
+	def _fits(self, other):
+		# Whether the result of an operation with other has the shape of self
+		try:
+			other_shapes = (np.shape(other.Real), np.shape(other.Dual))
+		except AttributeError:
+			if not isinstance(other, (np.ndarray, int, float, np.number)):
+				return False
+			other_shapes = (np.shape(other),)
+		return all(_broadcastShape(np.shape(self.Real), shape) == np.shape(self.Real) for shape in other_shapes) and \
+			np.shape(self.Real) == np.shape(self.Dual)
+
+	def _updated(self):
+		# Coefficients built before an in-place update no longer hold
+		try:
+			del self._coefficients
+		except AttributeError:
+			pass
+		return self
+
+	def __iadd__(self, other):
+		if not (np.size(self.Real) >= _INPLACE_ENTRIES and _unshared(self, (self.Real, self.Dual)) and self._fits(other)):
+			return self + other
+		try:
+			np.add(self.Dual, other.Dual, out=self.Dual)
+			np.add(self.Real, other.Real, out=self.Real)
+		except AttributeError:
+			np.add(self.Real, other, out=self.Real)
+		return self._updated()
+
+	def __isub__(self, other):
+		if not (np.size(self.Real) >= _INPLACE_ENTRIES and _unshared(self, (self.Real, self.Dual)) and self._fits(other)):
+			return self - other
+		try:
+			np.subtract(self.Dual, other.Dual, out=self.Dual)
+			np.subtract(self.Real, other.Real, out=self.Real)
+		except AttributeError:
+			np.subtract(self.Real, other, out=self.Real)
+		return self._updated()
+
+	def __imul__(self, other):
+		if other is self or not (np.size(self.Real) >= _INPLACE_ENTRIES and _unshared(self, (self.Real, self.Dual)) and self._fits(other)):
+			return self * other
+		try:
+			# Product rule, using the real part before it is updated
+			self.Dual *= other.Real
+			self.Dual += self.Real * other.Dual
+			self.Real *= other.Real
+		except AttributeError:
+			self.Dual *= other
+			self.Real *= other
+		return self._updated()
+
+	def __itruediv__(self, other):
+		if other is self or not (np.size(self.Real) >= _INPLACE_ENTRIES and _unshared(self, (self.Real, self.Dual)) and self._fits(other)):
+			return self / other
+		try:
+			# Quotient rule, using the real part before it is updated
+			self.Dual *= other.Real
+			self.Dual -= self.Real * other.Dual
+			self.Dual /= other.Real**2
+			self.Real /= other.Real
+		except AttributeError:
+			self.Dual /= other
+			self.Real /= other
+		return self._updated()
+
+	# Accumulation for sumTerms and dotTerms into a copy made by _own that nothing else references:
+	# array parts are added into in place, and scalar parts are replaced on the same object
+	def _own(self):
+		copy = lambda part: np.array(part, dtype=float) if type(part) is np.ndarray else part
+		return Dual(copy(self.Real), copy(self.Dual))
+
+	def _accumulate(self, other, weight=1.0):
+		try:
+			other_real, other_dual = other.Real, other.Dual
+		except AttributeError:
+			other_real, other_dual = other, 0
+		self.Real = _addInto(self.Real, other_real, weight)
+		self.Dual = _addInto(self.Dual, other_dual, weight)
+		return self._updated()
+
 	# Unary functions
 	def __neg__(self):
 		try:
@@ -113,6 +212,15 @@ class Dual():
 		except:
 			return self
 
+	# NumPy protocols: np.sin(x), np.exp(x), x + array and similar calls use the elementary functions
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+		from ADPYNE.elemFunctions import _arrayUfunc
+		return _arrayUfunc(ufunc, method, inputs, kwargs)
+
+	def __array_function__(self, func, types, args, kwargs):
+		from ADPYNE.elemFunctions import _arrayFunction
+		return _arrayFunction(func, args, kwargs)
+
 	# Comparison
 	def __eq__(self, other):
 		try:
@@ -132,6 +240,15 @@ class Dual():
 		except AttributeError:
 			return True
 
+def _addInto(part, other, weight):
+	# part + weight * other, written into part when it is a float array of the result's shape
+	if weight != 1:
+		other = weight * other
+	if type(part) is np.ndarray and part.dtype == float and isinstance(other, (np.ndarray, int, float, np.number)) and \
+			_broadcastShape(part.shape, np.shape(other)) == part.shape:
+		return np.add(part, other, out=part)
+	return part + other
+
 def vectorizeDual(functions, order):
 	n = len(functions)
 	m = order + 1
@@ -0,0 +1,147 @@
+import numpy as np
+
+class DualArray():
+	'''
+	An array of dual numbers stored as one array of real parts and one array of dual parts
+	'''
+	__slots__ = ('Real', 'Dual')
+
+	def __init__(self, Real, Dual=1):
+		'''
+		INPUTS
+		======
+		Real: 	the points to evaluate at, a scalar or an array of any shape
+		Dual: 	the dual parts, broadcast to the shape of Real
+
+		RETURNS
+		=======
+		A DualArray object. Every operation and elementary function acts on all points
+		at once with whole-array NumPy operations.
+
+		EXAMPLES
+		========
+		>>> x = DualArray(np.array([1.0, 2.0, 3.0]))
+		>>> f = 3*x**2 + ef.exp(x)
+		>>> f.Dual
+		array([ 8.71828183, 19.3890561 , 38.08553692])
+		'''
+		self.Real = np.asarray(Real, dtype=float)
+		self.Dual = np.asarray(Dual, dtype=float) + np.zeros(self.Real.shape)
+
+	@classmethod
+	def _fromArrays(cls, Real, Dual):
+		# Wrap already computed arrays without conversion
+		dual = cls.__new__(cls)
+		dual.Real = Real
+		dual.Dual = Dual
+		return dual
+
+	def _constantDual(self, other):
+		# Dual parts of the result of an operation with a constant
+		if np.ndim(other) == 0:
+			return self.Dual
+		return np.broadcast_to(self.Dual, np.broadcast(self.Real, other).shape)
+
+	def _unary(self, value, local):
+		'''
+		Result of an elementary function with the given value and derivative at the real parts
+		'''
+		return DualArray._fromArrays(value, local * self.Dual)
+
+	@property
+	def coefficients(self):
+		'''
+		The value and the first derivative at every point, in the last axis
+		'''
+		return np.stack([self.Real, self.Dual], axis=-1)
+
+	def __len__(self):
+		return len(self.Real)
+
+	def __getitem__(self, index):
+		return DualArray._fromArrays(self.Real[index], self.Dual[index])
+
+	def __str__(self):
+		return "{} + {}ε".format(self.Real, self.Dual)
+
+	def __repr__(self):
+		return "DualArray({}, {})".format(self.Real, self.Dual)
+
+	def __add__(self, other):
+		try:
+			return DualArray._fromArrays(self.Real + other.Real, self.Dual + other.Dual)
+		except AttributeError:
+			return DualArray._fromArrays(self.Real + other, self._constantDual(other))
+
+	def __radd__(self, other):
+		return self.__add__(other)
+
+	def __sub__(self, other):
+		try:
+			return DualArray._fromArrays(self.Real - other.Real, self.Dual - other.Dual)
+		except AttributeError:
+			return DualArray._fromArrays(self.Real - other, self._constantDual(other))
+
+	def __rsub__(self, other):
+		return DualArray._fromArrays(other - self.Real, -self._constantDual(other))
+
+	def __mul__(self, other):
+		try:
+			return DualArray._fromArrays(self.Real * other.Real, self.Dual * other.Real + self.Real * other.Dual)
+		except AttributeError:
+			return DualArray._fromArrays(self.Real * other, self.Dual * other)
+
+	def __rmul__(self, other):
+		return self.__mul__(other)
+
+	def __truediv__(self, other):
+		try:
+			value = self.Real / other.Real
+			return DualArray._fromArrays(value, (self.Dual - value * other.Dual) / other.Real)
+		except AttributeError:
+			return DualArray._fromArrays(self.Real / other, self.Dual / other)
+
+	def __rtruediv__(self, other):
+		value = other / self.Real
+		return DualArray._fromArrays(value, -value * self.Dual / self.Real)
+
+	def __pow__(self, other):
+		try:
+			value = self.Real ** other.Real
+			dual = other.Real * self.Real ** (other.Real - 1) * self.Dual + value * np.log(self.Real) * other.Dual
+			return DualArray._fromArrays(value, dual)
+		except AttributeError:
+			return DualArray._fromArrays(self.Real ** other, other * self.Real ** (other - 1) * self.Dual)
+
+	def __rpow__(self, other):
+		value = other ** self.Real
+		return DualArray._fromArrays(value, value * np.log(other) * self.Dual)
+
+	# Unary operations
+	def __pos__(self):
+		return self
+
+	def __neg__(self):
+		return DualArray._fromArrays(-self.Real, -self.Dual)
+
+	def __abs__(self):
+		return DualArray._fromArrays(np.abs(self.Real), self.Dual * np.sign(self.Real))
+
+	# NumPy protocols: np.sin(x), np.exp(x), x + array and similar calls use the elementary functions
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+		from ADPYNE.elemFunctions import _arrayUfunc
+		return _arrayUfunc(ufunc, method, inputs, kwargs)
+
+	def __array_function__(self, func, types, args, kwargs):
+		from ADPYNE.elemFunctions import _arrayFunction
+		return _arrayFunction(func, args, kwargs)
+
+	# Comparison
+	def __eq__(self, other):
+		try:
+			return bool(np.all(self.Real == other.Real) and np.all(self.Dual == other.Dual))
+		except AttributeError:
+			return False
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
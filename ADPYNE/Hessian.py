@@ -1,13 +1,41 @@
 import numpy as np
+from ADPYNE.Taylor import Taylor
+from ADPYNE.DualArray import DualArray
+from ADPYNE.Reverse import Tape
 
 class Hessian():
-	def __init__(self, f):
+	def __init__(self, f, x=None):
+		'''
+		INPUTS
+		======
+		f: 	a function built with the Dual objects returned by makeHessianVars, or,
+			when x is given, a function taking a list of n variables
+		x: 	the n input values to evaluate a function of any number of variables at
+
+		RETURNS
+		=======
+		A Hessian object with the value, first derivative and Hessian of the function.
+
+		EXAMPLES
+		========
+		>>> f = Hessian(lambda x: x[0]**2 * x[1]**3 + x[2], [3, 1, 2])
+		>>> f.firstDer
+		array([ 6., 27.,  1.])
+		>>> f.hessian
+		array([[ 2., 18.,  0.],
+		       [18., 54.,  0.],
+		       [ 0.,  0.,  0.]])
+		'''
+		if x is not None:
+			self.value, self.firstDer, self.hessian = hessian(f, x)
+			return
+
 		self.value = f.Real.Real.Real
 
 		fd1 = f.Dual[0].Real.Real[0].Real.Real
 		fd2 = f.Dual[1].Real.Real[1].Real.Real
 		self.firstDer = np.array([fd1,fd2])
-		
+
 		hxx = f.Dual[0].Dual[0].Real[0].Real
 		hyy = f.Dual[0].Real.Real[1].Dual[0].Real[1].Real
 		hxy = f.Dual[0].Dual[0].Real[1].Real
@@ -16,4 +44,92 @@ class Hessian():
 
 
 	def __str__(self):
-		return "{} val\n\n{} der\n\n{} hess".format(self.value,self.firstDer,self.hessian)
\ No newline at end of file
+		return "{} val\n\n{} der\n\n{} hess".format(self.value,self.firstDer,self.hessian)
+
+def hessian(f, x):
+	'''
+	INPUTS
+	======
+	f: 	a function taking a list of n variables and returning a scalar, built with
+		operators and elemFunctions
+	x: 	the n input values to evaluate at
+
+	RETURNS
+	=======
+	The value, the gradient (length n) and the n x n Hessian of f at x.
+
+	Each upper triangle entry is read off a second order Taylor series along one
+	direction: e_i for H_ii and e_i + e_j for H_ij, where
+	(e_i + e_j)^T H (e_i + e_j) = H_ii + 2 H_ij + H_jj.
+	All n(n+1)/2 directions are propagated together as one array valued forward pass,
+	and the lower triangle is filled in by symmetry.
+
+	EXAMPLES
+	========
+	>>> value, gradient, H = hessian(lambda x: x[0]**2 * x[1], [3, 2])
+	>>> value
+	18.0
+	>>> gradient
+	array([12.,  9.])
+	>>> H
+	array([[4., 6.],
+	       [6., 0.]])
+	'''
+	x = np.asarray(x, dtype=float).ravel()
+	n = len(x)
+	rows, cols = np.triu_indices(n)
+	directions = np.zeros([len(rows), n])
+	directions[np.arange(len(rows)), rows] = 1
+	directions[np.arange(len(rows)), cols] = 1
+	variables = [Taylor(np.full(len(rows), x[k]), 2, directions[:, k]) for k in range(n)]
+	series = f(variables).series
+
+	diagonal = rows == cols
+	value = series[0, 0]
+	gradient = series[diagonal, 1]
+	# Second derivative along each direction
+	curvature = 2 * series[:, 2]
+	H = np.zeros([n, n])
+	H[rows[diagonal], cols[diagonal]] = curvature[diagonal]
+	above = ~diagonal
+	H[rows[above], cols[above]] = (curvature[above] - curvature[diagonal][rows[above]] - curvature[diagonal][cols[above]]) / 2
+	H[cols, rows] = H[rows, cols]
+	return value, gradient, H
+
+def _dualPart(value):
+	# Adjoints that never met a Dual value carry no second order part
+	try:
+		return value.Dual
+	except AttributeError:
+		return 0.0
+
+def hvp(f, x, v):
+	'''
+	INPUTS
+	======
+	f: 	a function taking a list of n variables and returning a scalar, built with
+		operators and elemFunctions
+	x: 	the n input values to evaluate at
+	v: 	the n entries of the vector to multiply the Hessian with
+
+	RETURNS
+	=======
+	The Hessian-vector product H v of f at x, without forming H.
+
+	The inputs are Reverse objects holding DualArray numbers seeded with v (forward-over-reverse),
+	so one backward sweep returns the gradient in the real parts of the adjoints and H v in
+	their dual parts. The cost is a small multiple of one gradient evaluation for any n.
+
+	EXAMPLES
+	========
+	>>> hvp(lambda x: x[0]**2 * x[1], [3, 2], [1, 0])
+	array([4., 6.])
+	'''
+	x = np.asarray(x, dtype=float).ravel()
+	v = np.asarray(v, dtype=float).ravel()
+	tape = Tape()
+	# 0-d DualArray elements, whose pow and abs propagate the dual part correctly
+	seeded = DualArray(x, v)
+	variables = tape.variables([seeded[i] for i in range(len(x))])
+	f(variables).backward()
+	return np.array([_dualPart(variable.grad) for variable in variables], dtype=float)
@@ -0,0 +1,201 @@
+import numpy as np
+from ADPYNE.DualArray import DualArray
+from ADPYNE.MultiDual import makeMultiDualVars, vectorizeMultiDual
+from ADPYNE.Reverse import Tape
+from ADPYNE.Sparse import sparsityPattern, colorColumns, sparseJacobian, _asList
+import ADPYNE.Sparse
+
+# Cost of one recorded operation of f in each mode, relative to evaluating it once with a
+# single tangent, measured with benchmarks/jacobian_benchmark.py
+_TANGENT_COST = 1 / 700			# each extra forward tangent direction
+_RECORD_COST = 2.0				# recording on the Tape
+_SWEEP_COST = 2.3				# each backward sweep, one per output
+_SPARSE_COST = 3.0				# pattern detection, coloring and decompression
+
+def jvp(f, x, v):
+	'''
+	INPUTS
+	======
+	f: 	a function taking a list of n variables and returning one output or a list
+		of m outputs, built with operators and elemFunctions
+	x: 	the n input values to evaluate at
+	v: 	the n entries of the tangent to multiply the Jacobian with
+
+	RETURNS
+	=======
+	The Jacobian-vector product J v of f at x, an array of length m, without forming J.
+
+	The inputs are dual numbers whose dual parts hold v, so one forward evaluation of f
+	carries the single directional derivative to every output, whatever the value of n.
+
+	EXAMPLES
+	========
+	>>> jvp(lambda x: [x[0] * x[1], ef.sin(x[0])], [2, 3], [1, 0])
+	array([ 3.        , -0.41614684])
+	'''
+	x = np.asarray(x, dtype=float).ravel()
+	v = np.asarray(v, dtype=float).ravel()
+	if len(v) != len(x):
+		raise ValueError("v must have one entry per input")
+	seeded = DualArray(x, v)
+	outputs = _asList(f([seeded[j] for j in range(len(x))]))
+	product = np.zeros(len(outputs))
+	for i, output in enumerate(outputs):
+		try:
+			product[i] = output.Dual
+		except AttributeError:
+			pass
+	return product
+
+def vjp(f, x, u):
+	'''
+	INPUTS
+	======
+	f: 	a function taking a list of n variables and returning one output or a list
+		of m outputs, built with operators and elemFunctions
+	x: 	the n input values to evaluate at
+	u: 	the m entries of the cotangent to multiply the Jacobian with from the left
+
+	RETURNS
+	=======
+	The vector-Jacobian product u^T J of f at x, an array of length n, without forming J.
+
+	The outputs are recorded on a Tape and combined with the weights in u, so one
+	backward sweep returns the product, whatever the value of m.
+
+	EXAMPLES
+	========
+	>>> vjp(lambda x: [x[0] * x[1], ef.sin(x[0])], [2, 3], [1, 0])
+	array([3., 2.])
+	'''
+	x = np.asarray(x, dtype=float).ravel()
+	u = np.asarray(u, dtype=float).ravel()
+	tape = Tape()
+	variables = tape.variables(x)
+	outputs = _asList(f(variables))
+	if len(u) != len(outputs):
+		raise ValueError("u must have one entry per output")
+	total = 0
+	for u_i, output in zip(u.tolist(), outputs):
+		total = total + u_i * output
+	try:
+		total.backward()
+	except AttributeError:
+		# No output depends on the inputs
+		return np.zeros(len(x))
+	return np.array([variable.grad for variable in variables], dtype=float)
+
+def _forward(f, x):
+	result = vectorizeMultiDual(_asList(f(makeMultiDualVars(x))))
+	if result.Dual.shape != (len(result.Real), len(x)):
+		# Only constant outputs, which carry no directions
+		return result.Real, np.zeros((len(result.Real), len(x)))
+	return result.Real, result.Dual
+
+def _reverse(f, x):
+	tape = Tape()
+	variables = tape.variables(x)
+	outputs = _asList(f(variables))
+	value = np.zeros(len(outputs))
+	J = np.zeros([len(outputs), len(x)])
+	for i, output in enumerate(outputs):
+		try:
+			output.backward()
+			value[i] = output.val
+			J[i] = [variable.grad for variable in variables]
+		except AttributeError:
+			# Constant output
+			value[i] = output
+	return value, J
+
+def _chooseMode(f, x):
+	# The mode with the lowest estimated cost, and the reason it was chosen
+	n = len(x)
+	pattern = sparsityPattern(f, x)
+	m = len(pattern)
+	costs = {'forward': 1 + n * _TANGENT_COST, 'reverse': _RECORD_COST + m * _SWEEP_COST}
+	# Every column of the widest row needs its own color, so only color when that bound pays off
+	colors = max([len(row) for row in pattern] + [1])
+	if ADPYNE.Sparse.scipy is not None and _SPARSE_COST * (1 + colors * _TANGENT_COST) < min(costs.values()):
+		colors = int(colorColumns(pattern, n).max()) + 1
+		costs['sparse'] = _SPARSE_COST * (1 + colors * _TANGENT_COST)
+	mode = min(costs, key=costs.get)
+	reason = {
+		'forward': "one forward pass carrying {} tangent directions".format(n),
+		'reverse': "one recorded pass and {} backward sweeps".format(m),
+		'sparse': "the {} columns fit in {} groups that never share a row".format(n, colors),
+	}[mode]
+	estimates = ", ".join("{} {:.2f}".format(name, cost) for name, cost in sorted(costs.items(), key=lambda item: item[1]))
+	return mode, pattern, "n = {}, m = {}: {} (estimated relative cost: {})".format(n, m, reason, estimates)
+
+def jacobian(f, x, mode=None):
+	'''
+	INPUTS
+	======
+	f: 		a function taking a list of n variables and returning one output or a list
+			of m outputs, built with operators and elemFunctions
+	x: 		the n input values to evaluate at
+	mode: 	'forward', 'reverse' or 'sparse' to force a mode, or None to choose one
+
+	RETURNS
+	=======
+	The m output values, the m x n Jacobian of f at x, the mode used and the reason it was used.
+
+	f is first evaluated once on Pattern objects to find m and which inputs each output
+	depends on. The mode with the lowest estimated cost is then used: forward mode carries
+	all n tangent directions through one pass, reverse mode records one pass and sweeps it
+	backward once per output, and sparse mode seeds groups of columns that never share a
+	row together. In sparse mode the Jacobian is a scipy.sparse csr_matrix.
+
+	EXAMPLES
+	========
+	>>> value, J, mode, reason = jacobian(lambda x: [x[0] * x[1], ef.exp(x[0])], [2, 3])
+	>>> J
+	array([[3.        , 2.        ],
+	       [7.3890561 , 0.        ]])
+	>>> mode
+	'forward'
+	>>> reason
+	'n = 2, m = 2: one forward pass carrying 2 tangent directions (estimated relative cost: forward 1.00, reverse 6.60)'
+	'''
+	x = np.asarray(x, dtype=float).ravel()
+	if mode is None:
+		mode, pattern, reason = _chooseMode(f, x)
+	else:
+		pattern, reason = None, "requested by the caller"
+	if mode == 'forward':
+		value, J = _forward(f, x)
+	elif mode == 'reverse':
+		value, J = _reverse(f, x)
+	elif mode == 'sparse':
+		value, J = sparseJacobian(f, x, pattern)
+	else:
+		raise ValueError("mode must be 'forward', 'reverse', 'sparse' or None")
+	return value, J, mode, reason
+
+class Jacobian():
+	def __init__(self, f, x, mode=None):
+		'''
+		INPUTS
+		======
+		f: 		a function taking a list of n variables and returning one output or a list of m outputs
+		x: 		the n input values to evaluate at
+		mode: 	'forward', 'reverse' or 'sparse' to force a mode, or None to choose one
+
+		RETURNS
+		=======
+		A Jacobian object with the value and Jacobian of the function, the mode used to
+		compute them and the reason that mode was used (see jacobian).
+
+		EXAMPLES
+		========
+		>>> J = Jacobian(lambda x: x[0]**2 * x[1], [3, 2])
+		>>> J.jacobian
+		array([[12.,  9.]])
+		>>> J.mode
+		'forward'
+		'''
+		self.value, self.jacobian, self.mode, self.reason = jacobian(f, x, mode)
+
+	def __str__(self):
+		return "{} val\n\n{} jacobian\n\n{} mode: {}".format(self.value, self.jacobian, self.mode, self.reason)
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+import numpy as np
+from ADPYNE.AutoDiff import variables
+from ADPYNE.Sparse import _asList
+
+def _evaluate(f, x):
+	# The values and Jacobian of f at x, as read-only arrays so cached results cannot be changed
+	n = len(x)
+	values, jacobians = [], []
+	for output in _asList(f(variables(x))):
+		try:
+			values.append(np.ravel(output.val))
+			jacobians.append(np.reshape(output.jacobian, (-1, n)))
+		except AttributeError:
+			# Constant output
+			values.append(np.ravel(output))
+			jacobians.append(np.zeros((np.size(output), n)))
+	value = np.concatenate(values).astype(float)
+	J = np.concatenate(jacobians).astype(float)
+	value.flags.writeable = False
+	J.flags.writeable = False
+	return value, J
+
+class Memoized():
+	def __init__(self, f, size=128, tol=0):
+		'''
+		INPUTS
+		======
+		f: 		a function taking a list of n AutoDiff variables and returning one output or a
+				list of outputs, built with operators and elemFunctions
+		size: 	the most points to keep results for, or None for no limit
+		tol: 	the width of the grid cells that points are rounded to before they are
+				compared, or 0 to only reuse results for exactly the same point
+
+		RETURNS
+		=======
+		A Memoized object. Calling it with the n input values returns the values and the
+		Jacobian of f there (one row per output value) like jacobian, and keeps them in a cache
+		of the size most recently used points. Points are looked up by the bytes of the input
+		array, so a repeated point (in a line search, a derivative check or when logging) returns
+		the stored arrays without evaluating f. With a tolerance, points in the same cell of
+		width tol share the result of the first of them evaluated. The returned arrays are
+		read-only, and hits and misses count the calls answered from the cache and evaluated.
+
+		EXAMPLES
+		========
+		>>> f = Memoized(lambda x: x[0]**2 * x[1], size=10)
+		>>> value, J = f([3, 2])
+		>>> J
+		array([[12.,  9.]])
+		>>> value, J = f([3, 2])
+		>>> f.hits, f.misses
+		(1, 1)
+		'''
+		if size is not None and size < 0:
+			raise ValueError("size must be at least 0")
+		if tol < 0:
+			raise ValueError("tol must be at least 0")
+		self.f = f
+		self.size = size
+		self.tol = tol
+		self.hits = 0
+		self.misses = 0
+		self._cache = OrderedDict()
+
+	def _key(self, x):
+		if self.tol > 0:
+			x = np.round(x / self.tol)
+		# Adding 0.0 turns -0.0 into 0.0, which has different bytes
+		return (x + 0.0).tobytes()
+
+	def __call__(self, x):
+		x = np.asarray(x, dtype=float).ravel()
+		key = self._key(x)
+		try:
+			result = self._cache[key]
+		except KeyError:
+			self.misses += 1
+			result = _evaluate(self.f, x)
+			self._cache[key] = result
+			if self.size is not None and len(self._cache) > self.size:
+				# Drop the least recently used point
+				self._cache.popitem(last=False)
+			return result
+		self.hits += 1
+		self._cache.move_to_end(key)
+		return result
+
+	def __len__(self):
+		return len(self._cache)
+
+	def clear(self):
+		# Forget every stored result and reset the counters
+		self._cache.clear()
+		self.hits = 0
+		self.misses = 0
+
+	def __str__(self):
+		return "{} hits, {} misses, {} of {} points cached".format(self.hits, self.misses, len(self._cache), self.size)
@@ -0,0 +1,179 @@
+import numpy as np
+
+class MultiDual():
+	'''
+	A dual number whose dual part is a vector holding one derivative per tangent direction
+	'''
+	__slots__ = ('Real', 'Dual')
+
+	def __init__(self, Real, Dual):
+		'''
+		INPUTS
+		======
+		Real: 	the value, a scalar
+		Dual: 	the derivatives of the value along each of p directions, an array of length p
+
+		RETURNS
+		=======
+		A MultiDual object. Operations and elementary functions propagate all p directional
+		derivatives together, so one evaluation gives a full gradient when the inputs
+		are seeded with the unit vectors (see makeMultiDualVars).
+
+		EXAMPLES
+		========
+		>>> x, y = makeMultiDualVars([3, -2])
+		>>> f = 3*x**2 + x*y**2
+		>>> f.Dual
+		array([22., -12.])
+		'''
+		self.Real = float(Real)
+		self.Dual = np.asarray(Dual, dtype=float)
+
+	@classmethod
+	def _fromArrays(cls, Real, Dual):
+		# Wrap already computed values without conversion
+		dual = cls.__new__(cls)
+		dual.Real = Real
+		dual.Dual = Dual
+		return dual
+
+	def _unary(self, value, local):
+		'''
+		Result of an elementary function with the given value and derivative at the real part
+		'''
+		return MultiDual._fromArrays(value, local * self.Dual)
+
+	def __str__(self):
+		return "{} + {}ε".format(self.Real, self.Dual)
+
+	def __repr__(self):
+		return "MultiDual({}, {})".format(self.Real, self.Dual)
+
+	def __add__(self, other):
+		try:
+			return MultiDual._fromArrays(self.Real + other.Real, self.Dual + other.Dual)
+		except AttributeError:
+			return MultiDual._fromArrays(self.Real + other, self.Dual)
+
+	def __radd__(self, other):
+		return self.__add__(other)
+
+	def __sub__(self, other):
+		try:
+			return MultiDual._fromArrays(self.Real - other.Real, self.Dual - other.Dual)
+		except AttributeError:
+			return MultiDual._fromArrays(self.Real - other, self.Dual)
+
+	def __rsub__(self, other):
+		return MultiDual._fromArrays(other - self.Real, -self.Dual)
+
+	def __mul__(self, other):
+		try:
+			return MultiDual._fromArrays(self.Real * other.Real, self.Dual * other.Real + self.Real * other.Dual)
+		except AttributeError:
+			return MultiDual._fromArrays(self.Real * other, self.Dual * other)
+
+	def __rmul__(self, other):
+		return self.__mul__(other)
+
+	def __truediv__(self, other):
+		try:
+			value = self.Real / other.Real
+			return MultiDual._fromArrays(value, (self.Dual - value * other.Dual) / other.Real)
+		except AttributeError:
+			return MultiDual._fromArrays(self.Real / other, self.Dual / other)
+
+	def __rtruediv__(self, other):
+		value = other / self.Real
+		return MultiDual._fromArrays(value, -value / self.Real * self.Dual)
+
+	def __pow__(self, other):
+		try:
+			value = self.Real ** other.Real
+			dual = other.Real * self.Real ** (other.Real - 1) * self.Dual + value * np.log(self.Real) * other.Dual
+			return MultiDual._fromArrays(value, dual)
+		except AttributeError:
+			return MultiDual._fromArrays(self.Real ** other, other * self.Real ** (other - 1) * self.Dual)
+
+	def __rpow__(self, other):
+		value = other ** self.Real
+		return MultiDual._fromArrays(value, value * np.log(other) * self.Dual)
+
+	# Unary operations
+	def __pos__(self):
+		return self
+
+	def __neg__(self):
+		return MultiDual._fromArrays(-self.Real, -self.Dual)
+
+	def __abs__(self):
+		return MultiDual._fromArrays(abs(self.Real), np.sign(self.Real) * self.Dual)
+
+	# NumPy protocols: np.sin(x), np.exp(x), x + array and similar calls use the elementary functions
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+		from ADPYNE.elemFunctions import _arrayUfunc
+		return _arrayUfunc(ufunc, method, inputs, kwargs)
+
+	def __array_function__(self, func, types, args, kwargs):
+		from ADPYNE.elemFunctions import _arrayFunction
+		return _arrayFunction(func, args, kwargs)
+
+	# Comparison
+	def __eq__(self, other):
+		try:
+			return bool(np.all(self.Real == other.Real) and np.all(self.Dual == other.Dual))
+		except AttributeError:
+			return False
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+def makeMultiDualVars(x, directions=None):
+	'''
+	INPUTS
+	======
+	x: 			the point to evaluate at, a list or array of n values
+	directions: an n by p array whose columns are the tangent directions, the
+				n by n identity (the full gradient) if not given
+
+	RETURNS
+	=======
+	A list of n MultiDual objects, one per input, whose dual parts are the rows of directions
+
+	EXAMPLES
+	========
+	>>> x, y = makeMultiDualVars([1, 2], np.array([[1, 1], [0, 2]]))
+	>>> (x * y).Dual
+	array([2., 4.])
+	'''
+	x = np.asarray(x, dtype=float)
+	if directions is None:
+		directions = np.eye(len(x))
+	directions = np.asarray(directions, dtype=float)
+	if directions.shape[0] != len(x):
+		raise ValueError("directions must have one row per input")
+	return [MultiDual._fromArrays(x_j, directions[j]) for j, x_j in enumerate(x)]
+
+def vectorizeMultiDual(functions):
+	'''
+	INPUTS
+	======
+	functions: 	a list of MultiDual objects with the same number of directions
+
+	RETURNS
+	=======
+	A MultiDual object whose Real holds the value of each function and whose Dual holds
+	one row of directional derivatives per function, which is the Jacobian when the
+	inputs come from makeMultiDualVars(x) and the Jacobian times the directions otherwise.
+
+	EXAMPLES
+	========
+	>>> x, y = makeMultiDualVars([1, 2])
+	>>> f = vectorizeMultiDual([x * y, x + 3])
+	>>> f.Dual
+	array([[2., 1.],
+	       [1., 0.]])
+	'''
+	p = max(np.size(f.Dual) if isinstance(f, MultiDual) else 0 for f in functions)
+	rows = [f if isinstance(f, MultiDual) else MultiDual._fromArrays(f, np.zeros(p)) for f in functions]
+	return MultiDual._fromArrays(np.array([f.Real for f in rows], dtype=float), np.stack([f.Dual for f in rows]))
@@ -0,0 +1,129 @@
+import numpy as np
+
+class Pattern():
+	'''
+	The set of input variables a quantity depends on, used to detect the sparsity of a Jacobian
+	'''
+	__slots__ = ('dependencies',)
+
+	def __init__(self, dependencies=0):
+		'''
+		INPUTS
+		======
+		dependencies: 	an int whose jth bit is set when the quantity depends on input j
+
+		RETURNS
+		=======
+		A Pattern object. Operations on Pattern objects only combine the dependencies of
+		their operands, no values or derivatives are computed.
+
+		EXAMPLES
+		========
+		>>> x, y, z = makePatternVars(3)
+		>>> f = x * y + 2
+		>>> f.indices
+		array([0, 1])
+		'''
+		self.dependencies = dependencies
+
+	@property
+	def indices(self):
+		'''
+		The sorted indices of the inputs this quantity depends on
+		'''
+		indices = []
+		dependencies = self.dependencies
+		while dependencies:
+			lowest = dependencies & -dependencies
+			indices.append(lowest.bit_length() - 1)
+			dependencies ^= lowest
+		return np.array(indices, dtype=int)
+
+	def _combine(self, other):
+		# Constants add no dependencies
+		try:
+			return Pattern(self.dependencies | other.dependencies)
+		except AttributeError:
+			return self
+
+	def __str__(self):
+		return "{}".format(self.indices)
+
+	def __repr__(self):
+		return "Pattern({})".format(self.indices)
+
+	def __add__(self, other):
+		return self._combine(other)
+
+	def __radd__(self, other):
+		return self._combine(other)
+
+	def __sub__(self, other):
+		return self._combine(other)
+
+	def __rsub__(self, other):
+		return self._combine(other)
+
+	def __mul__(self, other):
+		return self._combine(other)
+
+	def __rmul__(self, other):
+		return self._combine(other)
+
+	def __truediv__(self, other):
+		return self._combine(other)
+
+	def __rtruediv__(self, other):
+		return self._combine(other)
+
+	def __pow__(self, other):
+		return self._combine(other)
+
+	def __rpow__(self, other):
+		return self._combine(other)
+
+	# Unary operations
+	def __pos__(self):
+		return self
+
+	def __neg__(self):
+		return self
+
+	def __abs__(self):
+		return self
+
+	# NumPy protocols: np.sin(x), np.exp(x), x + array and similar calls use the elementary functions
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+		from ADPYNE.elemFunctions import _arrayUfunc
+		return _arrayUfunc(ufunc, method, inputs, kwargs)
+
+	def __array_function__(self, func, types, args, kwargs):
+		from ADPYNE.elemFunctions import _arrayFunction
+		return _arrayFunction(func, args, kwargs)
+
+	def __eq__(self, other):
+		try:
+			return self.dependencies == other.dependencies
+		except AttributeError:
+			return False
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+def makePatternVars(n):
+	'''
+	INPUTS
+	======
+	n: 	number of input variables
+
+	RETURNS
+	=======
+	A list of n Pattern objects, the jth depending on input j only.
+
+	EXAMPLES
+	========
+	>>> x, y = makePatternVars(2)
+	>>> (x / y).indices
+	array([0, 1])
+	'''
+	return [Pattern(1 << j) for j in range(n)]
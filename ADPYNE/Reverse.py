@@ -0,0 +1,218 @@
+import numpy as np
+
+class Tape():
+	'''
+	A record of every operation performed on Reverse objects, kept in the order they were evaluated
+	'''
+
+	def __init__(self):
+		'''
+		RETURNS
+		=======
+		An empty Tape. Reverse objects created with this Tape append themselves to it.
+
+		EXAMPLES
+		========
+		>>> tape = Tape()
+		>>> x, y = tape.variables([3, 2])
+		>>> f = x * y
+		>>> len(tape)
+		3
+		'''
+		self.nodes = []
+
+	def __len__(self):
+		return len(self.nodes)
+
+	def variable(self, value):
+		return Reverse(value, self)
+
+	def variables(self, values):
+		return [Reverse(value, self) for value in values]
+
+	def gradient(self, output, inputs):
+		'''
+		INPUTS
+		======
+		output: 	a Reverse object recorded on this tape
+		inputs: 	a list of Reverse objects recorded on this tape
+
+		RETURNS
+		=======
+		An array with the derivative of the output with respect to each input, computed in one backward sweep.
+
+		EXAMPLES
+		========
+		>>> tape = Tape()
+		>>> x, y = tape.variables([3, 2])
+		>>> tape.gradient(x * y, [x, y])
+		array([2., 3.])
+		'''
+		output.backward()
+		return np.array([x.grad for x in inputs])
+
+	def clear(self):
+		self.nodes = []
+
+def _unbroadcast(grad, value):
+	# Sum an adjoint back down to the shape of the value it belongs to
+	shape = np.shape(value)
+	if np.shape(grad) == shape:
+		return grad
+	grad = np.sum(grad, axis=tuple(range(np.ndim(grad) - len(shape))))
+	for axis, size in enumerate(shape):
+		if size == 1:
+			grad = np.sum(grad, axis=axis, keepdims=True)
+	return grad
+
+class Reverse():
+	'''
+	A reverse mode auto-differentiation object that records its operations on a Tape
+	'''
+	__slots__ = ('val', 'tape', 'parents', 'grad', '_index')
+
+	def __init__(self, value, tape=None, parents=()):
+		'''
+		INPUTS
+		======
+		value: 		value to be evaluated at
+		tape: 		the Tape to record on; a new Tape is started if none is given
+		parents: 	pairs of (Reverse object, local derivative) this value was computed from
+
+		RETURNS
+		=======
+		A Reverse object whose gradient is filled in by calling backward on an output.
+
+		EXAMPLES
+		========
+		>>> tape = Tape()
+		>>> x = Reverse(3, tape)
+		>>> f = x**2
+		>>> f.backward()
+		>>> f.val
+		9.0
+		>>> x.grad
+		6.0
+		'''
+		self.val = value
+		self.tape = Tape() if tape is None else tape
+		self.parents = parents
+		self.grad = 0
+		self._index = len(self.tape.nodes)
+		self.tape.nodes.append(self)
+
+	def _child(self, value, parents):
+		for parent, _ in parents:
+			if parent.tape is not self.tape:
+				raise ValueError('Reverse objects must be recorded on the same Tape')
+		return Reverse(value, self.tape, parents)
+
+	def _unary(self, value, local):
+		return Reverse(value, self.tape, ((self, local),))
+
+	def backward(self, seed=1.0):
+		'''
+		INPUTS
+		======
+		seed: 	the derivative of the final result with respect to this object
+
+		RETURNS
+		=======
+		None. Sets grad on every object recorded on the tape up to and including this one.
+		'''
+		nodes = self.tape.nodes[:self._index + 1]
+		for node in nodes:
+			node.grad = 0
+		self.grad = seed
+		for node in reversed(nodes):
+			for parent, local in node.parents:
+				parent.grad = parent.grad + _unbroadcast(node.grad * local, parent.val)
+
+	def __str__(self):
+		return "Value:\n{}\nGradient:\n{}\n".format(self.val, self.grad)
+
+	def __repr__(self):
+		return "Value:\n{}\nGradient:\n{}\n".format(self.val, self.grad)
+
+	def __add__(self, other):
+		try:
+			return self._child(self.val + other.val, ((self, 1.0), (other, 1.0)))
+		except AttributeError:
+			return self._unary(self.val + other, 1.0)
+
+	def __radd__(self, other):
+		return self.__add__(other)
+
+	def __sub__(self, other):
+		try:
+			return self._child(self.val - other.val, ((self, 1.0), (other, -1.0)))
+		except AttributeError:
+			return self._unary(self.val - other, 1.0)
+
+	def __rsub__(self, other):
+		return self._unary(other - self.val, -1.0)
+
+	def __mul__(self, other):
+		try:
+			# Use product rule
+			return self._child(self.val * other.val, ((self, other.val), (other, self.val)))
+		except AttributeError:
+			return self._unary(self.val * other, other)
+
+	def __rmul__(self, other):
+		return self.__mul__(other)
+
+	def __truediv__(self, other):
+		try:
+			# Use quotient rule
+			return self._child(self.val / other.val, ((self, 1 / other.val), (other, -self.val / other.val**2)))
+		except AttributeError:
+			return self._unary(self.val / other, 1 / other)
+
+	def __rtruediv__(self, other):
+		return self._unary(other / self.val, -other / self.val**2)
+
+	def __pow__(self, other):
+		# Convert to float so that negative integers will work
+		other = float(other) if type(other)==int else other
+		try:
+			from ADPYNE.elemFunctions import log
+			value = self.val**other.val
+			return self._child(value, ((self, other.val * self.val**(other.val - 1)), (other, value * log(abs(self.val)))))
+		except AttributeError:
+			return self._unary(self.val**other, other * self.val**(other - 1))
+
+	def __rpow__(self, other):
+		value = other**self.val
+		return self._unary(value, np.log(other) * value)
+
+	# Unary operations
+	def __pos__(self):
+		return self
+
+	def __neg__(self):
+		return self._unary(self.val * -1, -1.0)
+
+	def __abs__(self):
+		return self._unary(abs(self.val), self.val / abs(self.val))
+
+	def __invert__(self):
+		return self._unary(~self.val, -1.0)
+
+	# NumPy protocols: np.sin(x), np.exp(x), x + array and similar calls use the elementary functions
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+		from ADPYNE.elemFunctions import _arrayUfunc
+		return _arrayUfunc(ufunc, method, inputs, kwargs)
+
+	def __array_function__(self, func, types, args, kwargs):
+		from ADPYNE.elemFunctions import _arrayFunction
+		return _arrayFunction(func, args, kwargs)
+
+	def __eq__(self, other):
+		try:
+			return bool(np.all(np.equal(self.val, other.val)))
+		except AttributeError:
+			return False
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
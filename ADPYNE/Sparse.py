@@ -0,0 +1,133 @@
+import weakref
+import numpy as np
+from ADPYNE.MultiDual import makeMultiDualVars, vectorizeMultiDual
+from ADPYNE.Pattern import makePatternVars
+from ADPYNE.elemFunctions import _kind
+
+try:
+	import scipy.sparse
+except ImportError:
+	scipy = None
+
+def _asList(outputs):
+	# A function may return a single output, or a list, tuple, array or other iterable of them.
+	# Automatic differentiation objects are single outputs even when they can be indexed.
+	if _kind(outputs) != 'constant':
+		return [outputs]
+	if isinstance(outputs, np.ndarray):
+		return list(outputs.ravel())
+	try:
+		return list(outputs)
+	except TypeError:
+		return [outputs]
+
+# Sparsity patterns by function, then by number of inputs
+_patternCache = weakref.WeakKeyDictionary()
+
+def sparsityPattern(f, x):
+	'''
+	INPUTS
+	======
+	f: 	a function taking a list of n variables and returning a list of m outputs
+	x: 	the n input values, only their number is used
+
+	RETURNS
+	=======
+	A list with, for each output, the sorted array of the inputs it depends on.
+	f is evaluated once on Pattern objects, which only combine dependency bits, and the
+	result is cached per function and number of inputs so repeated solves reuse it.
+
+	EXAMPLES
+	========
+	>>> sparsityPattern(lambda x: [x[0] * x[1], x[2] + 1], [1, 2, 3])
+	[array([0, 1]), array([2])]
+	'''
+	n = np.size(x)
+	try:
+		return _patternCache[f][n]
+	except (KeyError, TypeError):
+		pass
+	pattern = []
+	for output in _asList(f(makePatternVars(n))):
+		try:
+			pattern.append(output.indices)
+		except AttributeError:
+			# Constant output
+			pattern.append(np.array([], dtype=int))
+	try:
+		_patternCache.setdefault(f, {})[n] = pattern
+	except TypeError:
+		# f cannot be weakly referenced
+		pass
+	return pattern
+
+def colorColumns(pattern, n):
+	'''
+	INPUTS
+	======
+	pattern: 	the sparsity pattern of a Jacobian, as returned by sparsityPattern
+	n: 			number of input variables
+
+	RETURNS
+	=======
+	An array with a color for each of the n columns such that no two columns sharing a
+	nonzero row have the same color. Columns of the same color can be evaluated together
+	with a single seed. Greedy coloring, largest degree first.
+
+	EXAMPLES
+	========
+	>>> colorColumns([np.array([0, 1]), np.array([1, 2]), np.array([2, 3])], 4)
+	array([1, 0, 1, 0])
+	'''
+	neighbors = [set() for j in range(n)]
+	for row in pattern:
+		for j in row:
+			neighbors[j].update(row)
+	colors = np.full(n, -1, dtype=int)
+	for j in sorted(range(n), key=lambda j: -len(neighbors[j])):
+		used = {colors[k] for k in neighbors[j]}
+		color = 0
+		while color in used:
+			color += 1
+		colors[j] = color
+	return colors
+
+def sparseJacobian(f, x, pattern=None):
+	'''
+	INPUTS
+	======
+	f: 			a function taking a list of n variables and returning a list of m outputs
+	x: 			the n input values to evaluate at
+	pattern: 	the sparsity pattern of the Jacobian; detected with sparsityPattern if not given
+
+	RETURNS
+	=======
+	The m output values and the m x n Jacobian as a scipy.sparse csr_matrix.
+
+	Columns that never share a row are grouped by colorColumns and seeded together, so the
+	forward pass carries one derivative column per color instead of one per input.
+
+	EXAMPLES
+	========
+	>>> value, J = sparseJacobian(lambda x: [x[0] * x[1], x[1] + x[2], 2 * x[3]], [1, 2, 3, 4])
+	>>> J.toarray()
+	array([[2., 1., 0., 0.],
+	       [0., 1., 1., 0.],
+	       [0., 0., 0., 2.]])
+	'''
+	if scipy is None:
+		raise ImportError('sparseJacobian requires scipy')
+	x = np.asarray(x, dtype=float).ravel()
+	n = len(x)
+	if pattern is None:
+		pattern = sparsityPattern(f, x)
+	colors = colorColumns(pattern, n)
+	n_colors = max(colors.max() + 1, 1) if n else 1
+	# Column j is seeded with the unit direction of its color
+	seeds = np.eye(n_colors)[colors]
+	compressed = vectorizeMultiDual(_asList(f(makeMultiDualVars(x, seeds))))
+	rows = np.repeat(np.arange(len(pattern)), [len(row) for row in pattern])
+	cols = np.concatenate(pattern + [np.array([], dtype=int)])
+	data = compressed.Dual[rows, colors[cols]]
+	J = scipy.sparse.csr_matrix((data, (rows, cols)), shape=(len(pattern), n))
+	return compressed.Real, J
@@ -0,0 +1,242 @@
+import numpy as np
+from math import factorial
+
+def _promote(value, order):
+	# Truncated Taylor coefficients of a constant
+	series = np.zeros(np.shape(value) + (order + 1,))
+	series[..., 0] = value
+	return series
+
+def _mulCoefficient(a, b, k):
+	# kth coefficient of the product of two series: sum_{j=0}^{k} a_j b_{k-j}
+	return np.sum(a[..., :k+1] * b[..., k::-1], axis=-1)
+
+def _lagged(a, y, k):
+	# sum_{j=1}^{k} j a_j y_{k-j}, the building block of the recurrences for y' = a' g
+	return np.sum(np.arange(1, k + 1) * a[..., 1:k+1] * y[..., k-1::-1], axis=-1)
+
+class Taylor():
+	'''
+	A truncated univariate Taylor polynomial, used for higher order derivatives of a single variable
+	'''
+	__slots__ = ('series',)
+
+	def __init__(self, value, order=1, seed=1):
+		'''
+		INPUTS
+		======
+		value: 	value to be evaluated at, a scalar or an array of points
+		order: 	highest derivative to be propagated
+		seed: 	derivative of the input variable
+
+		RETURNS
+		=======
+		A Taylor object holding the order + 1 normalized Taylor coefficients f^(k)(x)/k! of the input.
+
+		EXAMPLES
+		========
+		>>> x = Taylor(3, 4)
+		>>> f = -5*x**3
+		>>> f.coefficients
+		array([-135., -135.,  -90.,  -30.,   -0.])
+		'''
+		self.series = _promote(value, order)
+		if order >= 1:
+			self.series[..., 1] = seed
+
+	@classmethod
+	def _fromSeries(cls, series):
+		taylor = cls.__new__(cls)
+		taylor.series = series
+		return taylor
+
+	@property
+	def order(self):
+		return self.series.shape[-1] - 1
+
+	@property
+	def val(self):
+		return self.series[..., 0]
+
+	@property
+	def coefficients(self):
+		'''
+		The value and the first through order-th derivatives, in the same layout as Dual.buildCoefficients
+		'''
+		return self.series * np.array([factorial(k) for k in range(self.order + 1)], dtype=float)
+
+	def _operands(self, other):
+		# Series of both operands, truncated to the lower of the two orders
+		order = min(self.order, other.order)
+		return self.series[..., :order+1], other.series[..., :order+1]
+
+	def _shift(self, other):
+		# Adding a constant only changes the value
+		series = self.series + np.zeros(np.shape(other) + (1,))
+		series[..., 0] = series[..., 0] + other
+		return Taylor._fromSeries(series)
+
+	def __str__(self):
+		return "{}".format(self.coefficients)
+
+	def __repr__(self):
+		return "Taylor({})".format(self.coefficients)
+
+	def __add__(self, other):
+		try:
+			a, b = self._operands(other)
+			return Taylor._fromSeries(a + b)
+		except AttributeError:
+			return self._shift(other)
+
+	def __radd__(self, other):
+		return self.__add__(other)
+
+	def __sub__(self, other):
+		try:
+			a, b = self._operands(other)
+			return Taylor._fromSeries(a - b)
+		except AttributeError:
+			return self._shift(-other)
+
+	def __rsub__(self, other):
+		return (-self)._shift(other)
+
+	def __mul__(self, other):
+		try:
+			a, b = self._operands(other)
+			c = np.empty(np.broadcast(a, b).shape)
+			for k in range(c.shape[-1]):
+				c[..., k] = _mulCoefficient(a, b, k)
+			return Taylor._fromSeries(c)
+		except AttributeError:
+			return Taylor._fromSeries(self.series * np.expand_dims(other, -1))
+
+	def __rmul__(self, other):
+		return self.__mul__(other)
+
+	def _divide(self, a, b):
+		# c = a / b from c_k = (a_k - sum_{j=1}^{k} b_j c_{k-j}) / b_0
+		c = np.empty(np.broadcast(a, b).shape)
+		c[..., 0] = a[..., 0] / b[..., 0]
+		for k in range(1, c.shape[-1]):
+			c[..., k] = (a[..., k] - np.sum(b[..., 1:k+1] * c[..., k-1::-1], axis=-1)) / b[..., 0]
+		return Taylor._fromSeries(c)
+
+	def __truediv__(self, other):
+		try:
+			a, b = self._operands(other)
+			return self._divide(a, b)
+		except AttributeError:
+			return Taylor._fromSeries(self.series / np.expand_dims(other, -1))
+
+	def __rtruediv__(self, other):
+		return self._divide(_promote(other, self.order), self.series)
+
+	def __pow__(self, other):
+		try:
+			other.series
+		except AttributeError:
+			if float(other).is_integer() and other >= 0:
+				# Repeated squaring is exact and also works when the value is 0
+				result = Taylor._fromSeries(_promote(np.ones(np.shape(self.val)), self.order))
+				base, power = self, int(other)
+				while power:
+					if power & 1:
+						result = result * base
+					base = base * base
+					power >>= 1
+				return result
+			# y = a**r from k a_0 y_k = sum_{j=1}^{k} ((r + 1) j - k) a_j y_{k-j}
+			a = self.series
+			y = np.empty(a.shape)
+			y[..., 0] = a[..., 0] ** float(other)
+			for k in range(1, a.shape[-1]):
+				j = np.arange(1, k + 1)
+				y[..., k] = np.sum(((other + 1) * j - k) * a[..., 1:k+1] * y[..., k-1::-1], axis=-1) / (k * a[..., 0])
+			return Taylor._fromSeries(y)
+		# f**g = exp(g log f)
+		return (other * self._log())._exp()
+
+	def __rpow__(self, other):
+		# c**f = exp(f log c)
+		return (self * np.log(other))._exp()
+
+	# Unary operations
+	def __pos__(self):
+		return self
+
+	def __neg__(self):
+		return Taylor._fromSeries(-self.series)
+
+	def __abs__(self):
+		return Taylor._fromSeries(self.series * np.expand_dims(np.sign(self.val), -1))
+
+	def __eq__(self, other):
+		try:
+			a, b = self._operands(other)
+			return bool(np.all(a == b))
+		except AttributeError:
+			return False
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	# Propagation rules used by elemFunctions
+	def _exp(self):
+		# y = exp(a) from k y_k = sum_{j=1}^{k} j a_j y_{k-j}
+		a = self.series
+		y = np.empty(a.shape)
+		y[..., 0] = np.exp(a[..., 0])
+		for k in range(1, a.shape[-1]):
+			y[..., k] = _lagged(a, y, k) / k
+		return Taylor._fromSeries(y)
+
+	def _sincos(self, hyperbolic=False):
+		# s' = a' c and c' = -a' s, or c' = a' s for the hyperbolic pair
+		a = self.series
+		s = np.empty(a.shape)
+		c = np.empty(a.shape)
+		if hyperbolic:
+			s[..., 0], c[..., 0], sign = np.sinh(a[..., 0]), np.cosh(a[..., 0]), 1.0
+		else:
+			s[..., 0], c[..., 0], sign = np.sin(a[..., 0]), np.cos(a[..., 0]), -1.0
+		for k in range(1, a.shape[-1]):
+			s[..., k] = _lagged(a, c, k) / k
+			c[..., k] = sign * _lagged(a, s, k) / k
+		return Taylor._fromSeries(s), Taylor._fromSeries(c)
+
+	def _integral(self, value, derivative):
+		'''
+		Series of f(a) given f(a_0) and the series of f'(a), from y' = a' f'(a)
+		'''
+		a = self.series
+		g = derivative.series
+		y = np.empty(np.broadcast(a, g).shape)
+		y[..., 0] = value
+		for k in range(1, y.shape[-1]):
+			y[..., k] = _lagged(a, g, k) / k
+		return Taylor._fromSeries(y)
+
+	def _log(self):
+		return self._integral(np.log(self.val), 1 / self)
+
+def vectorizeTaylor(functions):
+	'''
+	INPUTS
+	======
+	functions: 	a list of Taylor objects of the same order
+
+	RETURNS
+	=======
+	A Taylor object whose coefficients hold one row of derivatives per function,
+	the same layout as the coefficients of vectorizeDual.
+
+	EXAMPLES
+	========
+	>>> x = Taylor(2, 5)
+	>>> f = vectorizeTaylor([3*x**5, x**2])
+	>>> f.coefficients[0]
+	array([ 96., 240., 480., 720., 720., 360.])
+	'''
+	return Taylor._fromSeries(np.stack([f.series for f in functions]))
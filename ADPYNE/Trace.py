@@ -0,0 +1,394 @@
+import numpy as np
+
+# Value and local derivatives of every recorded operation, in terms of the names of its
+# operands {0}, {1} and of its own value {v}
+_RULES = {
+	'add': ('{0} + {1}', ('1', '1')),
+	'sub': ('{0} - {1}', ('1', '-1')),
+	'mul': ('{0} * {1}', ('{1}', '{0}')),
+	'truediv': ('{0} / {1}', ('1 / {1}', '-{v} / {1}')),
+	'pow': ('{0} ** {1}', ('{1} * {0} ** ({1} - 1)', '{v} * log({0})')),
+	'neg': ('-{0}', ('-1',)),
+	'abs': ('abs({0})', ('sign({0})',)),
+	'sin': ('sin({0})', ('cos({0})',)),
+	'cos': ('cos({0})', ('-sin({0})',)),
+	'tan': ('tan({0})', ('1 + {v} * {v}',)),
+	'arcsin': ('arcsin({0})', ('1 / sqrt(1 - {0} * {0})',)),
+	'arccos': ('arccos({0})', ('-1 / sqrt(1 - {0} * {0})',)),
+	'arctan': ('arctan({0})', ('1 / (1 + {0} * {0})',)),
+	'sinh': ('sinh({0})', ('cosh({0})',)),
+	'cosh': ('cosh({0})', ('sinh({0})',)),
+	'tanh': ('tanh({0})', ('1 - {v} * {v}',)),
+	'arcsinh': ('arcsinh({0})', ('1 / sqrt({0} * {0} + 1)',)),
+	'arccosh': ('arccosh({0})', ('1 / sqrt({0} * {0} - 1)',)),
+	'arctanh': ('arctanh({0})', ('1 / (1 - {0} * {0})',)),
+	'exp': ('exp({0})', ('{v}',)),
+	'log': ('log({0})', ('1 / {0}',)),
+	'log10': ('log10({0})', ('1 / ({0} * log(10))',)),
+	'sqrt': ('sqrt({0})', ('0.5 / {v}',)),
+	'logbase': ('log({0}) / log({1})', ('1 / ({0} * log({1}))', '-{v} / ({1} * log({1}))')),
+	'logistic': ('1 / (1 + exp(-{0}))', ('{v} * (1 - {v})',)),
+}
+
+class Graph():
+	'''
+	The operations performed on Traced objects, kept in the order they were evaluated
+	'''
+
+	def __init__(self):
+		'''
+		RETURNS
+		=======
+		An empty Graph. Each node is a tuple (operation, operand indices, value), where value
+		holds the constant of a 'const' node and the position of an 'input' node.
+
+		EXAMPLES
+		========
+		>>> graph = Graph()
+		>>> x, y = graph.variables(2)
+		>>> f = x * y + 1
+		>>> graph.nodes
+		[('input', (), 0), ('input', (), 1), ('mul', (0, 1), None), ('const', (), 1), ('add', (2, 3), None)]
+		'''
+		self.nodes = []
+
+	def __len__(self):
+		return len(self.nodes)
+
+	def _append(self, op, args=(), value=None):
+		self.nodes.append((op, args, value))
+		return len(self.nodes) - 1
+
+	def _operand(self, other):
+		# Index of a Traced operand, recording constants as they are met
+		try:
+			if other.graph is not self:
+				raise ValueError('Traced objects must be recorded on the same Graph')
+			return other.index
+		except AttributeError:
+			return self._append('const', (), other)
+
+	def variables(self, n):
+		return [Traced(self, self._append('input', (), j)) for j in range(n)]
+
+class Traced():
+	'''
+	A node of a Graph, recording the operations performed on it instead of evaluating them
+	'''
+	__slots__ = ('graph', 'index')
+
+	def __init__(self, graph, index):
+		self.graph = graph
+		self.index = index
+
+	def _record(self, op, *others):
+		args = (self.index,) + tuple(self.graph._operand(other) for other in others)
+		return Traced(self.graph, self.graph._append(op, args))
+
+	def _reflected(self, op, other):
+		return Traced(self.graph, self.graph._append(op, (self.graph._operand(other), self.index)))
+
+	def __repr__(self):
+		return "Traced({})".format(self.graph.nodes[self.index])
+
+	def __add__(self, other):
+		return self._record('add', other)
+
+	def __radd__(self, other):
+		return self._reflected('add', other)
+
+	def __sub__(self, other):
+		return self._record('sub', other)
+
+	def __rsub__(self, other):
+		return self._reflected('sub', other)
+
+	def __mul__(self, other):
+		return self._record('mul', other)
+
+	def __rmul__(self, other):
+		return self._reflected('mul', other)
+
+	def __truediv__(self, other):
+		return self._record('truediv', other)
+
+	def __rtruediv__(self, other):
+		return self._reflected('truediv', other)
+
+	def __pow__(self, other):
+		return self._record('pow', other)
+
+	def __rpow__(self, other):
+		return self._reflected('pow', other)
+
+	# Unary operations
+	def __pos__(self):
+		return self
+
+	def __neg__(self):
+		return self._record('neg')
+
+	def __abs__(self):
+		return self._record('abs')
+
+# NumPy functions available to the generated programs and to constant folding
+_NUMPY = dict((name, getattr(np, name)) for name in ['array', 'copyto', 'negative', 'add', 'subtract',
+	'multiply', 'abs', 'sign', 'sin', 'cos', 'tan', 'arcsin', 'arccos', 'arctan', 'sinh', 'cosh', 'tanh',
+	'arcsinh', 'arccosh', 'arctanh', 'exp', 'log', 'log10', 'sqrt'])
+
+# Operations whose operands can be swapped
+_COMMUTATIVE = ('add', 'mul')
+
+def _fold(op, values):
+	# Evaluate an operation on constant operands
+	names = ['a{}'.format(k) for k in range(len(values))]
+	namespace = dict(_NUMPY)
+	namespace.update(zip(names, values))
+	return eval(_RULES[op][0].format(*names), namespace)
+
+def _isConstant(node, number):
+	return node[0] == 'const' and np.ndim(node[2]) == 0 and node[2] == number
+
+def _simplify(graph, op, args):
+	# An existing node or a constant equal to an operation with a neutral or absorbing operand
+	nodes = [graph.nodes[arg] for arg in args]
+	if op == 'add':
+		if _isConstant(nodes[0], 0):
+			return args[1], None
+		if _isConstant(nodes[1], 0):
+			return args[0], None
+	elif op == 'sub':
+		if args[0] == args[1]:
+			return None, 0.0
+		if _isConstant(nodes[1], 0):
+			return args[0], None
+	elif op == 'mul':
+		if _isConstant(nodes[0], 0) or _isConstant(nodes[1], 0):
+			return None, 0.0
+		if _isConstant(nodes[0], 1):
+			return args[1], None
+		if _isConstant(nodes[1], 1):
+			return args[0], None
+	elif op in ('truediv', 'pow'):
+		if _isConstant(nodes[1], 1):
+			return args[0], None
+		if op == 'pow' and _isConstant(nodes[1], 0):
+			return None, 1.0
+	return None, None
+
+def optimizeGraph(graph, outputs):
+	'''
+	INPUTS
+	======
+	graph: 		a Graph recorded by Traced objects
+	outputs: 	indices of the output nodes
+
+	RETURNS
+	=======
+	A new Graph, the indices of the outputs in it, and the number of nodes eliminated.
+	Operations with a neutral operand (x + 0, x * 1, x / 1, x**1) are replaced by the other
+	operand and those with an absorbing one (x * 0, x - x, x**0) by a constant, and operations
+	on constants only are folded into constants. Identical nodes are merged, with the operands
+	of commutative operations sorted first, and nodes that no output depends on are dropped.
+	Inputs are always kept.
+
+	EXAMPLES
+	========
+	>>> graph = Graph()
+	>>> x, y = graph.variables(2)
+	>>> outputs = [(x * y).index, (y * x + ef.exp(x - x)).index]
+	>>> optimized, outputs, eliminated = optimizeGraph(graph, outputs)
+	>>> eliminated
+	2
+	'''
+	merged = Graph()
+	index = []
+	seen = {}
+	for op, args, value in graph.nodes:
+		args = tuple(index[arg] for arg in args)
+		if op not in ('input', 'const'):
+			same, constant = _simplify(merged, op, args)
+			if same is not None:
+				index.append(same)
+				continue
+			if constant is not None:
+				op, args, value = 'const', (), constant
+			elif all(merged.nodes[arg][0] == 'const' for arg in args):
+				op, args, value = 'const', (), _fold(op, [merged.nodes[arg][2] for arg in args])
+			elif op in _COMMUTATIVE:
+				args = tuple(sorted(args))
+		try:
+			key = (op, args, type(value), value)
+			index.append(seen[key])
+		except KeyError:
+			seen[key] = merged._append(op, args, value)
+			index.append(seen[key])
+		except TypeError:
+			# Array constants are not merged
+			index.append(merged._append(op, args, value))
+
+	# Keep the inputs and everything the outputs depend on
+	needed = [op == 'input' for op, args, value in merged.nodes]
+	stack = [index[i] for i in outputs]
+	while stack:
+		i = stack.pop()
+		if not needed[i]:
+			needed[i] = True
+			stack.extend(merged.nodes[i][1])
+	optimized = Graph()
+	compact = {}
+	for i, (op, args, value) in enumerate(merged.nodes):
+		if needed[i]:
+			compact[i] = optimized._append(op, tuple(compact[arg] for arg in args), value)
+	return optimized, [compact[index[i]] for i in outputs], len(graph) - len(optimized)
+
+def _emit(graph, outputs, n):
+	# Source of a straight-line forward mode program over the nodes of the graph
+	varying = [False] * len(graph)
+	names = []
+	constants = {}
+	for i, (op, args, value) in enumerate(graph.nodes):
+		if op == 'input':
+			varying[i] = True
+			names.append('v{}'.format(i))
+		elif op == 'const':
+			names.append('c{}'.format(i))
+			constants[names[i]] = value
+		else:
+			varying[i] = any(varying[arg] for arg in args)
+			names.append('v{}'.format(i))
+
+	rows = {}
+	for i, flag in enumerate(varying):
+		if flag:
+			rows[i] = len(rows)
+	# The last tangent row stays zero for constant outputs
+	T = np.zeros([len(rows) + 1, n])
+	namespace = dict(constants)
+	for i, row in rows.items():
+		namespace['t{}'.format(i)] = T[row]
+	inputs = [names[i] for i, node in enumerate(graph.nodes) if node[0] == 'input']
+
+	# All values are computed before any tangent, so derivative rules can reuse any value
+	values = []
+	expressions = {}
+	for i, (op, args, value) in enumerate(graph.nodes):
+		if op == 'input':
+			T[rows[i], value] = 1
+		elif op != 'const':
+			expression = _RULES[op][0].format(*[names[arg] for arg in args])
+			expressions.setdefault(expression, names[i])
+			values.append('{} = {}'.format(names[i], expression))
+
+	tangents = []
+	for i, (op, args, value) in enumerate(graph.nodes):
+		if op in ('input', 'const') or not varying[i]:
+			continue
+		operands = [names[arg] for arg in args]
+		first = True
+		for arg, local in zip(args, _RULES[op][1]):
+			if not varying[arg]:
+				continue
+			local = local.format(*operands, v=names[i])
+			local = expressions.get(local, local)
+			tangent, target = 't{}'.format(arg), 't{}'.format(i)
+			if first:
+				if local == '1':
+					tangents.append('copyto({}, {})'.format(target, tangent))
+				elif local == '-1':
+					tangents.append('negative({}, out={})'.format(tangent, target))
+				else:
+					tangents.append('multiply({}, {}, out={})'.format(tangent, local, target))
+				first = False
+			elif local == '1':
+				tangents.append('add({0}, {1}, out={0})'.format(target, tangent))
+			elif local == '-1':
+				tangents.append('subtract({0}, {1}, out={0})'.format(target, tangent))
+			else:
+				tangents.append('multiply({}, {}, out=_s)'.format(tangent, local))
+				tangents.append('add({0}, _s, out={0})'.format(target))
+
+	namespace['_s'] = np.empty(n)
+	namespace['_T'] = T
+	namespace['_rows'] = np.array([rows.get(i, len(rows)) for i in outputs], dtype=int)
+	source = ['def program(x):']
+	if inputs:
+		source.append('\t{}, = x'.format(', '.join(inputs)))
+	source.extend('\t' + line for line in values + tangents)
+	source.append('\treturn array([{}], dtype=float), _T[_rows]'.format(', '.join(names[i] for i in outputs)))
+	return '\n'.join(source) + '\n', namespace
+
+class Program():
+	'''
+	A traced function compiled to a straight-line NumPy program for its value and Jacobian
+	'''
+
+	def __init__(self, graph, outputs, n, optimize=True):
+		'''
+		INPUTS
+		======
+		graph: 		the Graph recorded by the function
+		outputs: 	indices of the output nodes
+		n: 			number of input variables
+		optimize: 	whether to simplify the graph with optimizeGraph first
+
+		RETURNS
+		=======
+		A Program object. Its source attribute holds the generated code and its eliminated
+		attribute the number of nodes removed by optimizeGraph.
+		'''
+		self.eliminated = 0
+		if optimize:
+			graph, outputs, self.eliminated = optimizeGraph(graph, outputs)
+		self.graph = graph
+		self.outputs = list(outputs)
+		self.n = n
+		self.source, namespace = _emit(graph, self.outputs, n)
+		namespace.update(_NUMPY)
+		exec(self.source, namespace)
+		self._program = namespace['program']
+
+	def __call__(self, x):
+		'''
+		INPUTS
+		======
+		x: 	the n input values to evaluate at
+
+		RETURNS
+		=======
+		The m output values and the m x n Jacobian.
+		'''
+		return self._program(np.asarray(x, dtype=float))
+
+def trace(f, n, optimize=True):
+	'''
+	INPUTS
+	======
+	f: 			a function taking a list of n variables and returning a scalar or a list of m outputs,
+				built with operators and elemFunctions without branching on values
+	n: 			number of input variables
+	optimize: 	whether to simplify the recorded graph with optimizeGraph
+
+	RETURNS
+	=======
+	A Program that evaluates the value and Jacobian of f at new inputs. f is run once on
+	Traced objects, and each call of the Program replays the recorded operations on
+	preallocated arrays without building any AutoDiff or Dual objects.
+
+	EXAMPLES
+	========
+	>>> program = trace(lambda x: [x[0] * x[1], ef.sin(x[0])], 2)
+	>>> value, jacobian = program([0, 3])
+	>>> value
+	array([0., 0.])
+	>>> jacobian
+	array([[3., 0.],
+	       [1., 0.]])
+	'''
+	graph = Graph()
+	outputs = f(graph.variables(n))
+	try:
+		outputs = list(outputs)
+	except TypeError:
+		outputs = [outputs]
+	return Program(graph, [graph._operand(output) for output in outputs], n, optimize)
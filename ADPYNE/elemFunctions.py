@@ -1,7 +1,55 @@
 import warnings
 import numpy as np
 from ADPYNE.AutoDiff import AutoDiff
+import ADPYNE.AutoDiff
 from ADPYNE.Dual import Dual
+from ADPYNE.Reverse import Reverse
+from ADPYNE.Taylor import Taylor
+from ADPYNE.Pattern import Pattern
+from ADPYNE.Trace import Traced
+from ADPYNE.DualArray import DualArray
+from ADPYNE.MultiDual import MultiDual
+
+#-------------------INPUT KINDS-------------------#
+# Kind of every input type the functions below handle; other types are registered as constants on first use
+_KINDS = {AutoDiff: 'AutoDiff', Dual: 'Dual', DualArray: 'DualArray', MultiDual: 'MultiDual', Reverse: 'Reverse', Taylor: 'Taylor', Pattern: 'Pattern', Traced: 'Traced'}
+
+def _registerKind(cls):
+	# Subclasses share the kind of their registered base class
+	for base in cls.__mro__:
+		if base in _KINDS:
+			_KINDS[cls] = _KINDS[base]
+			return _KINDS[cls]
+	_KINDS[cls] = 'constant'
+	return 'constant'
+
+def _kind(x):
+	''' Find which implementation of an elementary function handles x, without raising.
+
+	INPUTS
+	======
+	x: an AutoDiff, Dual, DualArray, MultiDual, Reverse, Taylor, Pattern or Traced object, or a constant
+
+	RETURNS
+	=======
+	The name of the kind of x. A Dual whose real part is itself an automatic
+	differentiation object (as built by makeHighestOrder) is a 'nestedDual'.
+
+	EXAMPLES
+	========
+	>>> _kind(AutoDiff(1, 1))
+	'AutoDiff'
+	>>> _kind(Dual(Dual(1, 1), 1))
+	'nestedDual'
+	>>> _kind(np.array([1, 2]))
+	'constant'
+	'''
+	kind = _KINDS.get(type(x))
+	if kind is None:
+		kind = _registerKind(type(x))
+	if kind == 'Dual' and _kind(x.Real) != 'constant':
+		return 'nestedDual'
+	return kind
 
 #-------------------BASE TRIG FUNCTIONS-------------------#
 # Sine function
@@ -31,19 +79,27 @@ def sin(x):
 	0.87758256189
 
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		new_val = np.sin(x.val)
-		new_der = np.cos(x.val) * x.der
-		new_jacobian = np.cos(x.val) * x.jacobian
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.sin(x.Real), x.Dual * np.cos(x.Real))
-		except AttributeError:
-			try:
-				return Dual(sin(x.Real), x.Dual * cos(x.Real))
-			except AttributeError:
-				return np.sin(x)
+		local = np.cos(x.val)
+		return x._unary(new_val, local)
+	if kind == 'Dual':
+		return Dual(np.sin(x.Real), x.Dual * np.cos(x.Real))
+	if kind == 'nestedDual':
+		return Dual(sin(x.Real), x.Dual * cos(x.Real))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return x._unary(np.sin(x.Real), np.cos(x.Real))
+	if kind == 'Traced':
+		return x._record('sin')
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		return x._sincos()[0]
+	if kind == 'Reverse':
+		return x._unary(sin(x.val), cos(x.val))
+	# Constant
+	return np.sin(x)
 
 # Cosine function
 
@@ -71,19 +127,27 @@ def cos(x):
 	-0.479425538604
 
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		new_val = np.cos(x.val)
-		new_der = -1.0 * np.sin(x.val) * x.der
-		new_jacobian = -1.0 * np.sin(x.val) * x.jacobian
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.cos(x.Real), x.Dual * -np.sin(x.Real))
-		except AttributeError:
-			try:
-				return Dual(cos(x.Real), x.Dual * -sin(x.Real))
-			except AttributeError:
-				return np.cos(x)
+		local = -1.0 * np.sin(x.val)
+		return x._unary(new_val, local)
+	if kind == 'Dual':
+		return Dual(np.cos(x.Real), x.Dual * -np.sin(x.Real))
+	if kind == 'nestedDual':
+		return Dual(cos(x.Real), x.Dual * -sin(x.Real))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return x._unary(np.cos(x.Real), -np.sin(x.Real))
+	if kind == 'Traced':
+		return x._record('cos')
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		return x._sincos()[1]
+	if kind == 'Reverse':
+		return x._unary(cos(x.val), -1.0 * sin(x.val))
+	# Constant
+	return np.cos(x)
 
 # Tangent function
 
@@ -96,42 +160,48 @@ def tan(x):
 	x: an AutoDiff object
 
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		# Value and derivative undefined when divisible by pi/2 but not pi
-		# To make sure the asymptotes are undefined:
-		if x.val%(np.pi/2)==0 and x.val%np.pi!=0:
-			new_val = np.nan
-			new_der = np.nan
-			new_jacobian = np.nan
+		# To make sure the asymptotes are undefined (elementwise, for vector and batch values):
+		undefined = np.logical_and(x.val%(np.pi/2)==0, x.val%np.pi!=0)
+		if np.any(undefined):
+			warnings.warn('Undefined at value', RuntimeWarning)
+		new_val = np.where(undefined, np.nan, np.tan(x.val))
+		local = np.where(undefined, np.nan, 1 / np.cos(x.val)**2.0)
+		return x._unary(new_val, local)
+	if kind == 'Dual':
+		if x.Real%(np.pi/2)==0 and x.Real%np.pi!=0:
+			ans = Dual(np.nan,np.nan)
+			warnings.warn('Undefined at value', RuntimeWarning)
+			return ans
+		else:
+			return Dual(np.tan(x.Real), x.Dual / (np.cos(x.Real))**2)
+	if kind == 'nestedDual':
+		if x.Real%(np.pi/2)==0 and x.Real%np.pi!=0:
+			ans = Dual(np.nan,np.nan)
 			warnings.warn('Undefined at value', RuntimeWarning)
+			return ans
 		else:
-			new_val = np.tan(x.val)
-			new_der = x.der / (np.cos(x.val)**2.0)
-			new_jacobian = x.jacobian / (np.cos(x.val)**2.0)
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			if x.Real%(np.pi/2)==0 and x.Real%np.pi!=0:
-				ans = Dual(np.nan,np.nan)
-				warnings.warn('Undefined at value', RuntimeWarning)
-				return ans
-			else:
-				return Dual(np.tan(x.Real), x.Dual / (np.cos(x.Real))**2)
-		except AttributeError:
-			try:
-				if x.Real%(np.pi/2)==0 and x.Real%np.pi!=0:
-					ans = Dual(np.nan,np.nan)
-					warnings.warn('Undefined at value', RuntimeWarning)
-					return ans
-				else:
-					# return Dual(tan(x.Real), x.Dual / (cos(x.Real))**2)
-					return sin(x)/cos(x)
-			except AttributeError:
-				if x%(np.pi/2)==0 and x%np.pi!=0:
-					warnings.warn('Undefined at value', RuntimeWarning)
-					return np.nan
-				else:
-					return np.tan(x)
+			# return Dual(tan(x.Real), x.Dual / (cos(x.Real))**2)
+			return sin(x)/cos(x)
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return x._unary(np.tan(x.Real), 1 / np.cos(x.Real)**2)
+	if kind == 'Traced':
+		return x._record('tan')
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		s, c = x._sincos()
+		return s / c
+	if kind == 'Reverse':
+		return x._unary(tan(x.val), 1 / cos(x.val)**2.0)
+	# Constant
+	if x%(np.pi/2)==0 and x%np.pi!=0:
+		warnings.warn('Undefined at value', RuntimeWarning)
+		return np.nan
+	else:
+		return np.tan(x)
 
 #-------------------INVERSE TRIG FUNCTIONS-------------------#
 # arc sin
@@ -157,25 +227,30 @@ def arcsin(X):
 		>>> arcsinAutoDiff.jacobian
 		1.1547005383792517
 		'''
-
-	try:
+	kind = _kind(X)
+	if kind == 'AutoDiff':
 		# Is another ADT
 		new_val = np.arcsin(X.val) 
-		new_der = (1/np.sqrt(1-X.val**2))*X.der 
-		new_jacobian = (1/np.sqrt(1-X.val**2))*X.jacobian 
-		
-		return AutoDiff(new_val, new_der, X.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.arcsin(X.Real), X.Dual/np.sqrt(1-X.Real**2))
-		except AttributeError:
-			try:
-				# return Dual(arcsin(X.Real), X.Dual/sqrt(1-X.Real**2))
-				return Dual(arcsin(X.Real), (X.Dual*(1-X.Real**2)**-0.5))
-			except AttributeError:
-			# Constant
-				return_val = np.arcsin(X)
-				return return_val
+		local = (1/np.sqrt(1-X.val**2))
+		return X._unary(new_val, local)
+	if kind == 'Dual':
+		return Dual(np.arcsin(X.Real), X.Dual/np.sqrt(1-X.Real**2))
+	if kind == 'nestedDual':
+		# return Dual(arcsin(X.Real), X.Dual/sqrt(1-X.Real**2))
+		return Dual(arcsin(X.Real), (X.Dual*(1-X.Real**2)**-0.5))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return X._unary(np.arcsin(X.Real), 1 / np.sqrt(1 - X.Real**2))
+	if kind == 'Traced':
+		return X._record('arcsin')
+	if kind == 'Pattern':
+		return X
+	if kind == 'Taylor':
+		return X._integral(np.arcsin(X.val), (1 - X*X)**-0.5)
+	if kind == 'Reverse':
+		return X._unary(arcsin(X.val), (1 - X.val**2)**-0.5)
+	# Constant
+	return_val = np.arcsin(X)
+	return return_val
 
 # arc cosine
 
@@ -202,23 +277,29 @@ def arccos(X):
 		>>> arccosAutoDiff.jacobian
 		-1.1547005383792517
 		'''
-	try:
+	kind = _kind(X)
+	if kind == 'AutoDiff':
 		# Is another ADT
 		new_val = np.arccos(X.val) #if (-1 <= X.val and X.val <= 1) else np.nan
-		new_der = (-1/np.sqrt(1-X.val**2))*X.der #if (-1 < X.val and X.val < 1) else np.nan
-		new_jacobian = (-1/np.sqrt(1-X.val**2))*X.jacobian #if (-1 < X.val and X.val < 1) else np.nan
-
-		return AutoDiff(new_val, new_der, X.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.arccos(X.Real), -X.Dual/np.sqrt(1-X.Real**2))		
-		except AttributeError:
-			try:
-				return Dual(arccos(X.Real), -X.Dual/sqrt(1-X.Real**2))
-			except AttributeError:
-			# Constant
-				return_val = np.arccos(X)
-				return return_val
+		local = (-1/np.sqrt(1-X.val**2)) #if (-1 < X.val and X.val < 1) else np.nan
+		return X._unary(new_val, local)
+	if kind == 'Dual':
+		return Dual(np.arccos(X.Real), -X.Dual/np.sqrt(1-X.Real**2))		
+	if kind == 'nestedDual':
+		return Dual(arccos(X.Real), -X.Dual/sqrt(1-X.Real**2))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return X._unary(np.arccos(X.Real), -1 / np.sqrt(1 - X.Real**2))
+	if kind == 'Traced':
+		return X._record('arccos')
+	if kind == 'Pattern':
+		return X
+	if kind == 'Taylor':
+		return X._integral(np.arccos(X.val), -1.0 * (1 - X*X)**-0.5)
+	if kind == 'Reverse':
+		return X._unary(arccos(X.val), -1.0 * (1 - X.val**2)**-0.5)
+	# Constant
+	return_val = np.arccos(X)
+	return return_val
 
 # arc tangent
 def arctan(X):
@@ -243,23 +324,29 @@ def arctan(X):
 		>>> arctanAutoDiff.jacobian
 		0.1	
 		'''
-
-	try:
+	kind = _kind(X)
+	if kind == 'AutoDiff':
 		# Is another ADT
 		new_val = np.arctan(X.val)
-		new_der = (1/(1+X.val**2))*X.der
-		new_jacobian = (1/(1+X.val**2))*X.jacobian
-		return AutoDiff(new_val, new_der, X.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.arctan(X.Real), X.Dual/(1+X.Real**2))		
-		except AttributeError:
-			try:
-				return Dual(arctan(X.Real), X.Dual/(1+X.Real**2))
-			except AttributeError:
-			# Constant
-				return_val = np.arctan(X)
-				return return_val
+		local = (1/(1+X.val**2))
+		return X._unary(new_val, local)
+	if kind == 'Dual':
+		return Dual(np.arctan(X.Real), X.Dual/(1+X.Real**2))		
+	if kind == 'nestedDual':
+		return Dual(arctan(X.Real), X.Dual/(1+X.Real**2))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return X._unary(np.arctan(X.Real), 1 / (1 + X.Real**2))
+	if kind == 'Traced':
+		return X._record('arctan')
+	if kind == 'Pattern':
+		return X
+	if kind == 'Taylor':
+		return X._integral(np.arctan(X.val), 1 / (1 + X*X))
+	if kind == 'Reverse':
+		return X._unary(arctan(X.val), 1 / (1 + X.val**2))
+	# Constant
+	return_val = np.arctan(X)
+	return return_val
 
 #-------------------HYPERBOLIC TRIG FUNCTIONS-------------------#
 # hyperbolic sin
@@ -282,21 +369,28 @@ def sinh(X):
 	>>> sinhAutoDiff.jacobian
 	1.1276259652063807
 	'''
-	try:
+	kind = _kind(X)
+	if kind == 'AutoDiff':
 		val = np.sinh(X.val)
-		der = np.cosh(X.val)*X.der
-		jacobian = np.cosh(X.val)*X.jacobian
-		return AutoDiff(val, der, X.n, 0, jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.sinh(X.Real), X.Dual*np.cosh(X.Real))		
-		except AttributeError:
-			try:
-				return Dual(sinh(X.Real), X.Dual*cosh(X.Real))
-			except AttributeError:
-			# Constant
-				return_val = np.sinh(X)
-				return return_val
+		local = np.cosh(X.val)
+		return X._unary(val, local)
+	if kind == 'Dual':
+		return Dual(np.sinh(X.Real), X.Dual*np.cosh(X.Real))		
+	if kind == 'nestedDual':
+		return Dual(sinh(X.Real), X.Dual*cosh(X.Real))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return X._unary(np.sinh(X.Real), np.cosh(X.Real))
+	if kind == 'Traced':
+		return X._record('sinh')
+	if kind == 'Pattern':
+		return X
+	if kind == 'Taylor':
+		return X._sincos(hyperbolic=True)[0]
+	if kind == 'Reverse':
+		return X._unary(sinh(X.val), cosh(X.val))
+	# Constant
+	return_val = np.sinh(X)
+	return return_val
 
 # hyperbolic cos
 
@@ -320,21 +414,28 @@ def cosh(X):
 	>>> coshAutoDiff.jacobian
 	0.5210953054937474
 	'''
-	try:
+	kind = _kind(X)
+	if kind == 'AutoDiff':
 		val = np.cosh(X.val)
-		der = np.sinh(X.val)*X.der
-		jacobian = np.sinh(X.val)*X.jacobian
-		return AutoDiff(val, der, X.n, 0, jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.cosh(X.Real), X.Dual*np.sinh(X.Real))		
-		except AttributeError:
-			try:
-				return Dual(cosh(X.Real), X.Dual*sinh(X.Real))
-			except AttributeError:
-			# Constant
-				return_val = np.cosh(X)
-				return return_val
+		local = np.sinh(X.val)
+		return X._unary(val, local)
+	if kind == 'Dual':
+		return Dual(np.cosh(X.Real), X.Dual*np.sinh(X.Real))		
+	if kind == 'nestedDual':
+		return Dual(cosh(X.Real), X.Dual*sinh(X.Real))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return X._unary(np.cosh(X.Real), np.sinh(X.Real))
+	if kind == 'Traced':
+		return X._record('cosh')
+	if kind == 'Pattern':
+		return X
+	if kind == 'Taylor':
+		return X._sincos(hyperbolic=True)[1]
+	if kind == 'Reverse':
+		return X._unary(cosh(X.val), sinh(X.val))
+	# Constant
+	return_val = np.cosh(X)
+	return return_val
 
 # hyperbolic tan
 
@@ -358,22 +459,29 @@ def tanh(X):
 	>>>tanhAutoDiff.jacobian
 	0.7864477329659275
 	'''
-	try:
+	kind = _kind(X)
+	if kind == 'AutoDiff':
 		val = np.tanh(X.val)
-		der = 1/(np.cosh(X.val)**2)*X.der
-		jacobian = 1/(np.cosh(X.val)**2)*X.jacobian
-		return AutoDiff(val, der, X.n, 0, jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.tanh(X.Real), X.Dual/(np.cosh(X.Real)**2))		
-		except AttributeError:
-			try:
-				X.Real
-				return sinh(X)/cosh(X)
-			except AttributeError:
-			# Constant
-				return_val = np.tanh(X)
-				return return_val
+		local = 1/(np.cosh(X.val)**2)
+		return X._unary(val, local)
+	if kind == 'Dual':
+		return Dual(np.tanh(X.Real), X.Dual/(np.cosh(X.Real)**2))		
+	if kind == 'nestedDual':
+		return sinh(X)/cosh(X)
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return X._unary(np.tanh(X.Real), 1 / np.cosh(X.Real)**2)
+	if kind == 'Traced':
+		return X._record('tanh')
+	if kind == 'Pattern':
+		return X
+	if kind == 'Taylor':
+		s, c = X._sincos(hyperbolic=True)
+		return s / c
+	if kind == 'Reverse':
+		return X._unary(tanh(X.val), 1 / cosh(X.val)**2)
+	# Constant
+	return_val = np.tanh(X)
+	return return_val
 
 #-------------------ARC HYPERBOLIC TRIG FUNCTIONS-------------------#
 # hyperbolic arcsin
@@ -402,21 +510,28 @@ def arcsinh(x):
 	0.19611613513818404
 	
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		new_val = np.arcsinh(x.val)
-		new_der = ((1)/np.sqrt(x.val**2 + 1))*x.der
-		new_jacobian = ((1)/np.sqrt(x.val**2 + 1))*x.jacobian
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.arcsinh(x.Real), x.Dual/np.sqrt((x.Real**2)+1))		
-		except AttributeError:
-			try:
-				return Dual(arcsinh(x.Real), (x.Dual*(1+x.Real**2)**-0.5))
-			except AttributeError:
-			# Constant
-				return_val = np.arcsinh(x)
-				return return_val
+		local = ((1)/np.sqrt(x.val**2 + 1))
+		return x._unary(new_val, local)
+	if kind == 'Dual':
+		return Dual(np.arcsinh(x.Real), x.Dual/np.sqrt((x.Real**2)+1))		
+	if kind == 'nestedDual':
+		return Dual(arcsinh(x.Real), (x.Dual*(1+x.Real**2)**-0.5))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return x._unary(np.arcsinh(x.Real), 1 / np.sqrt(x.Real**2 + 1))
+	if kind == 'Traced':
+		return x._record('arcsinh')
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		return x._integral(np.arcsinh(x.val), (x*x + 1)**-0.5)
+	if kind == 'Reverse':
+		return x._unary(arcsinh(x.val), (x.val**2 + 1)**-0.5)
+	# Constant
+	return_val = np.arcsinh(x)
+	return return_val
 
 # hyperbolic arc cosine
 
@@ -444,22 +559,29 @@ def arccosh(x):
 	(1/np.sqrt(1.1**2 - 1))
 	
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		new_val = np.arccosh(x.val)
 		# Derivative of arccosh is only defined when x > 1
-		new_der = ((1)/np.sqrt(x.val**2 - 1))*x.der  # if x.val > 1 else None
-		new_jacobian = ((1)/np.sqrt(x.val**2 - 1))*x.jacobian  # if x.val > 1 else None
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.arccosh(x.Real), x.Dual/np.sqrt((x.Real**2)-1))		
-		except AttributeError:
-			try:
-				return Dual(arccosh(x.Real), (x.Dual*((x.Real**2)-1)**-0.5))
-			except AttributeError:
-			# Constant
-				return_val = np.arccosh(x)
-				return return_val
+		local = ((1)/np.sqrt(x.val**2 - 1))  # if x.val > 1 else None
+		return x._unary(new_val, local)
+	if kind == 'Dual':
+		return Dual(np.arccosh(x.Real), x.Dual/np.sqrt((x.Real**2)-1))		
+	if kind == 'nestedDual':
+		return Dual(arccosh(x.Real), (x.Dual*((x.Real**2)-1)**-0.5))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return x._unary(np.arccosh(x.Real), 1 / np.sqrt(x.Real**2 - 1))
+	if kind == 'Traced':
+		return x._record('arccosh')
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		return x._integral(np.arccosh(x.val), (x*x - 1)**-0.5)
+	if kind == 'Reverse':
+		return x._unary(arccosh(x.val), (x.val**2 - 1)**-0.5)
+	# Constant
+	return_val = np.arccosh(x)
+	return return_val
 
 # hyperbolic arc tangent
 
@@ -487,28 +609,35 @@ def arctanh(x):
 	1/(1-(0.5)**2)
 	
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		new_val = np.arctanh(x.val)
-		new_der = ((1)/(1-x.val**2))*x.der
-		new_jacobian = ((1)/(1-x.val**2))*x.jacobian
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			if(np.abs(x.Real)==1):
-				real = np.inf
-				dual = np.inf
-				warnings.warn('Undefined at value', RuntimeWarning)
-			else:
-				real = np.arctanh(x.Real)
-				dual = x.Dual/(1-x.Real**2)
-			return Dual(real, dual)	
-		except AttributeError:
-			try:
-				return Dual(arctanh(x.Real), x.Dual/(1-x.Real**2))
-			except AttributeError:
-			# Constant
-				return_val = np.arctanh(x)
-				return return_val
+		local = ((1)/(1-x.val**2))
+		return x._unary(new_val, local)
+	if kind == 'Dual':
+		if(np.abs(x.Real)==1):
+			real = np.inf
+			dual = np.inf
+			warnings.warn('Undefined at value', RuntimeWarning)
+		else:
+			real = np.arctanh(x.Real)
+			dual = x.Dual/(1-x.Real**2)
+		return Dual(real, dual)	
+	if kind == 'nestedDual':
+		return Dual(arctanh(x.Real), x.Dual/(1-x.Real**2))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return x._unary(np.arctanh(x.Real), 1 / (1 - x.Real**2))
+	if kind == 'Traced':
+		return x._record('arctanh')
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		return x._integral(np.arctanh(x.val), 1 / (1 - x*x))
+	if kind == 'Reverse':
+		return x._unary(arctanh(x.val), 1 / (1 - x.val**2))
+	# Constant
+	return_val = np.arctanh(x)
+	return return_val
 
 
 #--------------------------EXPONENT FAMILY----------------------------#
@@ -537,21 +666,30 @@ def exp(x):
 	>>> myAutoDiff.jacobian
 	22026.465794806718	
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		new_val = np.exp(x.val)
-		new_der = np.exp(x.val) * x.der
-		new_jacobian = np.exp(x.val) * x.jacobian
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.exp(x.Real), x.Dual*np.exp(x.Real))		
-		except AttributeError:
-			try:
-				return Dual(exp(x.Real), x.Dual*exp(x.Real))
-			except AttributeError:
-			# Constant
-				return_val = np.exp(x)
-				return return_val
+		# The derivative of exp is its value
+		return x._unary(new_val, new_val)
+	if kind == 'Dual':
+		return Dual(np.exp(x.Real), x.Dual*np.exp(x.Real))		
+	if kind == 'nestedDual':
+		return Dual(exp(x.Real), x.Dual*exp(x.Real))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		new_val = np.exp(x.Real)
+		return x._unary(new_val, new_val)
+	if kind == 'Traced':
+		return x._record('exp')
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		return x._exp()
+	if kind == 'Reverse':
+		new_val = exp(x.val)
+		return x._unary(new_val, new_val)
+	# Constant
+	return_val = np.exp(x)
+	return return_val
 
 # natural log
 
@@ -579,28 +717,35 @@ def log(x):
 	0.25
 	
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		new_val = np.log(x.val)
 		# Derivative not defined when x = 0
-		new_der = (1/(x.val*np.sum(1)))*x.der # if x.val != 0 else None
-		new_jacobian = (1/(x.val*np.sum(1)))*x.jacobian # if x.val != 0 else None
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			if(x.Real==0):
-				real = -np.inf
-				dual = np.inf
-			else:
-				real = np.log(x.Real)
-				dual = x.Dual/x.Real
-			return Dual(real, dual)		
-		except AttributeError:
-			try:
-				return Dual(log(x.Real), x.Dual/x.Real)
-			except AttributeError:
-			# Constant
-				return_val = np.log(x)
-				return return_val
+		local = (1/(x.val*np.sum(1))) # if x.val != 0 else None
+		return x._unary(new_val, local)
+	if kind == 'Dual':
+		if(x.Real==0):
+			real = -np.inf
+			dual = np.inf
+		else:
+			real = np.log(x.Real)
+			dual = x.Dual/x.Real
+		return Dual(real, dual)		
+	if kind == 'nestedDual':
+		return Dual(log(x.Real), x.Dual/x.Real)
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return x._unary(np.log(x.Real), 1 / x.Real)
+	if kind == 'Traced':
+		return x._record('log')
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		return x._log()
+	if kind == 'Reverse':
+		return x._unary(log(x.val), 1 / x.val)
+	# Constant
+	return_val = np.log(x)
+	return return_val
 
 # log base 10
 def log10(x):
@@ -626,24 +771,31 @@ def log10(x):
 	0.8685889638065035
 	
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		new_val = np.log10(x.val)
 		# Derivative not defined when x = 0
-		new_der = (1/(x.val*np.log(10)))*x.der
-		new_jacobian = (1/(x.val*np.log(10)))*x.jacobian
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			real = np.log10(x.Real)
-			dual = x.Dual/(x.Real*np.log(10))
-			return Dual(real, dual)		
-		except AttributeError:
-			try:
-				return Dual(log(x.Real)/np.log(10), x.Dual/(x.Real*(np.log(10))))
-			except AttributeError:
-			# Constant
-				return_val = np.log10(x)
-				return return_val
+		local = (1/(x.val*np.log(10)))
+		return x._unary(new_val, local)
+	if kind == 'Dual':
+		real = np.log10(x.Real)
+		dual = x.Dual/(x.Real*np.log(10))
+		return Dual(real, dual)		
+	if kind == 'nestedDual':
+		return Dual(log(x.Real)/np.log(10), x.Dual/(x.Real*(np.log(10))))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return x._unary(np.log10(x.Real), 1 / (x.Real * np.log(10)))
+	if kind == 'Traced':
+		return x._record('log10')
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		return x._log() / np.log(10)
+	if kind == 'Reverse':
+		return x._unary(log10(x.val), 1 / (x.val * np.log(10)))
+	# Constant
+	return_val = np.log10(x)
+	return return_val
 
 # Square Root
 
@@ -669,32 +821,45 @@ def sqrt(x):
 	0.2236068
 
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		new_val = np.sqrt(x.val)
-		new_der = 0.5 * x.val ** (-0.5) * x.der
-		new_jacobian = 0.5 * x.val ** (-0.5) * x.jacobian
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-			try:
-				if x.Real < 0.0:
-					warnings.warn('Undefined at value', RuntimeWarning)
-					dual=np.nan
-				
-				elif(x.Real==0):
-					warnings.warn('Undefined at value', RuntimeWarning)
-					dual = np.inf
-				
-				else:
-					dual = 0.5 * x.Real ** (-0.5) * x.Dual
-				
-				real = np.sqrt(x.Real)
-				return Dual(real, dual)
-			except AttributeError:
-				if x < 0.0:
-					warnings.warn('Undefined at value', RuntimeWarning)
-					return np.nan
-				else:
-					return np.sqrt(x)
+		local = 0.5 * x.val ** (-0.5)
+		return x._unary(new_val, local)
+	if kind == 'Dual':
+		if x.Real < 0.0:
+			warnings.warn('Undefined at value', RuntimeWarning)
+			dual=np.nan
+
+		elif(x.Real==0):
+			warnings.warn('Undefined at value', RuntimeWarning)
+			dual = np.inf
+
+		else:
+			dual = 0.5 * x.Real ** (-0.5) * x.Dual
+
+		real = np.sqrt(x.Real)
+		return Dual(real, dual)
+	if kind == 'nestedDual':
+		return x**0.5
+	if kind == 'DualArray' or kind == 'MultiDual':
+		new_val = np.sqrt(x.Real)
+		return x._unary(new_val, 0.5 / new_val)
+	if kind == 'Traced':
+		return x._record('sqrt')
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		return x**0.5
+	if kind == 'Reverse':
+		new_val = sqrt(x.val)
+		return x._unary(new_val, 0.5 / new_val)
+	# Constant
+	if np.any(np.less(x, 0.0)):
+		warnings.warn('Undefined at value', RuntimeWarning)
+		return np.nan
+	else:
+		return np.sqrt(x)
 
 # log base
 	
@@ -721,22 +886,29 @@ def logbase(x,base):
 	0.25694917
 	
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		new_val = np.log(x.val)/np.log(base)
 		# Derivative not defined when x = 0
-		new_der = (1/(x.val*np.log(base)))*x.der
-		new_jacobian = (1/(x.val*np.log(base)))*x.jacobian
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			return Dual(np.log(x.Real)/np.log(base), x.Dual/(x.Real*np.log(base)))		
-		except AttributeError:
-			try:
-				return Dual(log(x.Real)/np.log(base), x.Dual/(x.Real*(np.log(base))))
-			except AttributeError:
-			# Constant
-				return_val = np.log(x)/np.log(base)
-				return return_val
+		local = (1/(x.val*np.log(base)))
+		return x._unary(new_val, local)
+	if kind == 'Dual':
+		return Dual(np.log(x.Real)/np.log(base), x.Dual/(x.Real*np.log(base)))		
+	if kind == 'nestedDual':
+		return Dual(log(x.Real)/np.log(base), x.Dual/(x.Real*(np.log(base))))
+	if kind == 'DualArray' or kind == 'MultiDual':
+		return x._unary(np.log(x.Real) / np.log(base), 1 / (x.Real * np.log(base)))
+	if kind == 'Traced':
+		return x._record('logbase', base)
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		return x._log() / np.log(base)
+	if kind == 'Reverse':
+		return x._unary(logbase(x.val, base), 1 / (x.val * np.log(base)))
+	# Constant
+	return_val = np.log(x)/np.log(base)
+	return return_val
 
 def logistic(x):
 	''' Compute logistic function for AutoDiff or Dual object.
@@ -751,20 +923,135 @@ def logistic(x):
 	
 	
 	'''
-	try:
+	kind = _kind(x)
+	if kind == 'AutoDiff':
 		f_l = (1/(1+np.exp(-x.val)))
 		new_val = f_l
-		new_der = (1 - f_l)*f_l*x.der
-		new_jacobian = (1 - f_l)*f_l*x.jacobian
-		return AutoDiff(new_val, new_der, x.n, 0, new_jacobian)
-	except AttributeError:
-		try:
-			f_l = (1/(1 + np.exp(-x.Real)))
-			return Dual(f_l, (1 - f_l)*f_l*x.Dual)		
-		except AttributeError:
-			try:
-				return Dual(logistic(x.Real), (1 - logistic(x.Real))*logistic(x.Real)*x.Dual)
-			except AttributeError:
-			# Constant
-				return_val = (1/(1+np.exp(-x)))
-				return return_val
+		local = (1 - f_l)*f_l
+		return x._unary(new_val, local)
+	if kind == 'Dual':
+		f_l = (1/(1 + np.exp(-x.Real)))
+		return Dual(f_l, (1 - f_l)*f_l*x.Dual)		
+	if kind == 'nestedDual':
+		return Dual(logistic(x.Real), (1 - logistic(x.Real))*logistic(x.Real)*x.Dual)
+	if kind == 'DualArray' or kind == 'MultiDual':
+		f_l = 1 / (1 + np.exp(-x.Real))
+		return x._unary(f_l, (1 - f_l) * f_l)
+	if kind == 'Traced':
+		return x._record('logistic')
+	if kind == 'Pattern':
+		return x
+	if kind == 'Taylor':
+		return 1 / (1 + exp(-x))
+	if kind == 'Reverse':
+		f_l = logistic(x.val)
+		return x._unary(f_l, (1 - f_l) * f_l)
+	# Constant
+	return_val = (1/(1+np.exp(-x)))
+	return return_val
+
+#-------------------NUMPY PROTOCOLS-------------------#
+# NumPy ufuncs and functions with an implementation for AutoDiff, Dual, DualArray, MultiDual, Reverse and Pattern objects
+_UFUNCS = {np.sin: sin, np.cos: cos, np.tan: tan, np.arcsin: arcsin, np.arccos: arccos, np.arctan: arctan,
+	np.sinh: sinh, np.cosh: cosh, np.tanh: tanh, np.arcsinh: arcsinh, np.arccosh: arccosh, np.arctanh: arctanh,
+	np.exp: exp, np.log: log, np.log10: log10, np.sqrt: sqrt,
+	np.negative: lambda x: -x, np.positive: lambda x: +x, np.absolute: lambda x: abs(x)}
+
+# Binary ufuncs and the operator methods implementing them, called directly so that
+# ndarray operands do not dispatch back to NumPy
+_OPERATORS = {np.add: ('__add__', '__radd__'), np.subtract: ('__sub__', '__rsub__'),
+	np.multiply: ('__mul__', '__rmul__'), np.true_divide: ('__truediv__', '__rtruediv__'),
+	np.power: ('__pow__', '__rpow__')}
+
+def _rowAxis(x, axis):
+	# Whether axis names the rows of x, the only axis the AutoDiff reductions reduce over
+	# (for a column vector, reducing over every axis reduces over its rows)
+	ndim = np.ndim(x.val)
+	if axis is None:
+		return ndim == 2
+	return axis in (-2, ndim - 2)
+
+def _forAutoDiff(func, implementation, parameters, passed):
+	# NumPy's func, given the names of its parameters, which calls implementation with the passed ones
+	# when an argument is an AutoDiff object. keepdims is accepted (the results always keep their
+	# dimensions), while other axes and other arguments are not implemented.
+	def call(*args, **kwargs):
+		if not any(_kind(arg) == 'AutoDiff' for arg in args):
+			return func._implementation(*args, **kwargs)
+		arguments = dict(zip(parameters, args))
+		arguments.update(kwargs)
+		axis = arguments.pop('axis', None)
+		arguments.pop('keepdims', None)
+		if any(name not in passed and value is not None for name, value in arguments.items()):
+			return NotImplemented
+		if 'axis' in parameters and not _rowAxis(arguments[passed[0]], axis):
+			return NotImplemented
+		return implementation(*[arguments[name] for name in passed if name in arguments])
+	return call
+
+_REDUCTION = ('a', 'axis', 'dtype', 'out', 'keepdims', 'initial', 'where')
+
+_FUNCTIONS = {np.emath.logn: lambda n, x: logbase(x, n),
+	np.sum: _forAutoDiff(np.sum, ADPYNE.AutoDiff.sum, _REDUCTION, ('a',)),
+	np.prod: _forAutoDiff(np.prod, ADPYNE.AutoDiff.prod, _REDUCTION, ('a',)),
+	np.dot: _forAutoDiff(np.dot, ADPYNE.AutoDiff.dot, ('a', 'b', 'out'), ('a', 'b')),
+	np.linalg.norm: _forAutoDiff(np.linalg.norm, ADPYNE.AutoDiff.norm, ('x', 'ord', 'axis', 'keepdims'), ('x', 'ord'))}
+
+def _arrayUfunc(ufunc, method, inputs, kwargs):
+	''' Apply a NumPy ufunc to AutoDiff or Dual inputs, as called by their __array_ufunc__.
+
+	RETURNS
+	=======
+	The result of the matching elementary function or operator, or NotImplemented for
+	ufuncs, methods (such as reduce) and keyword arguments (such as out) that are not covered.
+	An array operand of a scalar Dual, MultiDual or Pattern object gives an array with one result per
+	element, as without this protocol; AutoDiff, DualArray and Reverse objects use their (reflected)
+	operators, so arr * x is the same as x * arr.
+
+	EXAMPLES
+	========
+	>>> x = AutoDiff(0.5, 2.0)
+	>>> np.sin(x) == sin(x)
+	True
+	'''
+	kinds = [_kind(value) for value in inputs]
+	if ufunc is np.matmul and 'AutoDiff' in kinds and method == '__call__' and not kwargs:
+		# Matrix products with a vector AutoDiff object, as in A @ x
+		return ADPYNE.AutoDiff.matmul(*inputs)
+	if not any(kind in ('AutoDiff', 'DualArray', 'Reverse') for kind in kinds) and \
+			any(np.ndim(value) > 0 for value, kind in zip(inputs, kinds) if kind == 'constant'):
+		# Operations of scalar Dual, MultiDual or Pattern objects with arrays keep NumPy's elementwise loop,
+		# with every such operand taken as a single element (makeHessianVars builds its Dual parts
+		# this way). AutoDiff, DualArray and Reverse objects hold arrays themselves and broadcast against them.
+		elements = []
+		for value, kind in zip(inputs, kinds):
+			if kind != 'constant':
+				element = np.empty((), dtype=object)
+				element[()] = value
+				value = element
+			elements.append(value)
+		return getattr(ufunc, method)(*elements, **kwargs)
+	if method != '__call__' or kwargs:
+		return NotImplemented
+	if ufunc in _UFUNCS:
+		return _UFUNCS[ufunc](inputs[0])
+	if ufunc in _OPERATORS:
+		forward, reflected = _OPERATORS[ufunc]
+		a, b = inputs
+		if kinds[0] == 'constant':
+			return getattr(b, reflected)(a)
+		return getattr(a, forward)(b)
+	return NotImplemented
+
+def _arrayFunction(func, args, kwargs):
+	''' Call a NumPy function on AutoDiff or Dual arguments, as called by their __array_function__.
+
+	RETURNS
+	=======
+	The result of the matching implementation, or NotImplemented for arguments it does not cover
+	(such as an axis other than the rows of an AutoDiff object). Functions without one
+	(np.shape, np.ndim, ...) run NumPy's own implementation, which treats the object as a scalar as before.
+	'''
+	if func in _FUNCTIONS:
+		return _FUNCTIONS[func](*args, **kwargs)
+	return func._implementation(*args, **kwargs)
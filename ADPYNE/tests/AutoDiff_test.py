@@ -1,11 +1,14 @@
 import warnings
 import pytest
 import numpy as np
+import operator
 import os,sys,inspect
 currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
 parentdir = os.path.dirname(currentdir)
 sys.path.insert(0,parentdir)
-from ADPYNE.AutoDiff import AutoDiff, vectorize
+from ADPYNE.AutoDiff import AutoDiff, vectorize, makeBatchVars, vectorizeBatch, sumTerms, dotTerms, matmul, dot, norm, prod, variables, _broadcastShape
+import ADPYNE.AutoDiff
+from ADPYNE.Dual import Dual
 import ADPYNE.elemFunctions as ef
 
 # helper function tests
@@ -36,6 +39,17 @@ def test_calcDerivative():
 	AD = AutoDiff(4, 2, n=4, k=3)
 	assert np.all(np.equal(AD.der, np.array([[0, 0, 2, 0]])))
 
+def test_fromArrays():
+	val = np.array([[2.0]])
+	der = np.array([[1.0, 0.0]])
+	jacobian = np.array([[0.5, 0.0]])
+	AD = AutoDiff._fromArrays(val, der, 2, jacobian)
+	assert AD.val is val
+	assert AD.der is der
+	assert AD.jacobian is jacobian
+	assert AD.n == 2
+	assert AD == AutoDiff(val, der, 2, 0, jacobian)
+
 # addition tests
 def test_add_ad_results():
 	# single input cases
@@ -158,21 +172,38 @@ def test_rsub_constant_results():
 	x = AutoDiff(5, 2)
 	f = 3 - x
 	assert f.val == -2
-	assert f.der == 2
-	assert f.jacobian == 1
+	assert f.der == -2
+	assert f.jacobian == -1
 	# negative numbers
 	x = AutoDiff(-5, 2)
 	f = 3 - x
 	assert f.val == 8
-	assert f.der == 2
-	assert f.jacobian == 1
+	assert f.der == -2
+	assert f.jacobian == -1
 
 def test_rsub_constant_vector_results():
 	x = AutoDiff([1, 3], [2, 1], 2, 1)
 	f = 3 - x
 	assert np.all(f.val == np.array([[2, 0]]).T)
-	assert np.all(f.der == np.array([[2, 0], [1, 0]]))
-	assert np.all(f.jacobian == np.array([[1, 0], [1, 0]]))
+	assert np.all(f.der == np.array([[-2, 0], [-1, 0]]))
+	assert np.all(f.jacobian == np.array([[-1, 0], [-1, 0]]))
+
+def test_rsub_matches_finite_differences():
+	f = lambda x: [3 - x[0] * x[1], 1 - ef.sin(x[2]), 2 - (1 - x[0]) / x[2]]
+	values = np.array([0.5, 1.5, 2.0])
+	steps = 1e-6 * np.eye(3)
+	expected = np.array([[(g(values + h) - g(values - h)) / 2e-6 for h in steps]
+		for g in [lambda v, i=i: f(list(v))[i] for i in range(3)]])
+	for lazy in [False, True]:
+		xs = variables(values, 2, lazy=lazy)
+		result = vectorize(f(xs), 3)
+		assert (result._der is None) == lazy
+		assert np.allclose(result.jacobian, expected)
+		assert np.allclose(result.der, 2 * expected)
+	x, y, z = makeBatchVars(np.array([values, values + 1]), lazy=True)
+	result = vectorizeBatch(f([x, y, z]))
+	assert np.allclose(result.jacobian[0], expected)
+	assert np.allclose(result.der[0], expected)
 
 # multiplication tests
 def test_mul_ad_results():
@@ -506,3 +537,626 @@ def test_vectorize():
 	assert np.all(f.val == np.array([[9],[0],[1.5],[2]]))
 	assert np.all(f.der == np.array([[6, 4, 8], [2, -2, 2], [1, 0, 0], [4, -4, 0]]))
 	assert np.all(f.jacobian == np.array([[3, 2, 4], [1, -1, 1], [0.5, 0, 0], [2, -2, 0]]))
+
+def test_slots():
+	x = AutoDiff(3, 2, n=2, k=1)
+	f = 2*x + 1
+	assert not hasattr(f, '__dict__')
+	with pytest.raises(AttributeError):
+		f.other = 1
+
+def test_makeBatchVars():
+	points = np.array([[1, 2], [3, 4], [5, 6]])
+	x, y = makeBatchVars(points, 2)
+	assert x.val.shape == (3, 1)
+	assert np.all(x.val == np.array([[1], [3], [5]]))
+	assert np.all(y.jacobian == np.array([[0, 1], [0, 1], [0, 1]]))
+	assert np.all(y.der == np.array([[0, 2], [0, 2], [0, 2]]))
+	f = 3*x**2 + x*y
+	assert np.all(f.val == np.array([[5], [39], [105]]))
+	assert np.all(f.jacobian == np.array([[8, 1], [22, 3], [36, 5]]))
+	assert np.all(f.der == 2 * f.jacobian)
+
+def test_makeBatchVars_single():
+	x, = makeBatchVars([-2, -1, 1, 2])
+	f = x**3 - 5*x**-2
+	g = AutoDiff([-2, -1, 1, 2], 1)
+	g = g**3 - 5*g**-2
+	assert np.allclose(f.val, g.val)
+	assert np.allclose(f.jacobian, g.jacobian)
+
+def test_batch_matches_pointwise():
+	points = np.random.RandomState(0).uniform(0.1, 0.9, size=(50, 3))
+	x, y, z = makeBatchVars(points)
+	f = ef.exp(x) * ef.sin(y / z) + ef.log(x * z) - ef.tan(y) + ef.arcsin(z)**2
+	for i, point in enumerate(points):
+		xp = AutoDiff(point[0], 1, n=3, k=1)
+		yp = AutoDiff(point[1], 1, n=3, k=2)
+		zp = AutoDiff(point[2], 1, n=3, k=3)
+		fp = ef.exp(xp) * ef.sin(yp / zp) + ef.log(xp * zp) - ef.tan(yp) + ef.arcsin(zp)**2
+		assert np.allclose(f.val[i], fp.val[0])
+		assert np.allclose(f.jacobian[i], fp.jacobian[0])
+
+def test_vectorizeBatch():
+	x, y = makeBatchVars(np.array([[1, 2], [3, 4]]))
+	f = vectorizeBatch([x * y, x + y, 2*x])
+	assert f.val.shape == (2, 3, 1)
+	assert f.jacobian.shape == (2, 3, 2)
+	assert np.all(f.val[:, :, 0] == np.array([[2, 3, 2], [12, 7, 6]]))
+	assert np.all(f.jacobian[1] == np.array([[4, 3], [1, 1], [2, 0]]))
+	# Operations keep broadcasting over the batch and outputs
+	g = ef.sin(f) * f
+	assert g.jacobian.shape == (2, 3, 2)
+	expected = (np.cos(f.val) * f.val + np.sin(f.val)) * f.jacobian
+	assert np.allclose(g.jacobian, expected)
+
+def test_vectorize_generator():
+	x = AutoDiff(3, np.array([[2]]), n=3, k=1)
+	y = AutoDiff(2, np.array([[2]]), n=3, k=2)
+	z = AutoDiff(-1, np.array([[2]]), n=3, k=3)
+	f = vectorize((c*x + y - z for c in range(4)), 3)
+	assert np.all(f.val == np.array([[3], [6], [9], [12]]))
+	assert np.all(f.jacobian == np.array([[0, 1, -1], [1, 1, -1], [2, 1, -1], [3, 1, -1]]))
+	assert np.all(f.der == 2 * f.jacobian)
+
+def test_vectorize_generator_lazy():
+	x, y = AutoDiff([3, 2], 2, n=2, k=[1, 2], lazy=True)
+	w = AutoDiff(1, 3, n=2, k=1, lazy=True)
+	f = vectorize((c * x * y for c in range(3)), 2)
+	assert f.seed is x.seed and f._der is None
+	# Functions with different seeds need their derivatives
+	g = vectorize((term for term in [x * y, w, x + 1]), 2)
+	assert g.seed is None
+	assert np.all(g.der == np.array([[4, 6], [3, 0], [2, 0]]))
+
+def test_vectorize_empty():
+	with pytest.raises(ValueError):
+		vectorize([], 3)
+	with pytest.raises(ValueError):
+		vectorize(iter([]), 3)
+	with pytest.raises(ValueError):
+		vectorizeBatch([])
+
+def test_vectorize_vectors():
+	x = AutoDiff([1, 2, 3], 2, n=2, k=1)
+	y = AutoDiff([4, 5, 6], 2, n=2, k=2)
+	fs = [x*y, x + 2*y]
+	f = vectorize(fs, 2, 3)
+	assert f.val.shape == (2, 3)
+	assert f.jacobian.shape == (3, 2, 2)
+	assert np.all(f.val == np.array([[4, 10, 18], [9, 12, 15]]))
+	for j in range(3):
+		assert np.all(f.jacobian[j] == np.array([[4 + j, 1 + j], [1, 2]]))
+		assert np.all(f.der[j] == 2 * f.jacobian[j])
+
+def test_calcJacobian_k_sequence():
+	X = AutoDiff([3, -2, 1], 2, n=3, k=[1, 2, 3])
+	assert np.all(X.val == np.array([[3], [-2], [1]]))
+	assert np.all(X.jacobian == np.eye(3))
+	assert np.all(X.der == 2 * np.eye(3))
+	Y = AutoDiff([3, -2], [1, 2], n=3, k=np.array([3, 1]))
+	assert np.all(Y.der == np.array([[0, 0, 1], [2, 0, 0]]))
+
+def test_getitem():
+	X = AutoDiff([3, -2, 1], 2, n=3, k=[1, 2, 3])
+	x, y, z = X
+	assert x == AutoDiff(3, 2, n=3, k=1)
+	assert z == AutoDiff(1, 2, n=3, k=3)
+	assert X[-1] == z
+	tail = X[1:]
+	assert np.all(tail.val == np.array([[-2], [1]]))
+	assert np.all(tail.jacobian == np.array([[0, 1, 0], [0, 0, 1]]))
+	with pytest.raises(IndexError):
+		X[3]
+
+def test_vector_function_example():
+	# Example 4 of the documentation, with x*z computed once and shared
+	x, y, z = AutoDiff([3, -2, 1], 2, n=3, k=[1, 2, 3])
+	xz = x*z
+	f = vectorize([3*x**2 + x*y**2 - 2*z**3, y*ef.exp(x), ef.cos(xz) + ef.sin(y/z)], n_inputs=3)
+	assert np.allclose(f.val, np.array([[37], [-40.17107385], [-1.89928992]]))
+	assert np.allclose(f.jacobian, np.array([[22, -12, -6], [-40.17107385, 20.08553692, 0], [-0.14112001, -0.41614684, -1.2556537]]))
+
+def test_vector_function_one_pass():
+	n = 200
+	values = np.linspace(0.1, 2, n)
+	X = AutoDiff(values, 1, n=n, k=np.arange(1, n + 1))
+	# Every output f_i = x_i x_(i+1) + sin(x_i) in one vectorized pass
+	F = X[:-1] * X[1:] + ef.sin(X[:-1])
+	assert F.val.shape == (n - 1, 1)
+	assert F.jacobian.shape == (n - 1, n)
+	expected = np.zeros([n - 1, n])
+	expected[np.arange(n - 1), np.arange(n - 1)] = values[1:] + np.cos(values[:-1])
+	expected[np.arange(n - 1), np.arange(1, n)] = values[:-1]
+	assert np.allclose(F.jacobian, expected)
+	# Rows of several vector functions can be joined
+	G = vectorize([F, ef.exp(X[:1])], n_inputs=n)
+	assert G.val.shape == (n, 1)
+	assert np.allclose(G.jacobian[-1, 0], np.exp(values[0]))
+
+# NumPy protocol tests
+def test_numpy_ufuncs():
+	x = AutoDiff([0.5, 1.0], 2)
+	assert np.sin(x) == ef.sin(x)
+	assert np.exp(-x**2) * np.cos(x) + np.sqrt(x) == ef.exp(-x**2) * ef.cos(x) + ef.sqrt(x)
+	assert np.arctanh(x / 2) == ef.arctanh(x / 2)
+	assert np.log10(x) == ef.log10(x)
+	assert np.negative(x) == -x
+	assert np.absolute(-x) == abs(x)
+	assert np.positive(x) is x
+
+def test_numpy_operators():
+	x = AutoDiff(0.5, 2)
+	assert np.add(x, 3) == x + 3
+	assert np.subtract(3, x) == 3 - x
+	assert np.multiply(np.float64(2), x) == 2 * x
+	assert np.float64(2) * x == 2 * x
+	assert np.divide(1, x) == 1 / x
+	assert np.power(x, 2) == x**2
+	assert np.power(2, x) == 2**x
+
+def test_numpy_functions():
+	x = AutoDiff(0.5, 2)
+	assert np.emath.logn(3, x) == ef.logbase(x, 3)
+	# Functions without an AutoDiff implementation treat it as a scalar as before
+	assert np.shape(x) == ()
+
+def test_numpy_unsupported():
+	x = AutoDiff([0.5, 1.0], 2)
+	with pytest.raises(TypeError):
+		np.add.reduce(x)
+	with pytest.raises(TypeError):
+		np.sin(x, out=np.empty(2))
+
+def test_numpy_array_on_the_left():
+	x = AutoDiff([1., 2.], 1, n=2, k=[1, 2])
+	column = np.array([[1.], [2.]])
+	f = column * x
+	assert f == x * column
+	assert np.all(f.val == np.array([[1.], [4.]]))
+	assert np.all(f.jacobian == np.array([[1., 0.], [0., 2.]]))
+	assert column + x == x + column
+	assert column - x == -(x - column)
+	assert np.all((column - x).jacobian == -np.eye(2))
+	assert column / x == 1 / (x / column)
+	assert column ** x == np.exp(np.log(column) * x)
+	# Residuals with the constant vector first
+	A = np.array([[1.0, 2.0], [3.0, -1.0], [0.5, 0.5]])
+	b = np.array([[1.0], [2.0], [3.0]])
+	f = ADPYNE.AutoDiff.sum((b - A @ x)**2)
+	assert_matches(f, ADPYNE.AutoDiff.sum((A @ x - b)**2))
+	residual = b - A @ np.array([[1.], [2.]])
+	assert np.allclose(f.jacobian, -2 * residual.T @ A)
+
+# lazy derivative tests
+def lazy_and_eager(values, der_value=1):
+	n = len(values)
+	k = list(range(1, n + 1))
+	lazy = AutoDiff(values, der_value, n=n, k=k, lazy=True)
+	eager = AutoDiff(values, der_value, n=n, k=k)
+	return [lazy[j] for j in range(n)], [eager[j] for j in range(n)]
+
+def test_lazy_der_matches_eager():
+	f = lambda x: [x[0] * x[1] / x[2] - 3, ef.exp(x[0]) ** 2 + 4 / x[1], abs(-x[2]) + 2 ** x[0] - x[1] ** x[0]]
+	lazy, eager = lazy_and_eager([0.5, 1.5, 2.0], [2, 3, 5])
+	lazy_f = vectorize(f(lazy), 3)
+	eager_f = vectorize(f(eager), 3)
+	assert lazy_f._der is None
+	assert np.all(lazy_f.jacobian == eager_f.jacobian)
+	assert np.allclose(lazy_f.der, eager_f.der)
+	assert lazy_f.der is lazy_f.der
+
+@pytest.mark.parametrize("name", ["sin", "cos", "tan", "arcsin", "arccos", "arctan",
+	"sinh", "cosh", "tanh", "arcsinh", "arctanh", "exp", "log", "log10", "sqrt", "logistic"])
+def test_lazy_elemFunctions(name):
+	lazy, eager = lazy_and_eager([0.3, 0.6], 2)
+	lazy_f = getattr(ef, name)(lazy[0] * lazy[1])
+	eager_f = getattr(ef, name)(eager[0] * eager[1])
+	assert lazy_f._der is None
+	assert np.allclose(lazy_f.der, eager_f.der)
+
+def test_lazy_separate_variables_share_seed():
+	x = AutoDiff(3, 1, n=2, k=1, lazy=True)
+	y = AutoDiff(2, 1, n=2, k=2, lazy=True)
+	assert x.seed is y.seed
+	f = x * y + ef.sin(x)
+	assert f._der is None
+	assert np.allclose(f.der, np.array([[2 + np.cos(3), 3]]))
+	with pytest.raises(ValueError):
+		x.seed[0] = 2
+
+def test_lazy_mixed_with_eager():
+	x = AutoDiff(3, 2, n=2, k=1, lazy=True)
+	y = AutoDiff(2, 1, n=2, k=2)
+	f = x * y
+	assert f.seed is None
+	assert np.all(f.der == np.array([[4, 3]]))
+
+def test_lazy_inconsistent_seed():
+	with pytest.raises(ValueError):
+		AutoDiff([1, 2], [1, 2], n=1, k=[1, 1], lazy=True)
+
+def test_lazy_explicit_derivative():
+	# With k=0 the seeds are read off the derivative and the jacobian
+	x = AutoDiff(3, np.array([[2, 0, 0]]), n=3, k=0, jacobian_value=np.array([[1, 0, 0]]), lazy=True)
+	y = AutoDiff(2, np.array([[0, 3, 0]]), n=3, k=0, jacobian_value=np.array([[0, 1, 0]]), lazy=True)
+	assert np.all(x.seed == np.array([2, 0, 0]))
+	f = x * y
+	assert np.all(f.der == np.array([[4, 9, 0]]))
+	g = AutoDiff(1, np.array([[1, 3]]), n=2, k=0, jacobian_value=np.array([[0.5, 3]]), lazy=True)
+	assert np.allclose(g.der, np.array([[1, 3]]))
+	with pytest.raises(ValueError):
+		AutoDiff(1, np.array([[1, 2]]), n=2, k=0, jacobian_value=np.array([[0, 1]]), lazy=True)
+	with pytest.raises(ValueError):
+		AutoDiff(1, np.array([[1, 2]]), n=3, k=0, jacobian_value=np.array([[1, 1]]), lazy=True)
+
+def test_lazy_makeBatchVars():
+	points = np.array([[1, 2], [3, 4], [5, 6]])
+	x, y = makeBatchVars(points, seed=2, lazy=True)
+	f = vectorizeBatch([x * y, x + y])
+	assert f._der is None
+	a, b = makeBatchVars(points, seed=2)
+	assert np.all(f.jacobian == vectorizeBatch([a * b, a + b]).jacobian)
+	assert np.all(f.der == 2 * f.jacobian)
+
+# accumulation tests
+def inplace_variables():
+	x, y, z = AutoDiff([0.5, 1.5, 2.0], 1, n=3, k=[1, 2, 3])
+	return x, y, z
+
+def test_augmented_assignment_returns_new_objects():
+	x = AutoDiff(1, 1)
+	total = x
+	history = []
+	for i in range(3):
+		total += x
+		history.append(total)
+	assert [f.val[0, 0] for f in history] == [2, 3, 4]
+	assert [f.der[0, 0] for f in history] == [2, 3, 4]
+	assert x.val[0, 0] == 1
+
+@pytest.fixture
+def inplace(monkeypatch):
+	# Update objects of any size in place, so that small ones show the in-place operators at work
+	monkeypatch.setattr(ADPYNE.AutoDiff, '_INPLACE_ENTRIES', 0)
+
+def test_augmented_assignment_small_objects():
+	x, y, z = inplace_variables()
+	total = x + y
+	buffers = (id(total.val), id(total.jacobian))
+	total += z
+	assert (id(total.val), id(total.jacobian)) != buffers
+	assert np.all(total.jacobian == np.array([[1, 1, 1]]))
+
+def test_augmented_assignment_large_objects():
+	n = 64
+	x = AutoDiff(np.linspace(0.5, 2.0, n), 1, n=n, k=list(range(1, n + 1)))
+	assert x.jacobian.size >= ADPYNE.AutoDiff._INPLACE_ENTRIES
+	total = x * 2
+	buffers = (id(total.val), id(total.der), id(total.jacobian))
+	total += x
+	total *= x
+	assert (id(total.val), id(total.der), id(total.jacobian)) == buffers
+	assert np.allclose(total.jacobian, (3 * x * x).jacobian)
+
+def test_augmented_assignment_reuses_buffers(inplace):
+	x, y, z = inplace_variables()
+	total = x + y
+	buffers = (id(total.val), id(total.der), id(total.jacobian))
+	total += z
+	total -= x
+	total *= y
+	total /= z
+	# ids rather than the arrays themselves, which would make the buffers shared
+	assert (id(total.val), id(total.der), id(total.jacobian)) == buffers
+	expected = (y + z) * y / z
+	assert np.allclose(total.val, expected.val)
+	assert np.allclose(total.der, expected.der)
+	assert np.allclose(total.jacobian, expected.jacobian)
+	total *= 2
+	total /= 4
+	total += 1
+	assert np.allclose(total.jacobian, expected.jacobian / 2)
+	assert np.allclose(total.val, expected.val / 2 + 1)
+
+def test_augmented_assignment_shared_buffers(inplace):
+	x, y, z = inplace_variables()
+	total = x + y
+	alias = total
+	total += z
+	assert total is not alias
+	assert np.all(alias.jacobian == np.array([[1, 1, 0]]))
+	total = x + y
+	jacobian = total.jacobian
+	total += z
+	assert np.all(jacobian == np.array([[1, 1, 0]]))
+	total = x + y
+	assert operator.iadd(total, z) is not total
+	assert total.__imul__(z) is not total
+	assert np.all(total.jacobian == np.array([[1, 1, 0]]))
+	# Self-multiplication and shape changes return new objects
+	total = x + y
+	total *= total
+	assert np.allclose(total.jacobian, ((x + y) * (x + y)).jacobian)
+	total = x + y
+	total += AutoDiff([1, 2], 1, n=3, k=[1, 2])
+	assert total.val.shape == (2, 1)
+	a, b = makeBatchVars(np.array([[1, 2], [3, 4]]))
+	a += b
+	assert np.all(b.jacobian == np.array([[0, 1], [0, 1]]))
+	assert np.all(a.jacobian == np.array([[1, 1], [1, 1]]))
+
+def test_augmented_assignment_lazy(inplace):
+	x, y, z = AutoDiff([0.5, 1.5, 2.0], 2, n=3, k=[1, 2, 3], lazy=True)
+	total = x * y
+	buffers = (id(total.val), id(total.jacobian))
+	total += z
+	total *= y
+	assert (id(total.val), id(total.jacobian)) == buffers
+	assert total._der is None
+	assert np.allclose(total.der, 2 * ((x * y + z) * y).jacobian)
+
+def test_sumTerms_leaves_inputs_unchanged():
+	x, y, z = inplace_variables()
+	start = x + 1
+	f = sumTerms([y, z, x], start=start)
+	assert f is not start
+	assert np.all(start.jacobian == np.array([[1, 0, 0]]))
+	assert np.all(x.jacobian == np.array([[1, 0, 0]]))
+	assert np.all(y.jacobian == np.array([[0, 1, 0]]))
+	assert np.all(f.jacobian == np.array([[2, 1, 1]]))
+	# A constant sum becomes an AutoDiff object that shares no arrays with its terms
+	g = sumTerms([1, 2, x, y])
+	assert np.all(g.jacobian == np.array([[1, 1, 0]]))
+	assert np.all(x.jacobian == np.array([[1, 0, 0]]))
+	h = dotTerms([2, 1, 3], [1, x, y])
+	assert np.all(h.jacobian == np.array([[1, 3, 0]]))
+	assert np.all(x.jacobian == np.array([[1, 0, 0]]))
+
+def test_sumTerms_reuses_its_buffers():
+	x, y, z = inplace_variables()
+	accumulator = (x + y)._own()
+	buffers = (accumulator.val, accumulator.der, accumulator.jacobian)
+	result = accumulator._accumulate(z)._accumulate(x, 2.0)
+	assert result is accumulator
+	assert all(a is b for a, b in zip((result.val, result.der, result.jacobian), buffers))
+	assert np.allclose(result.jacobian, (3 * x + y + z).jacobian)
+
+def test_broadcastShape():
+	assert _broadcastShape((3, 1), (1, 4)) == (3, 4)
+	assert _broadcastShape((2, 1, 3), (3,), ()) == (2, 1, 3)
+	assert _broadcastShape((0, 1), (1, 5)) == (0, 5)
+	assert _broadcastShape((2, 1), (3, 1)) is None
+
+def test_fits():
+	x = AutoDiff([1, 2], 1, n=2, k=[1, 2])
+	assert x._fits(AutoDiff([3, 4], 1, n=2, k=[2, 1]))
+	assert x._fits(AutoDiff(3, 1, n=2, k=1))
+	assert x._fits(np.array([[1], [2]]))
+	assert not x._fits(AutoDiff([1, 2, 3], 1, n=2, k=[1, 2, 1]))
+	assert not x._fits(AutoDiff([1, 2], 1, n=3, k=[1, 2]))
+	assert not x._fits(np.ones((2, 2)))
+	assert not AutoDiff(1, 1, n=2, k=1)._fits(x)
+
+def test_sumTerms_shape_change():
+	f = sumTerms([AutoDiff(2, 1), AutoDiff([1, 2, 3], 1), AutoDiff(1, 1)])
+	assert f.val.shape == (3, 1)
+	assert np.all(f.val == np.array([[4], [5], [6]]))
+
+def test_sumTerms_batch_read_only_jacobians():
+	x, y = makeBatchVars(np.array([[1, 2], [3, 4]]))
+	f = sumTerms([x, y, x * y])
+	assert not x.jacobian.flags.writeable
+	assert np.all(x.jacobian == np.array([[1, 0], [1, 0]]))
+	assert np.all(f.jacobian == (x + y + x * y).jacobian)
+
+def test_sumTerms_lazy():
+	x, y, z = AutoDiff([0.5, 1.5, 2.0], 2, n=3, k=[1, 2, 3], lazy=True)
+	f = sumTerms([x * y, z, x])
+	assert f.seed is x.seed
+	assert np.allclose(f.der, 2 * (x * y + z + x).jacobian)
+	g = dotTerms([1, -2], [x * y, z])
+	assert g.seed is x.seed
+	assert np.allclose(g.der, 2 * (x * y - 2 * z).jacobian)
+
+def test_sumTerms_dual():
+	f = sumTerms([Dual(1, 2), Dual(3, 4), 5])
+	assert (f.Real, f.Dual) == (9, 6)
+	x = Dual(np.array([1., 2.]), np.array([1., 0.]))
+	g = dotTerms([2, 1, 3], [x, x * x, 1])
+	assert np.all(g.Real == np.array([6, 11]))
+	assert np.all(g.Dual == np.array([4, 0]))
+	assert np.all(x.Real == np.array([1, 2]))
+
+def test_sumTerms_chunks():
+	x, y, z = inplace_variables()
+	terms = [ef.sin(x * i) * y + z / (i + 1) for i in range(40)]
+	terms += [AutoDiff([1, 2], 1, n=3, k=[1, 3]) * i for i in range(20)] + [2, x]
+	expected = sum(terms)
+	f = sumTerms(term for term in terms)
+	assert np.allclose(f.val, expected.val)
+	assert np.allclose(f.jacobian, expected.jacobian)
+	weights = np.linspace(-1, 1, len(terms))
+	expected = sum(w * term for w, term in zip(weights, terms))
+	g = dotTerms(iter(weights), iter(terms))
+	assert np.allclose(g.val, expected.val)
+	assert np.allclose(g.jacobian, expected.jacobian)
+	assert np.allclose(g.der, expected.der)
+def test_sumTerms():
+	x, y = AutoDiff([3, 2], 1, n=2, k=[1, 2])
+	f = sumTerms(x**i * y for i in range(4))
+	assert np.all(f.val == np.array([[80.]]))
+	assert np.all(f.jacobian == np.array([[68., 40.]]))
+	assert sumTerms([]) == 0
+	assert sumTerms([1, 2, 3], start=4) == 10
+
+def test_sumTerms_matches_sum():
+	x, y, z = inplace_variables()
+	terms = [ef.sin(x * i) + y / (i + 1) - z**2 for i in range(20)]
+	f = sumTerms(terms)
+	expected = sum(terms)
+	assert np.allclose(f.val, expected.val)
+	assert np.allclose(f.der, expected.der)
+	assert np.allclose(f.jacobian, expected.jacobian)
+	# The terms are left unchanged
+	assert np.allclose(terms[0].jacobian, (ef.sin(x * 0) + y - z**2).jacobian)
+
+def test_dotTerms():
+	x, y = AutoDiff([3, 2], 1, n=2, k=[1, 2])
+	f = dotTerms([2, -1], [x * y, y**2])
+	assert np.all(f.val == np.array([[8.]]))
+	assert np.all(f.jacobian == np.array([[4., 2.]]))
+	g = dotTerms([0.5, 3, 2], [x, 1.0, y])
+	assert np.allclose(g.val, 8.5)
+	assert np.allclose(g.jacobian, np.array([[0.5, 2.]]))
+
+# reduction and matrix product tests
+def linalg_variables(values, lazy=False):
+	n = len(values)
+	return AutoDiff(values, 2, n=n, k=list(range(1, n + 1)), lazy=lazy)
+
+def assert_matches(f, expected):
+	assert np.allclose(f.val, expected.val)
+	assert np.allclose(f.der, expected.der)
+	assert np.allclose(f.jacobian, expected.jacobian)
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_sum_and_prod_match_loops(lazy):
+	x = linalg_variables([0.5, -1.5, 2.0, 3.0], lazy)
+	rows = [x[j] for j in range(4)]
+	assert_matches(ADPYNE.AutoDiff.sum(x**2), sumTerms(row**2 for row in rows))
+	expected = rows[0]
+	for row in rows[1:]:
+		expected = expected * row
+	f = prod(x)
+	assert_matches(f, expected)
+	assert (f.seed is not None) == lazy
+
+def test_prod_with_zero():
+	f = prod(linalg_variables([2.0, 0.0, 4.0]))
+	assert f.val == 0
+	assert np.allclose(f.jacobian, [[0, 8, 0]])
+	assert np.allclose(prod(linalg_variables([0.0, 0.0, 4.0])).jacobian, 0)
+	assert np.allclose(prod(linalg_variables([3.0])).jacobian, [[1]])
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_matmul_matches_loops(lazy):
+	x = linalg_variables([0.5, -1.5, 2.0], lazy)
+	rows = [x[j] for j in range(3)]
+	A = np.array([[1.0, 2.0, -1.0], [0.5, 0.0, 3.0]])
+	expected = vectorize([dotTerms(A[i], rows) for i in range(2)], 3)
+	assert_matches(A @ x, expected)
+	assert_matches(matmul(A, x), expected)
+	assert_matches(np.matmul(A, x), expected)
+	assert_matches(np.dot(A, x), expected)
+	assert_matches(x @ A.T, expected)
+	assert_matches(x @ A[0], dotTerms(A[0], rows))
+	assert_matches(A[1] @ x, dotTerms(A[1], rows))
+	assert_matches(x @ x, sumTerms(row * row for row in rows))
+	y = ef.sin(x)
+	assert_matches(dot(x, y), sumTerms(row * ef.sin(row) for row in rows))
+
+def test_matmul_shape_mismatch():
+	x = linalg_variables([0.5, -1.5, 2.0])
+	with pytest.raises(ValueError):
+		np.ones([2, 2]) @ x
+
+def test_dot_scalar():
+	x = linalg_variables([0.5, -1.5])
+	assert dot(3, x) == 3 * x
+	assert dot(x, 3) == 3 * x
+
+def test_norm():
+	x = linalg_variables([3.0, -4.0])
+	rows = [x[0], x[1]]
+	assert_matches(norm(x), ef.sqrt(rows[0]**2 + rows[1]**2))
+	assert_matches(np.linalg.norm(x), norm(x, 2))
+	assert_matches(norm(x, 1), abs(rows[0]) + abs(rows[1]))
+	with pytest.raises(ValueError):
+		norm(x, np.inf)
+
+def test_numpy_reductions():
+	x = linalg_variables([0.5, -1.5, 2.0])
+	assert_matches(np.sum(x), ADPYNE.AutoDiff.sum(x))
+	assert_matches(np.prod(x), prod(x))
+	# Arguments that are not AutoDiff objects keep NumPy's own implementation
+	assert np.sum([1, 2]) == 3
+	assert np.dot([1, 2], [3, 4]) == 11
+
+def test_numpy_reductions_axis():
+	x = linalg_variables([0.5, -1.5, 2.0])
+	for axis in [0, -2, None]:
+		assert_matches(np.sum(x, axis=axis), ADPYNE.AutoDiff.sum(x))
+		assert_matches(np.linalg.norm(x, axis=axis), norm(x))
+	assert_matches(np.sum(x, 0, None, None, True), ADPYNE.AutoDiff.sum(x))
+	assert_matches(np.prod(x, keepdims=True), prod(x))
+	assert_matches(np.linalg.norm(x, 1, keepdims=False), norm(x, 1))
+	# Batches reduce over the rows of each point
+	points = np.array([[0.5, 1.0], [2.0, -1.0]])
+	p, q = makeBatchVars(points)
+	v = vectorizeBatch([p * q, q**2])
+	assert_matches(np.sum(v, axis=1), ADPYNE.AutoDiff.sum(v))
+	assert_matches(np.sum(v, axis=-2), ADPYNE.AutoDiff.sum(v))
+
+def test_numpy_reductions_unsupported():
+	x = linalg_variables([0.5, -1.5, 2.0])
+	points = np.array([[0.5, 1.0], [2.0, -1.0]])
+	p, q = makeBatchVars(points)
+	v = vectorizeBatch([p * q, q**2])
+	# Other axes and arguments are not implemented, as for ufuncs
+	for call in [lambda: np.sum(x, axis=1), lambda: np.prod(x, dtype=float), lambda: np.sum(v),
+			lambda: np.linalg.norm(x, axis=(0, 1)), lambda: np.dot(x, x, out=np.empty((1, 1)))]:
+		with pytest.raises(TypeError):
+			call()
+
+def test_least_squares_objective():
+	A = np.array([[1.0, 2.0], [3.0, -1.0], [0.5, 0.5]])
+	b = np.array([[1.0], [2.0], [3.0]])
+	x = AutoDiff([0.5, 2.0], 1, n=2, k=[1, 2])
+	f = ADPYNE.AutoDiff.sum((A @ x - b)**2)
+	residual = A @ np.array([[0.5], [2.0]]) - b
+	assert np.allclose(f.val, residual.T @ residual)
+	assert np.allclose(f.jacobian, 2 * residual.T @ A)
+
+def test_reductions_batch():
+	points = np.array([[0.5, 1.0], [2.0, -1.0], [1.5, 3.0]])
+	x, y = makeBatchVars(points)
+	v = vectorizeBatch([x * y, ef.sin(x), y**2])
+	f = norm(v)
+	for i, (a, c) in enumerate(points):
+		p, q = AutoDiff([a, c], 1, n=2, k=[1, 2])
+		expected = norm(vectorize([p * q, ef.sin(p), q**2], 2))
+		assert np.allclose(f.val[i], expected.val)
+		assert np.allclose(f.jacobian[i], expected.jacobian)
+
+# variables tests
+@pytest.mark.parametrize("seed", [1, 2.5])
+def test_variables_match_AutoDiff(seed):
+	values = [3, -2, 1, 0.5]
+	xs = variables(values, seed)
+	for k, x in enumerate(xs):
+		expected = AutoDiff(values[k], seed, n=4, k=k + 1)
+		assert x == expected
+		assert np.all(x.jacobian == expected.jacobian)
+	f = xs[0] * xs[2] + ef.sin(xs[1]) / xs[3]
+	g = AutoDiff(3, seed, n=4, k=1) * AutoDiff(1, seed, n=4, k=3) + ef.sin(AutoDiff(-2, seed, n=4, k=2)) / AutoDiff(0.5, seed, n=4, k=4)
+	assert_matches(f, g)
+
+def test_variables_lazy():
+	x, y, z = variables([3, -2, 1], 2, lazy=True)
+	assert x.seed is y.seed
+	f = x * z + y
+	assert f._der is None
+	assert np.all(f.der == np.array([[2., 2., 6.]]))
+
+def test_variables_share_one_seed():
+	xs = variables(np.linspace(0, 1, 1000))
+	# Every jacobian row is a read-only view of the same array
+	assert all(not x.jacobian.flags.writeable for x in xs)
+	assert all(np.shares_memory(x.jacobian, xs[0].jacobian) for x in xs)
+	assert np.all(xs[7].jacobian == np.eye(1000)[7])
+	total = xs[0] * 1
+	for x in xs[1:]:
+		total += x
+	assert np.all(total.jacobian == 1)
+	assert np.all(xs[1].jacobian == np.eye(1000)[1])
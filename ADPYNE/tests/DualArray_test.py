@@ -0,0 +1,126 @@
+import pytest
+import numpy as np
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+from ADPYNE.DualArray import DualArray
+from ADPYNE.Dual import Dual
+import ADPYNE.elemFunctions as ef
+
+POINTS = np.array([0.2, 0.5, 0.7])
+
+def pointwise(f, points=POINTS):
+	# Evaluate f at each point with a scalar Dual
+	results = [f(Dual(p, 1)) for p in points]
+	return np.array([r.Real for r in results]), np.array([r.Dual for r in results])
+
+def check(f, points=POINTS):
+	result = f(DualArray(points))
+	real, dual = pointwise(f, points)
+	assert np.allclose(result.Real, real)
+	assert np.allclose(result.Dual, dual)
+
+# constructor tests
+def test_init():
+	x = DualArray([1, 2, 3])
+	assert np.all(x.Real == np.array([1., 2., 3.]))
+	assert np.all(x.Dual == np.ones(3))
+	y = DualArray(np.zeros((2, 3)), np.array([1, 2, 3]))
+	assert y.Dual.shape == (2, 3)
+
+def test_slots():
+	assert not hasattr(DualArray([1, 2]), '__dict__')
+
+def test_documentation_example():
+	x = DualArray(np.array([1.0, 2.0, 3.0]))
+	f = 3*x**2 + ef.exp(x)
+	assert np.allclose(f.Dual, 6*np.array([1, 2, 3]) + np.exp([1, 2, 3]))
+
+def test_getitem_len_coefficients():
+	x = DualArray([1, 2, 3], [4, 5, 6])
+	assert len(x) == 3
+	assert x[1] == DualArray(2, 5)
+	assert x[1:] == DualArray([2, 3], [5, 6])
+	assert np.all(x.coefficients == np.array([[1, 4], [2, 5], [3, 6]]))
+
+def test_str_repr():
+	x = DualArray([1, 2])
+	assert str(x) == "[1. 2.] + [1. 1.]ε"
+	assert repr(x) == "DualArray([1. 2.], [1. 1.])"
+
+# operator tests
+@pytest.mark.parametrize("f", [
+	lambda x: x + 2, lambda x: 2 + x, lambda x: x + x,
+	lambda x: x - 2, lambda x: x - x * x,
+	lambda x: 3 * x, lambda x: x * 3, lambda x: x * x,
+	lambda x: x / 4, lambda x: 4 / x, lambda x: x / (x + 1),
+	lambda x: x ** 3, lambda x: x ** 0.5, lambda x: 2 ** x,
+	lambda x: -x, lambda x: +x,
+])
+def test_operators(f):
+	check(f)
+
+def test_rsub():
+	x = DualArray(POINTS)
+	f = 3 - x
+	assert np.allclose(f.Real, 3 - POINTS)
+	assert np.all(f.Dual == -np.ones(3))
+
+def test_abs():
+	f = abs(DualArray(POINTS) - 0.4)
+	assert np.allclose(f.Real, np.abs(POINTS - 0.4))
+	assert np.all(f.Dual == np.array([-1., 1., 1.]))
+
+def test_pow_dual_exponent():
+	x = DualArray(POINTS)
+	f = x ** (2 * x)
+	assert np.allclose(f.Real, POINTS ** (2 * POINTS))
+	assert np.allclose(f.Dual, f.Real * (2 * np.log(POINTS) + 2))
+
+def test_array_operands():
+	x = DualArray(POINTS)
+	c = np.array([1., 2., 3.])
+	for f in [x + c, c + x, x - c, c - x]:
+		assert type(f) is DualArray
+		assert np.allclose(np.abs(f.Dual), np.ones(3))
+	f = x * c
+	assert np.allclose(f.Dual, c)
+	assert np.allclose((c * x).Dual, c)
+	f = DualArray(2.0) + c
+	assert f.Dual.shape == (3,)
+
+def test_eq_ne():
+	assert DualArray([1, 2]) == DualArray([1, 2])
+	assert DualArray([1, 2]) != DualArray([1, 2], 0)
+	assert DualArray([1, 2]) != 1
+
+# elemFunctions tests
+@pytest.mark.parametrize("name", ["sin", "cos", "tan", "arcsin", "arccos", "arctan",
+	"sinh", "cosh", "tanh", "arcsinh", "arctanh", "exp", "log", "log10", "sqrt", "logistic"])
+def test_elemFunctions(name):
+	check(getattr(ef, name))
+
+def test_arccosh():
+	check(ef.arccosh, POINTS + 1)
+
+def test_logbase():
+	check(lambda x: ef.logbase(x, 3))
+
+def test_chain():
+	check(lambda x: ef.sin(x) * ef.exp(x ** 2) / ef.sqrt(x + 1))
+
+# NumPy protocol tests
+def test_numpy_ufuncs():
+	x = DualArray(POINTS)
+	assert np.sin(x) == ef.sin(x)
+	assert np.exp(x) == ef.exp(x)
+	assert np.add(x, x) == x + x
+	assert np.power(2, x) == 2 ** x
+	assert type(np.array([1., 2., 3.]) + x) is DualArray
+
+def test_large():
+	points = np.linspace(0.1, 0.9, 100000)
+	f = ef.exp(ef.sin(DualArray(points)))
+	assert f.Real.shape == (100000,)
+	assert np.allclose(f.Dual, np.exp(np.sin(points)) * np.cos(points))
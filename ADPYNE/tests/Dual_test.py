@@ -6,6 +6,7 @@ currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentfram
 parentdir = os.path.dirname(currentdir)
 sys.path.insert(0,parentdir)
 from ADPYNE.Dual import Dual, makeHessianVars
+import ADPYNE.Dual
 import ADPYNE.elemFunctions as ef
 import ADPYNE.elemFunctions as ef
 from ADPYNE.Hessian import Hessian
@@ -20,6 +21,15 @@ def test_higherorderprint():
 	assert f.coefficients == [2.0, 1.0, 0.0, -0.0]
 	assert str(f) == "[2.0, 1.0, 0.0, -0.0]"
 
+def test_slots():
+	x = Dual(2, 1)
+	f = x.makeHighestOrder(3)
+	assert not hasattr(f, '__dict__')
+	assert not hasattr(f.Real, '__dict__')
+	assert f.coefficients == []
+	f.buildCoefficients(3)
+	assert len(f.coefficients) == 4
+
 # addition tests
 def test_add_dual_results():
 	# single input cases
@@ -439,4 +449,46 @@ def test_hessian():
 	f = Hessian(func)
 	assert f.value == (3**2)*(1**3)
 	assert np.all(f.firstDer == np.array([2*3*(1)**3, 3*(3**2)*(1)**2]))
-	assert np.all(f.hessian == np.array([[2*(1)**2, 6*3*(1)**2],[6*3*(1)**2, 6*(3**2)*1]]))
\ No newline at end of file
+	assert np.all(f.hessian == np.array([[2*(1)**2, 6*3*(1)**2],[6*3*(1)**2, 6*(3**2)*1]]))
+# NumPy protocol tests
+def test_numpy_ufuncs():
+	x = Dual(0.5, 2)
+	assert np.sin(x) == ef.sin(x)
+	assert np.exp(-x**2) * np.cos(x) + np.sqrt(x) == ef.exp(-x**2) * ef.cos(x) + ef.sqrt(x)
+	assert np.float64(2) * x == 2 * x
+	assert np.subtract(3, x) == 3 - x
+	assert np.emath.logn(3, x) == ef.logbase(x, 3)
+
+def test_numpy_nested():
+	x = Dual(0.5, 1).makeHighestOrder(3)
+	f = np.sin(x)
+	f.buildCoefficients(3)
+	assert np.allclose(np.array(f.coefficients, dtype=float), [np.sin(0.5), np.cos(0.5), -np.sin(0.5), -np.cos(0.5)])
+
+def test_augmented_assignment_returns_new_objects():
+	x = Dual(1, 1)
+	total = x
+	history = []
+	for i in range(3):
+		total += x
+		history.append(total)
+	assert [(f.Real, f.Dual) for f in history] == [(2, 2), (3, 3), (4, 4)]
+
+def test_augmented_assignment_reuses_buffers(monkeypatch):
+	# Update arrays of any size in place
+	monkeypatch.setattr(ADPYNE.Dual, '_INPLACE_ENTRIES', 0)
+	x = Dual(np.array([1., 2.]), np.array([1., 1.]))
+	total = x * 2
+	buffers = (id(total.Real), id(total.Dual))
+	total += x
+	total *= x
+	total -= 1
+	total /= x
+	assert (id(total.Real), id(total.Dual)) == buffers
+	expected = ((x * 2 + x) * x - 1) / x
+	assert np.allclose(total.Real, expected.Real)
+	assert np.allclose(total.Dual, expected.Dual)
+	alias = total
+	total += x
+	assert total is not alias
+	assert np.allclose(alias.Real, expected.Real)
@@ -0,0 +1,117 @@
+import warnings
+import pytest
+import numpy as np
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+from ADPYNE.Hessian import Hessian, hessian, hvp
+from ADPYNE.Dual import Dual, makeHessianVars
+import ADPYNE.elemFunctions as ef
+
+def rosenbrock(x):
+	f = 0
+	for i in range(len(x) - 1):
+		f = f + 100*(x[i+1] - x[i]**2)**2 + (1 - x[i])**2
+	return f
+
+def rosenbrock_derivatives(x):
+	n = len(x)
+	g = np.zeros(n)
+	H = np.zeros([n, n])
+	for i in range(n - 1):
+		g[i] += -400*x[i]*(x[i+1] - x[i]**2) - 2*(1 - x[i])
+		g[i+1] += 200*(x[i+1] - x[i]**2)
+		H[i, i] += 1200*x[i]**2 - 400*x[i+1] + 2
+		H[i+1, i+1] += 200
+		H[i, i+1] += -400*x[i]
+		H[i+1, i] += -400*x[i]
+	return g, H
+
+def test_hessian_two_variables():
+	value, gradient, H = hessian(lambda x: x[0]**2 * x[1]**3, [3, 1])
+	assert value == 9
+	assert np.allclose(gradient, np.array([6, 27]))
+	assert np.allclose(H, np.array([[2, 18], [18, 54]]))
+
+def test_hessian_matches_nested_dual():
+	x = Dual(3, np.array([1,0]))
+	y = Dual(1, np.array([0,1]))
+	xh,yh = makeHessianVars(x,y)
+	nested = Hessian((xh**2)*(yh**3))
+	general = Hessian(lambda v: v[0]**2 * v[1]**3, [3, 1])
+	assert general.value == nested.value
+	assert np.allclose(general.firstDer, nested.firstDer)
+
+def test_hessian_single_variable():
+	value, gradient, H = hessian(lambda x: ef.sin(x[0]), [0.5])
+	assert np.isclose(value, np.sin(0.5))
+	assert np.allclose(gradient, np.array([np.cos(0.5)]))
+	assert np.allclose(H, np.array([[-np.sin(0.5)]]))
+
+def test_hessian_rosenbrock():
+	x = np.array([-1.2, 1.0, 0.5, 2.0, -0.3])
+	value, gradient, H = hessian(rosenbrock, x)
+	g, expected = rosenbrock_derivatives(x)
+	assert np.isclose(value, rosenbrock(x))
+	assert np.allclose(gradient, g)
+	assert np.allclose(H, expected)
+	assert np.all(H == H.T)
+
+def test_hessian_elemFunctions():
+	f = lambda x: ef.exp(x[0] * x[1]) + ef.log(x[2]) * ef.cos(x[0])
+	x = np.array([0.5, 0.3, 2.0])
+	value, gradient, H = hessian(f, x)
+	a, b, c = x
+	e = np.exp(a*b)
+	expected = np.array([
+		[b*b*e - np.log(c)*np.cos(a), e + a*b*e, -np.sin(a)/c],
+		[e + a*b*e, a*a*e, 0],
+		[-np.sin(a)/c, 0, -np.cos(a)/c**2]])
+	assert np.allclose(gradient, np.array([b*e - np.log(c)*np.sin(a), a*e, np.cos(a)/c]))
+	assert np.allclose(H, expected)
+
+def test_hessian_class_str():
+	f = Hessian(lambda x: x[0] * x[1], [2, 3])
+	assert np.all(f.hessian == np.array([[0, 1], [1, 0]]))
+	assert str(f) == "{} val\n\n{} der\n\n{} hess".format(f.value, f.firstDer, f.hessian)
+
+def test_hvp_two_variables():
+	f = lambda x: x[0]**2 * x[1]**3
+	assert np.allclose(hvp(f, [3, 1], [1, 0]), np.array([2, 18]))
+	assert np.allclose(hvp(f, [3, 1], [0, 1]), np.array([18, 54]))
+
+def test_hvp_matches_hessian():
+	v = np.array([0.3, -1.0, 2.0, 0.5, 1.5])
+	x = np.array([-1.2, 1.0, 0.5, 2.0, -0.3])
+	value, gradient, H = hessian(rosenbrock, x)
+	assert np.allclose(hvp(rosenbrock, x, v), H.dot(v))
+	f = lambda x: ef.exp(x[0] * x[1]) + ef.log(x[2]) * ef.cos(x[0]) + ef.sqrt(x[1]) / x[2] - ef.arctan(x[0])**2
+	x = np.array([0.5, 0.3, 2.0])
+	v = np.array([1.0, -2.0, 0.5])
+	value, gradient, H = hessian(f, x)
+	assert np.allclose(hvp(f, x, v), H.dot(v))
+	# Powers with a variable exponent and absolute values
+	x = np.array([1.3, 2.1, 0.7])
+	for f in [lambda x: x[0]**x[1], lambda x: abs(x[0] - 5) * x[1] * x[2], lambda x: 2**x[0] * abs(x[1]) / x[2]]:
+		value, gradient, H = hessian(f, x)
+		assert np.allclose(hvp(f, x, v), H.dot(v))
+
+@pytest.mark.parametrize("name", ["sin", "cos", "tan", "arcsin", "arccos", "arctan",
+	"sinh", "cosh", "tanh", "arcsinh", "arctanh", "exp", "log", "log10", "sqrt", "logistic"])
+def test_hvp_elemFunctions(name):
+	func = getattr(ef, name)
+	f = lambda x: func(x[0] * x[1])
+	x = np.array([0.6, 0.7])
+	value, gradient, H = hessian(f, x)
+	assert np.allclose(hvp(f, x, [1.0, 2.0]), H.dot([1.0, 2.0]))
+
+def test_hvp_many_inputs():
+	n = 1000
+	x = np.linspace(-1, 1, n)
+	v = np.ones(n)
+	g, H = rosenbrock_derivatives(x)
+	assert np.allclose(hvp(rosenbrock, x, v), H.dot(v))
+
+def test_hvp_unused_input():
+	assert np.all(hvp(lambda x: x[0]**2, [3, 1], [1, 1]) == np.array([2, 0]))
@@ -0,0 +1,149 @@
+import pytest
+import numpy as np
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+from ADPYNE.Jacobian import jvp, vjp, jacobian, Jacobian
+from ADPYNE.AutoDiff import AutoDiff, vectorize
+import ADPYNE.elemFunctions as ef
+
+def autodiff_jacobian(f, x):
+	n = len(x)
+	outputs = f([AutoDiff(x_j, 1, n=n, k=j+1) for j, x_j in enumerate(x)])
+	if not isinstance(outputs, list):
+		outputs = [outputs]
+	return vectorize(outputs, n).jacobian
+
+def f(x):
+	return [x[0] * x[1] + ef.exp(x[2]), ef.sin(x[0]) / x[1], ef.logistic(x[2] * x[0]), x[1]**3 + 2 * x[2]]
+
+X = [0.5, 0.7, 0.1]
+
+# jvp tests
+def test_jvp_documentation_example():
+	assert np.allclose(jvp(lambda x: [x[0] * x[1], ef.sin(x[0])], [2, 3], [1, 0]), [3, np.cos(2)])
+
+@pytest.mark.parametrize("v", [[1, 0, 0], [0, 1, 0], [1, -2, 0.5]])
+def test_jvp(v):
+	assert np.allclose(jvp(f, X, v), autodiff_jacobian(f, X) @ np.array(v))
+
+def test_jvp_scalar_output():
+	product = jvp(lambda x: x[0]**x[1], [2, 3], [1, 1])
+	assert np.allclose(product, [3 * 4 + 8 * np.log(2)])
+
+def test_jvp_constant_output():
+	assert np.all(jvp(lambda x: [x[0] * 2, 5.0], [1, 2], [1, 1]) == np.array([2., 0.]))
+
+def test_jvp_wrong_length():
+	with pytest.raises(ValueError):
+		jvp(f, X, [1, 0])
+
+# vjp tests
+def test_vjp_documentation_example():
+	assert np.allclose(vjp(lambda x: [x[0] * x[1], ef.sin(x[0])], [2, 3], [1, 0]), [3, 2])
+
+@pytest.mark.parametrize("u", [[1, 0, 0, 0], [0, 0, 0, 1], [1, -2, 0.5, 3]])
+def test_vjp(u):
+	assert np.allclose(vjp(f, X, u), np.array(u) @ autodiff_jacobian(f, X))
+
+def test_vjp_scalar_output():
+	assert np.allclose(vjp(lambda x: x[0]**2 * x[1], [3, 2], [1]), [12, 9])
+
+def test_vjp_constant_output():
+	assert np.all(vjp(lambda x: 5.0, [1, 2], [1]) == np.zeros(2))
+
+def test_vjp_wrong_length():
+	with pytest.raises(ValueError):
+		vjp(f, X, [1, 0])
+
+# jacobian tests
+def test_jacobian_documentation_example():
+	value, J, mode, reason = jacobian(lambda x: [x[0] * x[1], ef.exp(x[0])], [2, 3])
+	assert np.allclose(J, [[3, 2], [np.exp(2), 0]])
+	assert mode == 'forward'
+	assert reason.startswith('n = 2, m = 2: one forward pass')
+
+@pytest.mark.parametrize("mode", ["forward", "reverse"])
+def test_jacobian_modes(mode):
+	value, J, used, reason = jacobian(f, X, mode)
+	assert used == mode
+	assert reason == "requested by the caller"
+	assert np.allclose(J, autodiff_jacobian(f, X))
+	assert np.allclose(value, [output.val[0, 0] for output in f([AutoDiff(x_j, 1) for x_j in X])])
+
+def test_jacobian_sparse_mode():
+	pytest.importorskip("scipy")
+	value, J, mode, reason = jacobian(f, X, 'sparse')
+	assert np.allclose(J.toarray(), autodiff_jacobian(f, X))
+
+def test_jacobian_constant_outputs():
+	g = lambda x: [x[0] * x[1], 4.0]
+	for mode in ["forward", "reverse"]:
+		value, J, used, reason = jacobian(g, [2, 3], mode)
+		assert np.all(value == np.array([6., 4.]))
+		assert np.all(J == np.array([[3., 2.], [0., 0.]]))
+
+def test_jacobian_chooses_reverse_for_many_inputs():
+	n = 3000
+	value, J, mode, reason = jacobian(lambda x: sum(x[i] * x[i] for i in range(n)), np.ones(n))
+	assert mode == 'reverse'
+	assert np.all(J == 2 * np.ones([1, n]))
+	assert '1 backward sweeps' in reason
+
+def test_jacobian_chooses_sparse_for_banded():
+	pytest.importorskip("scipy")
+	n = 3000
+	g = lambda x: [x[i] * x[(i + 1) % n] for i in range(n)]
+	value, J, mode, reason = jacobian(g, np.ones(n))
+	assert mode == 'sparse'
+	assert J.nnz == 2 * n
+	assert 'fit in 2 groups' in reason
+
+def test_jacobian_invalid_mode():
+	with pytest.raises(ValueError):
+		jacobian(f, X, 'backward')
+
+def test_Jacobian():
+	result = Jacobian(lambda x: x[0]**2 * x[1], [3, 2])
+	assert np.all(result.jacobian == np.array([[12., 9.]]))
+	assert result.value == np.array([18.])
+	assert result.mode == 'forward'
+	assert 'forward mode' in str(result)
+
+@pytest.mark.parametrize("mode", [None, "forward", "reverse", "sparse"])
+def test_jacobian_array_and_tuple_outputs(mode):
+	if mode == "sparse":
+		pytest.importorskip("scipy")
+	expected = np.array([[3.0, 2.0], [0.0, 1.0]])
+	for g in [lambda x: np.array([x[0] * x[1], x[1] + 1]), lambda x: (x[0] * x[1], x[1] + 1)]:
+		value, J, used, reason = jacobian(g, [2, 3], mode)
+		J = J.toarray() if used == "sparse" else J
+		assert np.allclose(value, [6, 4])
+		assert np.allclose(J, expected)
+
+def test_products_array_outputs():
+	g = lambda x: np.array([x[0] * x[1], x[1] + 1])
+	assert np.allclose(jvp(g, [2, 3], [1, 0]), [3, 0])
+	assert np.allclose(vjp(g, [2, 3], [1, 1]), [3, 3])
+	# A single output is not split up, even though it can be indexed
+	assert np.allclose(jvp(lambda x: x[0] * x[1], [2, 3], [1, 0]), [3])
+	assert np.allclose(vjp(lambda x: x[0] * x[1], [2, 3], [1]), [3, 2])
+
+def g_numpy(x):
+	return [np.sin(x[0]) * x[1], np.exp(x[1]) + np.sqrt(x[0]), 2 - np.abs(x[0] - x[1])]
+
+@pytest.mark.parametrize("mode", [None, "forward", "reverse", "sparse"])
+def test_jacobian_numpy_ufuncs(mode):
+	if mode == "sparse":
+		pytest.importorskip("scipy")
+	value, J, used, reason = jacobian(g_numpy, [1., 2.], mode)
+	J = J.toarray() if used == "sparse" else J
+	assert np.allclose(value, [np.sin(1) * 2, np.exp(2) + 1, 1])
+	assert np.allclose(J, [[np.cos(1) * 2, np.sin(1)], [0.5, np.exp(2)], [1, -1]])
+	assert np.allclose(J, autodiff_jacobian(g_numpy, [1., 2.]))
+
+def test_products_numpy_ufuncs():
+	J = autodiff_jacobian(g_numpy, [1., 2.])
+	assert np.allclose(vjp(g_numpy, [1., 2.], [1, -1, 2]), np.array([1, -1, 2]) @ J)
+	assert np.allclose(jvp(g_numpy, [1., 2.], [1, 1]), J @ np.array([1, 1]))
@@ -0,0 +1,144 @@
+import pytest
+import numpy as np
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+from ADPYNE.Memoize import Memoized
+from ADPYNE.Jacobian import jacobian
+import ADPYNE.elemFunctions as ef
+
+def f(x):
+	return [x[0] * x[1] + ef.exp(x[2]), ef.sin(x[0]) / x[1], x[1]**3 + 2 * x[2]]
+
+X = [0.5, 0.7, 0.1]
+
+class Counted():
+	# A function that counts how often it is evaluated
+	def __init__(self, f):
+		self.f = f
+		self.calls = 0
+
+	def __call__(self, x):
+		self.calls += 1
+		return self.f(x)
+
+def test_documentation_example():
+	g = Memoized(lambda x: x[0]**2 * x[1], size=10)
+	value, J = g([3, 2])
+	assert np.allclose(value, [18])
+	assert np.allclose(J, [[12, 9]])
+	g([3, 2])
+	assert (g.hits, g.misses) == (1, 1)
+
+def test_matches_jacobian():
+	value, J = Memoized(f)(X)
+	expected_value, expected_J, mode, reason = jacobian(f, X, 'forward')
+	assert np.allclose(value, expected_value)
+	assert np.allclose(J, expected_J)
+	# Constants minus variables
+	g = lambda x: [3 - x[0] * x[1], 1 - x[2]]
+	value, J = Memoized(g)([2, 3, 4])
+	assert np.allclose(value, [-3, -3])
+	assert np.allclose(J, [[-3, -2, 0], [0, 0, -1]])
+	assert np.allclose(J, jacobian(g, [2, 3, 4], 'reverse')[1])
+
+def test_repeated_points_are_not_evaluated():
+	counted = Counted(f)
+	g = Memoized(counted)
+	first = g(X)
+	second = g(np.array(X))
+	g([0.5, 0.7, 0.2])
+	assert counted.calls == 2
+	assert second is first
+	assert (g.hits, g.misses) == (1, 2)
+	assert len(g) == 2
+
+def test_results_are_read_only():
+	value, J = Memoized(f)(X)
+	with pytest.raises(ValueError):
+		J[0, 0] = 1
+	with pytest.raises(ValueError):
+		value[0] = 1
+
+def test_least_recently_used_is_dropped():
+	counted = Counted(f)
+	g = Memoized(counted, size=2)
+	a, b, c = [0.5, 0.7, 0.1], [0.6, 0.7, 0.1], [0.7, 0.7, 0.1]
+	g(a)
+	g(b)
+	# a is now more recently used than b
+	g(a)
+	g(c)
+	assert len(g) == 2
+	g(a)
+	assert counted.calls == 3
+	g(b)
+	assert counted.calls == 4
+
+def test_size_zero_and_unbounded():
+	counted = Counted(f)
+	g = Memoized(counted, size=0)
+	g(X)
+	g(X)
+	assert counted.calls == 2
+	assert len(g) == 0
+	g = Memoized(f, size=None)
+	for i in range(300):
+		g([i, 1, 2])
+	assert len(g) == 300
+	with pytest.raises(ValueError):
+		Memoized(f, size=-1)
+
+def test_tolerance():
+	counted = Counted(f)
+	g = Memoized(counted, tol=1e-6)
+	first = g([0.5, 0.7, 0.1])
+	assert g([0.5 + 1e-9, 0.7, 0.1 - 1e-9]) is first
+	g([0.5 + 1e-3, 0.7, 0.1])
+	assert counted.calls == 2
+	# Without a tolerance only the same point is reused
+	exact = Memoized(f)
+	exact([0.5, 0.7, 0.1])
+	exact([0.5 + 1e-12, 0.7, 0.1])
+	assert exact.misses == 2
+	with pytest.raises(ValueError):
+		Memoized(f, tol=-1)
+
+def test_negative_zero():
+	g = Memoized(f)
+	g([0.0, 0.7, 0.1])
+	g([-0.0, 0.7, 0.1])
+	assert g.hits == 1
+
+def test_clear():
+	g = Memoized(f)
+	g(X)
+	g(X)
+	g.clear()
+	assert (g.hits, g.misses, len(g)) == (0, 0, 0)
+	g(X)
+	assert g.misses == 1
+
+def test_constant_and_vector_outputs():
+	A = np.array([[1.0, 2.0], [3.0, -1.0]])
+	def h(x):
+		v = x[0] * A[:, :1] + x[1] * A[:, 1:]
+		return [v, 4.0, x[0] * x[1]]
+	value, J = Memoized(h)([2, 3])
+	assert np.allclose(value, [8, 3, 4, 6])
+	assert np.allclose(J, [[1, 2], [3, -1], [0, 0], [3, 2]])
+
+def test_constant_outputs():
+	value, J = Memoized(lambda x: [x[0] * x[1], 4.0])([2, 3])
+	assert np.allclose(value, [6, 4])
+	assert np.allclose(J, [[3, 2], [0, 0]])
+	value, J = Memoized(lambda x: 4.0)([2, 3])
+	assert np.allclose(value, [4])
+	assert J.shape == (1, 2)
+	assert np.all(J == 0)
+
+def test_str():
+	g = Memoized(f, size=5)
+	g(X)
+	assert str(g) == "0 hits, 1 misses, 1 of 5 points cached"
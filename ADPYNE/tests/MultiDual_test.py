@@ -0,0 +1,117 @@
+import pytest
+import numpy as np
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+from ADPYNE.MultiDual import MultiDual, makeMultiDualVars, vectorizeMultiDual
+from ADPYNE.AutoDiff import AutoDiff
+import ADPYNE.elemFunctions as ef
+
+def autodiff_gradient(f, x):
+	n = len(x)
+	result = f([AutoDiff(x_j, 1, n=n, k=j+1) for j, x_j in enumerate(x)])
+	return result.val[0, 0], result.der[0]
+
+# constructor tests
+def test_init():
+	x = MultiDual(2, [1, 0, 3])
+	assert x.Real == 2.0
+	assert np.all(x.Dual == np.array([1., 0., 3.]))
+
+def test_slots():
+	assert not hasattr(MultiDual(1, [1, 0]), '__dict__')
+
+def test_str_repr():
+	x = MultiDual(2, [1, 0])
+	assert str(x) == "2.0 + [1. 0.]ε"
+	assert repr(x) == "MultiDual(2.0, [1. 0.])"
+
+def test_documentation_example():
+	x, y = makeMultiDualVars([3, -2])
+	f = 3*x**2 + x*y**2
+	assert f.Real == 39
+	assert np.all(f.Dual == np.array([22., -12.]))
+
+def test_makeMultiDualVars():
+	x, y, z = makeMultiDualVars([1, 2, 3])
+	assert np.all(y.Dual == np.array([0., 1., 0.]))
+	x, y = makeMultiDualVars([1, 2], np.array([[1, 1], [0, 2]]))
+	assert np.all((x * y).Dual == np.array([2., 4.]))
+	with pytest.raises(ValueError):
+		makeMultiDualVars([1, 2], np.eye(3))
+
+# operator tests
+@pytest.mark.parametrize("f", [
+	lambda x: x[0] + x[1], lambda x: x[0] + 2, lambda x: 2 + x[0],
+	lambda x: x[0] - x[1], lambda x: x[0] - 2,
+	lambda x: x[0] * x[1], lambda x: 3 * x[1], lambda x: x[1] * 3,
+	lambda x: x[0] / x[1], lambda x: x[0] / 4, lambda x: 4 / (x[0] * x[1]),
+	lambda x: x[0] ** 3, lambda x: 2 ** x[1], lambda x: -x[0] * x[1], lambda x: +x[1],
+])
+def test_operators(f):
+	x = [0.5, 0.7]
+	value, gradient = autodiff_gradient(f, x)
+	result = f(makeMultiDualVars(x))
+	assert np.isclose(result.Real, value)
+	assert np.allclose(result.Dual, gradient)
+
+def test_rsub():
+	x, y = makeMultiDualVars([0.5, 0.7])
+	f = 2 - x * y
+	assert np.isclose(f.Real, 1.65)
+	assert np.allclose(f.Dual, [-0.7, -0.5])
+
+def test_pow_multidual_exponent():
+	x, y = makeMultiDualVars([0.5, 0.7])
+	f = x ** y
+	assert np.isclose(f.Real, 0.5 ** 0.7)
+	assert np.allclose(f.Dual, [0.7 * 0.5 ** -0.3, f.Real * np.log(0.5)])
+
+def test_abs():
+	x, y = makeMultiDualVars([0.5, 0.7])
+	assert np.all(abs(x - y).Dual == np.array([-1., 1.]))
+
+def test_eq_ne():
+	assert MultiDual(1, [1, 2]) == MultiDual(1, [1, 2])
+	assert MultiDual(1, [1, 2]) != MultiDual(1, [1, 3])
+	assert MultiDual(1, [1, 2]) != 1
+
+# elemFunctions tests
+@pytest.mark.parametrize("name", ["sin", "cos", "tan", "arcsin", "arccos", "arctan",
+	"sinh", "cosh", "tanh", "arcsinh", "arctanh", "exp", "log", "log10", "sqrt", "logistic"])
+def test_elemFunctions(name):
+	f = lambda x: getattr(ef, name)(0.3 * x[0] + x[1] / 5 + x[2] * x[0])
+	x = [0.5, 0.7, 0.1]
+	value, gradient = autodiff_gradient(f, x)
+	result = f(makeMultiDualVars(x))
+	assert np.isclose(result.Real, value)
+	assert np.allclose(result.Dual, gradient)
+
+@pytest.mark.parametrize("f", [lambda x: ef.arccosh(x[0] + x[1] + 1), lambda x: ef.logbase(x[0] * x[1], 3)])
+def test_elemFunctions_other(f):
+	x = [0.5, 0.7]
+	value, gradient = autodiff_gradient(f, x)
+	result = f(makeMultiDualVars(x))
+	assert np.isclose(result.Real, value)
+	assert np.allclose(result.Dual, gradient)
+
+def test_numpy_ufuncs():
+	x, y = makeMultiDualVars([0.5, 0.7])
+	assert np.sin(x * y) == ef.sin(x * y)
+	assert np.multiply(x, y) == x * y
+
+# vectorize tests
+def test_vectorizeMultiDual_jacobian():
+	x, y = makeMultiDualVars([1, 2])
+	f = vectorizeMultiDual([x * y, x + 3, 5.0])
+	assert np.all(f.Real == np.array([2., 4., 5.]))
+	assert np.all(f.Dual == np.array([[2., 1.], [1., 0.], [0., 0.]]))
+
+def test_jacobian_times_matrix():
+	x = np.array([0.5, 0.7, 0.1])
+	V = np.array([[1., 2.], [0., 1.], [3., -1.]])
+	f = lambda v: [ef.sin(v[0] * v[1]), v[1] * ef.exp(v[2]), v[0] + v[1] + v[2]]
+	J = vectorizeMultiDual(f(makeMultiDualVars(x))).Dual
+	JV = vectorizeMultiDual(f(makeMultiDualVars(x, V))).Dual
+	assert np.allclose(JV, J @ V)
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+from ADPYNE.Pattern import Pattern, makePatternVars
+import ADPYNE.elemFunctions as ef
+
+# construction tests
+def test_makePatternVars():
+	x, y, z = makePatternVars(3)
+	assert list(x.indices) == [0]
+	assert list(z.indices) == [2]
+	assert z.dependencies == 4
+	assert list(Pattern().indices) == []
+
+def test_str():
+	x, y = makePatternVars(2)
+	assert str(x * y) == "[0 1]"
+	assert repr(x * y) == "Pattern([0 1])"
+
+def test_slots():
+	x, y = makePatternVars(2)
+	assert not hasattr(x + y, '__dict__')
+
+# operator tests
+def test_binary_operators():
+	x, y, z = makePatternVars(3)
+	for f in [x + y, x - y, x * y, x / y, x**y]:
+		assert list(f.indices) == [0, 1]
+	for f in [x + 2, 2 + x, x - 2, 2 - x, 2 * x, x * 2, x / 2, 2 / x, x**2, 2**x]:
+		assert f == x
+	assert list((x * y + z).indices) == [0, 1, 2]
+
+def test_unary_operators():
+	x, = makePatternVars(1)
+	assert +x == x
+	assert -x == x
+	assert abs(x) == x
+
+def test_eq():
+	x, y = makePatternVars(2)
+	assert x == Pattern(1)
+	assert x != y
+	assert x != 1
+
+def test_large():
+	variables = makePatternVars(5000)
+	f = variables[0] * variables[2500] + variables[4999]
+	assert list(f.indices) == [0, 2500, 4999]
+
+# elemFunctions tests
+@pytest.mark.parametrize("name", ["sin", "cos", "tan", "arcsin", "arccos", "arctan",
+	"sinh", "cosh", "tanh", "arcsinh", "arccosh", "arctanh",
+	"exp", "log", "log10", "sqrt", "logistic"])
+def test_elemFunctions(name):
+	x, y = makePatternVars(2)
+	f = getattr(ef, name)(x * y)
+	assert list(f.indices) == [0, 1]
+
+def test_logbase():
+	x, y = makePatternVars(2)
+	assert ef.logbase(y, 3) == y
+
+def test_numpy_ufuncs():
+	x, y = makePatternVars(2)
+	assert np.sin(x) == x
+	assert list((np.exp(x) * np.sqrt(y) + np.float64(2)).indices) == [0, 1]
+	assert np.negative(y) == y
@@ -0,0 +1,197 @@
+import warnings
+import pytest
+import numpy as np
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+from ADPYNE.Reverse import Reverse, Tape
+from ADPYNE.AutoDiff import AutoDiff
+from ADPYNE.Dual import Dual
+import ADPYNE.elemFunctions as ef
+
+# tape tests
+def test_tape_records():
+	tape = Tape()
+	x, y = tape.variables([3, 2])
+	f = x * y + x
+	assert len(tape) == 4
+	tape.clear()
+	assert len(tape) == 0
+
+def test_different_tapes():
+	x = Reverse(3)
+	y = Reverse(2)
+	with pytest.raises(ValueError):
+		x * y
+
+def test_str():
+	x = Reverse(3)
+	assert str(x) == "Value:\n3\nGradient:\n0\n"
+	assert repr(x) == str(x)
+
+# operator tests
+def test_add_results():
+	tape = Tape()
+	x, y = tape.variables([3, 2])
+	assert np.all(tape.gradient(x + y, [x, y]) == np.array([1, 1]))
+	assert np.all(tape.gradient(x + x, [x, y]) == np.array([2, 0]))
+	f = 3 + x + 2
+	f.backward()
+	assert f.val == 8
+	assert x.grad == 1
+
+def test_sub_results():
+	tape = Tape()
+	x, y = tape.variables([3, 2])
+	assert np.all(tape.gradient(x - y, [x, y]) == np.array([1, -1]))
+	f = 5 - x - 2
+	f.backward()
+	assert f.val == 0
+	assert x.grad == -1
+
+def test_mul_results():
+	tape = Tape()
+	x, y = tape.variables([3, 2])
+	f = x * y * 4
+	assert np.all(tape.gradient(f, [x, y]) == np.array([8, 12]))
+	f = 2 * x * x
+	f.backward()
+	assert f.val == 18
+	assert x.grad == 12
+
+def test_truediv_results():
+	tape = Tape()
+	x, y = tape.variables([3, 2])
+	f = x / y
+	assert f.val == 1.5
+	assert np.all(tape.gradient(f, [x, y]) == np.array([1/2, -3/4]))
+	f = x / 2
+	f.backward()
+	assert x.grad == 0.5
+	f = 6 / x
+	f.backward()
+	assert f.val == 2
+	assert x.grad == -6/9
+
+def test_pow_results():
+	tape = Tape()
+	x, y = tape.variables([3, 2])
+	f = x**y
+	assert f.val == 9
+	assert np.allclose(tape.gradient(f, [x, y]), np.array([6, 9*np.log(3)]))
+	f = x**-2
+	f.backward()
+	assert x.grad == -2 * 3.0**-3
+	f = 2**x
+	f.backward()
+	assert f.val == 8
+	assert x.grad == np.log(2) * 8
+
+def test_unary_results():
+	x = Reverse(-3.0)
+	assert +x is x
+	f = -x
+	f.backward()
+	assert f.val == 3
+	assert x.grad == -1
+	f = abs(x)
+	f.backward()
+	assert f.val == 3
+	assert x.grad == -1
+	y = Reverse(4)
+	f = ~y
+	f.backward()
+	assert f.val == -5
+	assert y.grad == -1
+
+def test_eq_results():
+	tape = Tape()
+	x, y, z = tape.variables([3, 3, 2])
+	assert x == y
+	assert x != z
+	assert (x == 3) == False
+	assert x != 3
+
+def test_matches_forward_mode():
+	tape = Tape()
+	x, y, z = tape.variables([3, -2, 1])
+	f = 3*x**2 + x*y**2 - 2*z**3
+	g = tape.gradient(f, [x, y, z])
+	xf = AutoDiff(3, 1, n=3, k=1)
+	yf = AutoDiff(-2, 1, n=3, k=2)
+	zf = AutoDiff(1, 1, n=3, k=3)
+	ff = 3*xf**2 + xf*yf**2 - 2*zf**3
+	assert f.val == ff.val[0, 0]
+	assert np.allclose(g, ff.jacobian[0])
+
+def test_many_inputs():
+	n = 1000
+	tape = Tape()
+	xs = tape.variables(np.arange(1.0, n + 1))
+	f = 0
+	for x in xs:
+		f = f + x**2
+	assert np.allclose(tape.gradient(f, xs), 2 * np.arange(1.0, n + 1))
+
+def test_vector_values():
+	x = Reverse(np.array([1.0, 2.0, 3.0]))
+	f = x * x
+	f.backward()
+	assert np.all(f.val == np.array([1, 4, 9]))
+	assert np.all(x.grad == np.array([2, 4, 6]))
+	y = Reverse(2.0)
+	f = y * np.array([1.0, 2.0, 3.0])
+	f.backward()
+	assert y.grad == 6
+
+def test_dual_values():
+	x = Reverse(Dual(3.0, 1.0))
+	f = x**3
+	f.backward()
+	# Gradient carries the second derivative in its dual part
+	assert x.grad.Real == 27
+	assert x.grad.Dual == 18
+
+# elemFunctions tests
+@pytest.mark.parametrize("name,value", [
+	("sin", 0.5), ("cos", 0.5), ("tan", 0.5),
+	("arcsin", 0.5), ("arccos", 0.5), ("arctan", 0.5),
+	("sinh", 0.5), ("cosh", 0.5), ("tanh", 0.5),
+	("arcsinh", 0.5), ("arccosh", 1.5), ("arctanh", 0.5),
+	("exp", 0.5), ("log", 0.5), ("log10", 0.5), ("sqrt", 0.5), ("logistic", 0.5)])
+def test_elemFunctions_results(name, value):
+	func = getattr(ef, name)
+	x = Reverse(value)
+	f = func(x)
+	f.backward()
+	ad = func(AutoDiff(value, 1))
+	assert np.isclose(f.val, ad.val[0, 0])
+	assert np.isclose(x.grad, ad.der[0, 0])
+
+def test_logbase_results():
+	x = Reverse(2.0)
+	f = ef.logbase(x, 7)
+	f.backward()
+	assert np.isclose(f.val, np.log(2) / np.log(7))
+	assert np.isclose(x.grad, 1 / (2 * np.log(7)))
+
+def test_elemFunctions_vector_values():
+	x = Reverse(np.array([0.25, 0.5]))
+	f = ef.sqrt(ef.exp(x) * ef.sin(x))
+	f.backward()
+	values = np.array([0.25, 0.5])
+	der = (np.exp(values) * (np.sin(values) + np.cos(values))) / (2 * np.sqrt(np.exp(values) * np.sin(values)))
+	assert np.allclose(x.grad, der)
+
+def test_numpy_ufuncs():
+	tape = Tape()
+	x, y = tape.variables([0.5, 2.0])
+	f = np.sin(x) * np.exp(y) + np.float64(3) / y
+	assert np.allclose(tape.gradient(f, [x, y]), [np.cos(0.5) * np.exp(2), np.sin(0.5) * np.exp(2) - 3 / 4])
+	# Arrays broadcast against vector values from either side
+	x = Reverse(np.array([0.25, 0.5]))
+	f = np.array([2.0, 3.0]) * np.sin(x)
+	assert np.allclose(f.val, [2 * np.sin(0.25), 3 * np.sin(0.5)])
+	f.backward()
+	assert np.allclose(x.grad, [2 * np.cos(0.25), 3 * np.cos(0.5)])
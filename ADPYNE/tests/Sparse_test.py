@@ -0,0 +1,109 @@
+import pytest
+import numpy as np
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+from ADPYNE.Sparse import sparsityPattern, colorColumns, sparseJacobian
+from ADPYNE.AutoDiff import AutoDiff, vectorize
+import ADPYNE.elemFunctions as ef
+
+def boundary_value(x):
+	# Discretized u'' + exp(u) / 100 = 0, a tridiagonal system
+	n = len(x)
+	F = []
+	for i in range(n):
+		left = x[i-1] if i > 0 else 0
+		right = x[i+1] if i < n - 1 else 0
+		F.append(left - 2*x[i] + right + ef.exp(x[i]) / 100)
+	return F
+
+def dense_jacobian(f, x):
+	n = len(x)
+	variables = [AutoDiff(x_j, 1, n=n, k=j+1) for j, x_j in enumerate(x)]
+	return vectorize(f(variables), n).jacobian
+
+# pattern tests
+def test_sparsityPattern():
+	pattern = sparsityPattern(lambda x: [x[0] * ef.sin(x[1]), x[2] + 1, x[1], 3.0], [1, 2, 3])
+	assert [list(row) for row in pattern] == [[0, 1], [2], [1], []]
+
+def test_sparsityPattern_tridiagonal():
+	pattern = sparsityPattern(boundary_value, np.zeros(6))
+	assert [list(row) for row in pattern] == [[0, 1], [0, 1, 2], [1, 2, 3], [2, 3, 4], [3, 4, 5], [4, 5]]
+
+# coloring tests
+def test_colorColumns_valid():
+	pattern = sparsityPattern(boundary_value, np.zeros(50))
+	colors = colorColumns(pattern, 50)
+	assert colors.max() + 1 == 3
+	for row in pattern:
+		assert len(set(colors[row])) == len(row)
+
+def test_colorColumns_dense_row():
+	colors = colorColumns([np.arange(4)], 4)
+	assert sorted(colors) == [0, 1, 2, 3]
+
+# Jacobian tests
+def test_sparseJacobian_matches_dense():
+	sparse = pytest.importorskip("scipy.sparse")
+	x = np.linspace(0, 1, 20)
+	value, J = sparseJacobian(boundary_value, x)
+	assert sparse.issparse(J)
+	assert J.shape == (20, 20)
+	assert J.nnz == 3 * 20 - 2
+	assert np.allclose(J.toarray(), dense_jacobian(boundary_value, x))
+	assert np.allclose(value, [f for f in boundary_value(list(x))])
+
+def test_sparseJacobian_matches_analytic():
+	pytest.importorskip("scipy")
+	# Checked against hand-derived Jacobians rather than another forward pass
+	x = np.linspace(0, 1, 20)
+	value, J = sparseJacobian(boundary_value, x)
+	expected = np.diag(-2 + np.exp(x) / 100) + np.diag(np.ones(19), 1) + np.diag(np.ones(19), -1)
+	assert np.allclose(J.toarray(), expected)
+
+def test_sparseJacobian_constant_minus_variable():
+	pytest.importorskip("scipy")
+	f = lambda x: [1 - x[0] * x[1], 2 - ef.sin(x[2]), x[3] - 3 * x[1], 5 - x[3]]
+	x = [2.0, 3.0, 0.5, 1.5]
+	value, J = sparseJacobian(f, x)
+	assert np.allclose(value, [-5, 2 - np.sin(0.5), -7.5, 3.5])
+	assert np.allclose(J.toarray(), [[-3, -2, 0, 0], [0, 0, -np.cos(0.5), 0], [0, -3, 0, 1], [0, 0, 0, -1]])
+
+def test_sparseJacobian_given_pattern():
+	pytest.importorskip("scipy")
+	f = lambda x: [x[0] * x[1], x[1] + x[2], 2 * x[3]]
+	pattern = sparsityPattern(f, [0, 0, 0, 0])
+	value, J = sparseJacobian(f, [1, 2, 3, 4], pattern)
+	assert np.all(value == np.array([2, 5, 8]))
+	assert np.all(J.toarray() == np.array([[2, 1, 0, 0], [0, 1, 1, 0], [0, 0, 0, 2]]))
+
+def test_sparseJacobian_constant_output():
+	pytest.importorskip("scipy")
+	value, J = sparseJacobian(lambda x: [x[0]**2, 5.0], [3, 1])
+	assert np.all(value == np.array([9, 5]))
+	assert np.all(J.toarray() == np.array([[6, 0], [0, 0]]))
+
+def test_sparsityPattern_cached():
+	calls = []
+	def f(x):
+		calls.append(1)
+		return [x[0] + x[1], x[1] * x[2]]
+	first = sparsityPattern(f, [1, 2, 3])
+	assert sparsityPattern(f, [4, 5, 6]) is first
+	assert len(calls) == 1
+	# a different number of inputs is a different pattern
+	assert [list(row) for row in sparsityPattern(f, [1, 2, 3, 4])] == [[0, 1], [1, 2]]
+	assert len(calls) == 2
+
+def test_sparseJacobian_cached_pattern():
+	pytest.importorskip("scipy")
+	calls = []
+	def f(x):
+		calls.append(1)
+		return [x[0] + x[1], x[1] * x[2]]
+	sparsityPattern(f, [1, 2, 3])
+	# only the compressed pass evaluates f again
+	sparseJacobian(f, [1, 2, 3])
+	assert len(calls) == 2
@@ -0,0 +1,148 @@
+import warnings
+import pytest
+import numpy as np
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+from ADPYNE.Taylor import Taylor, vectorizeTaylor
+from ADPYNE.Dual import Dual, vectorizeDual
+from ADPYNE.AutoDiff import AutoDiff
+import ADPYNE.elemFunctions as ef
+
+def identity(value, order):
+	# Derivatives of f(x) = x
+	expected = np.zeros(order + 1)
+	expected[0] = value
+	expected[1] = 1
+	return expected
+
+# construction tests
+def test_init():
+	x = Taylor(2, 3)
+	assert x.order == 3
+	assert x.val == 2
+	assert np.all(x.coefficients == np.array([2, 1, 0, 0]))
+	y = Taylor(np.array([1, 2]), 2, seed=3)
+	assert np.all(y.val == np.array([1, 2]))
+	assert np.all(y.coefficients == np.array([[1, 3, 0], [2, 3, 0]]))
+
+def test_str():
+	x = Taylor(2, 2)
+	assert str(x) == "[2. 1. 0.]"
+	assert repr(x) == "Taylor([2. 1. 0.])"
+
+def test_slots():
+	x = Taylor(2, 2)
+	assert not hasattr(x * x, '__dict__')
+
+# operator tests
+def test_add_sub_results():
+	x = Taylor(2, 3)
+	assert np.all((x + x).coefficients == np.array([4, 2, 0, 0]))
+	assert np.all((x + 3).coefficients == np.array([5, 1, 0, 0]))
+	assert np.all((3 + x).coefficients == np.array([5, 1, 0, 0]))
+	assert np.all((x - 3).coefficients == np.array([-1, 1, 0, 0]))
+	assert np.all((3 - x).coefficients == np.array([1, -1, 0, 0]))
+	assert np.all((x - x).coefficients == np.zeros(4))
+
+def test_mul_results():
+	x = Taylor(2, 4)
+	assert np.all((x * x * x).coefficients == np.array([8, 12, 12, 6, 0]))
+	assert np.all((3 * x).coefficients == np.array([6, 3, 0, 0, 0]))
+
+def test_truediv_results():
+	x = Taylor(2, 3)
+	# 1/x: -1/x**2, 2/x**3, -6/x**4
+	assert np.allclose((1 / x).coefficients, np.array([1/2, -1/4, 2/8, -6/16]))
+	assert np.allclose((x / x).coefficients, np.array([1, 0, 0, 0]))
+	assert np.allclose((x / 2).coefficients, np.array([1, 1/2, 0, 0]))
+
+def test_pow_results():
+	x = Taylor(2, 5)
+	assert np.allclose((x**3).coefficients, np.array([8, 12, 12, 6, 0, 0]))
+	assert np.allclose((x**-1).coefficients, (1 / x).coefficients)
+	assert np.allclose((x**0.5 * x**0.5).coefficients, identity(2, 5))
+	# Integer powers at zero
+	z = Taylor(0, 3)
+	assert np.all((z**2).coefficients == np.array([0, 0, 2, 0]))
+	# Variable exponent and base
+	assert np.allclose((x**x).coefficients[:3], np.array([4, 4 * (np.log(2) + 1), 4 * (np.log(2) + 1)**2 + 2]))
+	assert np.allclose((2**x).coefficients, 4 * np.log(2)**np.arange(6))
+
+def test_unary_results():
+	x = Taylor(-2, 2)
+	assert +x is x
+	assert np.all((-x).coefficients == np.array([2, -1, 0]))
+	assert np.all(abs(x).coefficients == np.array([2, -1, 0]))
+
+def test_mixed_orders():
+	f = Taylor(2, 4) * Taylor(3, 2)
+	assert f.order == 2
+
+def test_eq_results():
+	assert Taylor(2, 3) == Taylor(2, 3)
+	assert Taylor(2, 3) != Taylor(2, 3, seed=2)
+	assert Taylor(2, 3) != 2
+	assert (Taylor(2, 3) == 2) == False
+
+# matches nested Dual towers
+def test_matches_vectorizeDual():
+	x = Dual(2, 1).makeHighestOrder(5)
+	fd = vectorizeDual([3*x**5, x**2 - 4*x, 2 / x], 5)
+	t = Taylor(2, 5)
+	ft = vectorizeTaylor([3*t**5, t**2 - 4*t, 2 / t])
+	assert np.allclose(fd.coefficients, ft.coefficients)
+	assert np.allclose(ft.coefficients[0], np.array([96, 240, 480, 720, 720, 360]))
+
+def test_documentation_example():
+	x = Taylor(2, 5)
+	f = vectorizeTaylor([3*x**5, 2*ef.sin(x), ef.exp(2*x)])
+	k = np.arange(6)
+	assert np.allclose(f.coefficients[1], 2 * np.array([np.sin(2), np.cos(2), -np.sin(2), -np.cos(2), np.sin(2), np.cos(2)]))
+	assert np.allclose(f.coefficients[2], 2.0**k * np.exp(4))
+
+# elemFunctions tests: inverse pairs must give back the identity at every order
+@pytest.mark.parametrize("outer,inner,value", [
+	("sin", "arcsin", 0.5), ("arccos", "cos", 0.5), ("arctan", "tan", 0.5),
+	("sinh", "arcsinh", 0.5), ("cosh", "arccosh", 1.5), ("tanh", "arctanh", 0.5),
+	("exp", "log", 0.5), ("log", "exp", 0.5)])
+def test_elemFunctions_inverse(outer, inner, value):
+	x = Taylor(value, 6)
+	f = getattr(ef, outer)(getattr(ef, inner)(x))
+	assert np.allclose(f.coefficients, identity(value, 6))
+
+@pytest.mark.parametrize("name,value", [
+	("sin", 0.5), ("cos", 0.5), ("tan", 0.5),
+	("arcsin", 0.5), ("arccos", 0.5), ("arctan", 0.5),
+	("sinh", 0.5), ("cosh", 0.5), ("tanh", 0.5),
+	("arcsinh", 0.5), ("arccosh", 1.5), ("arctanh", 0.5),
+	("exp", 0.5), ("log", 0.5), ("log10", 0.5), ("sqrt", 0.5), ("logistic", 0.5)])
+def test_elemFunctions_first_derivative(name, value):
+	func = getattr(ef, name)
+	f = func(Taylor(value, 3))
+	ad = func(AutoDiff(value, 1))
+	assert np.isclose(f.coefficients[0], ad.val[0, 0])
+	assert np.isclose(f.coefficients[1], ad.der[0, 0])
+
+def test_elemFunctions_identities():
+	x = Taylor(0.7, 6)
+	one = ef.sin(x)**2 + ef.cos(x)**2
+	assert np.allclose(one.coefficients, identity(1, 6) - identity(0, 6))
+	assert np.allclose((ef.sqrt(x)**2).coefficients, identity(0.7, 6))
+	assert np.allclose(ef.log10(x).coefficients, ef.log(x).coefficients / np.log(10))
+	assert np.allclose(ef.logbase(x, 7).coefficients, ef.log(x).coefficients / np.log(7))
+	assert np.allclose(ef.logistic(x).coefficients, ((1 + ef.tanh(x / 2)) / 2).coefficients)
+
+def test_elemFunctions_exp_derivatives():
+	x = Taylor(0.3, 8)
+	f = ef.exp(3 * x)
+	assert np.allclose(f.coefficients, 3.0**np.arange(9) * np.exp(0.9))
+
+def test_vector_values():
+	values = np.array([0.25, 0.5, 1.0])
+	x = Taylor(values, 4)
+	f = ef.sin(x)
+	assert f.coefficients.shape == (3, 5)
+	assert np.allclose(f.coefficients[:, 2], -np.sin(values))
+	assert np.allclose(f.coefficients[:, 3], -np.cos(values))
@@ -0,0 +1,158 @@
+import pytest
+import numpy as np
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+from ADPYNE.Trace import Graph, trace, optimizeGraph
+from ADPYNE.AutoDiff import AutoDiff, vectorize
+import ADPYNE.elemFunctions as ef
+
+def rosenbrock(x):
+	f = 0
+	for i in range(len(x) - 1):
+		f = f + 100*(x[i+1] - x[i]**2)**2 + (1 - x[i])**2
+	return f
+
+def rosenbrock_gradient(x):
+	n = len(x)
+	g = np.zeros(n)
+	for i in range(n - 1):
+		g[i] += -400*x[i]*(x[i+1] - x[i]**2) - 2*(1 - x[i])
+		g[i+1] += 200*(x[i+1] - x[i]**2)
+	return g
+
+def autodiff_jacobian(f, x):
+	n = len(x)
+	variables = [AutoDiff(x_j, 1, n=n, k=j+1) for j, x_j in enumerate(x)]
+	outputs = f(variables)
+	try:
+		outputs = list(outputs)
+	except TypeError:
+		outputs = [outputs]
+	F = vectorize(outputs, n)
+	return F.val[:, 0], F.jacobian
+
+# recording tests
+def test_graph():
+	graph = Graph()
+	x, y = graph.variables(2)
+	f = 2 * x - y
+	assert len(graph) == 5
+	assert graph.nodes[2] == ('const', (), 2)
+	assert graph.nodes[4] == ('sub', (3, 1), None)
+	assert +f is f
+
+def test_slots():
+	graph = Graph()
+	x, = graph.variables(1)
+	assert not hasattr(x * x, '__dict__')
+
+def test_different_graphs():
+	x, = Graph().variables(1)
+	y, = Graph().variables(1)
+	with pytest.raises(ValueError):
+		x + y
+
+# replay tests
+def test_trace_documentation_example():
+	program = trace(lambda x: [x[0] * x[1], ef.sin(x[0])], 2)
+	value, jacobian = program([0, 3])
+	assert np.all(value == np.array([0, 0]))
+	assert np.all(jacobian == np.array([[3, 0], [1, 0]]))
+	assert 'def program(x):' in program.source
+
+def test_trace_rosenbrock():
+	program = trace(rosenbrock, 6)
+	for x in [np.linspace(-1, 1, 6), np.arange(6.0), np.ones(6)]:
+		value, jacobian = program(x)
+		assert np.allclose(value, rosenbrock(x))
+		assert np.allclose(jacobian, rosenbrock_gradient(x))
+
+@pytest.mark.parametrize("name", ["sin", "cos", "tan", "arcsin", "arccos", "arctan",
+	"sinh", "cosh", "tanh", "arcsinh", "arctanh", "exp", "log", "log10", "sqrt", "logistic"])
+def test_trace_elemFunctions(name):
+	f = lambda x: getattr(ef, name)(0.3 * x[0] + x[1] / 5)
+	program = trace(f, 2)
+	value, jacobian = program([0.5, 0.7])
+	expected_value, expected_jacobian = autodiff_jacobian(f, [0.5, 0.7])
+	assert np.allclose(value, expected_value)
+	assert np.allclose(jacobian, expected_jacobian)
+
+def test_trace_operators():
+	f = lambda x: [ef.arccosh(x[0] + x[1] + 1), ef.logbase(x[0], 3), x[0]**x[1], 2**x[0],
+		x[1]**3, 1 / x[0], x[0] / x[1], -x[0], abs(x[1] - 1), x[0] - x[1]]
+	program = trace(f, 2)
+	value, jacobian = program([0.5, 0.7])
+	expected_value, expected_jacobian = autodiff_jacobian(f, [0.5, 0.7])
+	assert np.allclose(value, expected_value)
+	assert np.allclose(jacobian, expected_jacobian)
+
+def test_trace_rsub():
+	value, jacobian = trace(lambda x: 3 - x[0] * x[1], 2)([2, 5])
+	assert np.all(value == np.array([-7]))
+	assert np.all(jacobian == np.array([[-5, -2]]))
+
+def test_trace_constant_and_input_outputs():
+	program = trace(lambda x: [x[1], 4.0, x[0] * 0], 2)
+	value, jacobian = program([2, 3])
+	assert np.all(value == np.array([3, 4, 0]))
+	assert np.all(jacobian == np.array([[0, 1], [0, 0], [0, 0]]))
+
+def test_program_results_not_shared():
+	program = trace(lambda x: x[0]**2, 1)
+	value, jacobian = program([2])
+	program([3])
+	assert np.all(jacobian == np.array([[4]]))
+
+# optimization tests
+def test_optimizeGraph_merges_common_subexpressions():
+	graph = Graph()
+	x, y, z = graph.variables(3)
+	outputs = [(x * z + y).index, (z * x - y).index, ef.exp(x * z).index]
+	optimized, outputs, eliminated = optimizeGraph(graph, outputs)
+	assert eliminated == 2
+	assert [node[0] for node in optimized.nodes].count('mul') == 1
+	assert len(set(outputs)) == 3
+
+def test_optimizeGraph_folds_constants():
+	graph = Graph()
+	x, y = graph.variables(2)
+	f = y + ef.exp(x - x) * 3 + 0 * ef.sin(x)
+	optimized, outputs, eliminated = optimizeGraph(graph, [f.index])
+	assert optimized.nodes[outputs[0]][0] == 'add'
+	assert optimized.nodes[optimized.nodes[outputs[0]][1][1]] == ('const', (), 3.0)
+	assert len(optimized) == 4
+
+def test_optimizeGraph_neutral_operands():
+	graph = Graph()
+	x, = graph.variables(1)
+	outputs = [(x * 1).index, (1 * x + 0).index, (x / 1).index, (x**1 - 0).index, (x**0).index]
+	optimized, outputs, eliminated = optimizeGraph(graph, outputs)
+	assert outputs[:4] == [0, 0, 0, 0]
+	assert optimized.nodes[outputs[4]] == ('const', (), 1.0)
+
+def test_optimizeGraph_keeps_inputs():
+	graph = Graph()
+	x, y = graph.variables(2)
+	optimized, outputs, eliminated = optimizeGraph(graph, [(x * 2).index])
+	assert optimized.nodes[:2] == [('input', (), 0), ('input', (), 1)]
+
+def test_trace_optimized_matches_unoptimized():
+	f = lambda x: [ef.exp(x[0] * x[1]) + ef.sin(x[0]), ef.cos(x[0]) * ef.exp(x[1] * x[0]),
+		x[0] * (x[1] - x[1]) + ef.tanh(x[1])**2, 3 - x[0] * 1]
+	optimized = trace(f, 2)
+	plain = trace(f, 2, optimize=False)
+	assert optimized.eliminated > 0
+	assert plain.eliminated == 0
+	for x in [[0.3, 0.4], [-1, 2]]:
+		value, jacobian = optimized(x)
+		expected_value, expected_jacobian = plain(x)
+		assert np.allclose(value, expected_value)
+		assert np.allclose(jacobian, expected_jacobian)
+
+def test_trace_reuses_values_in_derivatives():
+	program = trace(lambda x: [ef.sin(x[0]), ef.cos(x[0])], 1)
+	# The derivative of sin reuses the value of cos
+	assert program.source.count('cos(') == 1
+	assert np.allclose(program([0.5])[1], np.array([[np.cos(0.5)], [-np.sin(0.5)]]))
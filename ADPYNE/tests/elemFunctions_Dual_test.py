@@ -673,4 +673,15 @@ def test_logistic_types():
 	with pytest.raises(TypeError):
 		ef.logistic('x')
 	with pytest.raises(TypeError):
-		ef.logistic("1234")
\ No newline at end of file
+		ef.logistic("1234")
+# ------------NESTED DUALS----------------#
+
+@pytest.mark.parametrize("name", ["sin", "cos", "arcsin", "arccos", "arctan",
+	"sinh", "cosh", "tanh", "arcsinh", "arctanh", "exp", "log", "log10", "sqrt", "logistic"])
+def test_nested_dual_results(name):
+	# Higher order derivatives from makeHighestOrder match the Taylor coefficients
+	from ADPYNE.Taylor import Taylor
+	f = getattr(ef, name)(Dual(0.5, 1).makeHighestOrder(3))
+	f.buildCoefficients(3)
+	expected = getattr(ef, name)(Taylor(0.5, 3)).coefficients
+	assert np.allclose(np.array(f.coefficients, dtype=float), expected)
@@ -705,3 +705,24 @@ def test_logistic_types():
 		ef.logistic('x')
 	with pytest.raises(TypeError):
 		ef.logistic("1234")
+
+# ------------INPUT KINDS----------------#
+
+def test_kind():
+	from ADPYNE.Dual import Dual
+	from ADPYNE.Reverse import Tape
+	assert ef._kind(AutoDiff(1, 1)) == 'AutoDiff'
+	assert ef._kind(Dual(1, 1)) == 'Dual'
+	assert ef._kind(Dual(np.array([1, 2]), 1)) == 'Dual'
+	assert ef._kind(Dual(Dual(1, 1), 1)) == 'nestedDual'
+	assert ef._kind(Dual(Tape().variable(1), 1)) == 'nestedDual'
+	assert ef._kind(Tape().variable(1)) == 'Reverse'
+	for constant in [1, 1.5, np.float64(2), np.array([1, 2]), [1, 2], 'x']:
+		assert ef._kind(constant) == 'constant'
+
+def test_kind_subclass():
+	class MyAutoDiff(AutoDiff):
+		pass
+	x = MyAutoDiff(0.5, 1)
+	assert ef._kind(x) == 'AutoDiff'
+	assert ef.sin(x).der == np.array([[np.cos(0.5)]])
@@ -0,0 +1,58 @@
+'''
+Per-operation overhead of building AutoDiff results.
+
+Every operator and elementary function used to build its result through
+AutoDiff(..., k=0, jacobian), which re-runs the value conversion, jacobian and
+derivative checks of __init__. They now wrap the computed arrays directly with
+AutoDiff._fromArrays. This compares both construction paths on long expression
+chains.
+
+Run from the repository root with:
+	python benchmarks/construction_benchmark.py
+'''
+import timeit
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+from ADPYNE.AutoDiff import AutoDiff
+import ADPYNE.elemFunctions as ef
+
+def _checkedFromArrays(eval_value, der_value, n, jacobian_value, seed=None):
+	# The construction path used before _fromArrays existed. Lazy results have no der
+	# yet, and compute it from the seed when it is accessed
+	ad = AutoDiff(eval_value, der_value, n, 0, jacobian_value)
+	ad.seed = seed
+	return ad
+
+def chain(length, n):
+	x = AutoDiff(0.5, 1, n=n, k=1)
+	y = AutoDiff(1.5, 1, n=n, k=n)
+	f = x
+	for i in range(length):
+		f = ef.sin(f * y + x) / 2
+	return f
+
+def timeChain(length, n, repeat=5):
+	return min(timeit.repeat(lambda: chain(length, n), number=1, repeat=repeat))
+
+def run(lengths=(10, 100, 1000), widths=(1, 100)):
+	fast = AutoDiff.__dict__['_fromArrays']
+	results = []
+	for n in widths:
+		for length in lengths:
+			AutoDiff._fromArrays = staticmethod(_checkedFromArrays)
+			try:
+				checked = timeChain(length, n)
+			finally:
+				AutoDiff._fromArrays = fast
+			direct = timeChain(length, n)
+			# Each link of the chain performs four operations
+			ops = 4 * length
+			results.append((n, length, 1e6 * checked / ops, 1e6 * direct / ops))
+	return results
+
+if __name__ == '__main__':
+	print("{:>6} {:>8} {:>18} {:>18} {:>8}".format("n", "length", "checked (us/op)", "direct (us/op)", "speedup"))
+	for n, length, checked, direct in run():
+		print("{:>6} {:>8} {:>18.2f} {:>18.2f} {:>7.2f}x".format(n, length, checked, direct, checked / direct))
@@ -0,0 +1,56 @@
+'''
+Per-call latency of the elementary functions for each kind of input.
+
+The elementary functions used to find the type of their input by trying x.val,
+then x.Real, and catching AttributeError at each step, so Dual numbers and
+constants raised one to three exceptions per call. They now look up the kind of
+the input type in a table (elemFunctions._kind) and never raise on the way to
+their implementation. This times one call of each function for every kind.
+
+Run from the repository root with:
+	python benchmarks/dispatch_benchmark.py
+'''
+import timeit
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+import numpy as np
+from ADPYNE.AutoDiff import AutoDiff
+from ADPYNE.Dual import Dual
+from ADPYNE.Reverse import Tape
+from ADPYNE.Taylor import Taylor
+from ADPYNE.Pattern import makePatternVars
+from ADPYNE.Trace import Graph
+import ADPYNE.elemFunctions as ef
+
+FUNCTIONS = ['sin', 'exp', 'log', 'sqrt', 'tanh']
+
+def inputs():
+	return [
+		('AutoDiff', AutoDiff(0.5, 1)),
+		('Dual', Dual(0.5, 1)),
+		('nestedDual', Dual(Dual(0.5, 1), Dual(1, 0))),
+		('Reverse', Tape().variable(0.5)),
+		('Taylor', Taylor(0.5, 2)),
+		('Pattern', makePatternVars(1)[0]),
+		('Traced', Graph().variables(1)[0]),
+		('float', 0.5),
+		('ndarray', np.array([0.5, 0.25])),
+	]
+
+def run(functions=FUNCTIONS, number=2000, repeat=5):
+	results = []
+	for kind, x in inputs():
+		row = []
+		for name in functions:
+			func = getattr(ef, name)
+			seconds = min(timeit.repeat(lambda: func(x), number=number, repeat=repeat))
+			row.append(1e6 * seconds / number)
+		results.append((kind, row))
+	return results
+
+if __name__ == '__main__':
+	print("{:>12}".format("us/call") + "".join("{:>10}".format(name) for name in FUNCTIONS))
+	for kind, row in run():
+		print("{:>12}".format(kind) + "".join("{:>10.2f}".format(t) for t in row))
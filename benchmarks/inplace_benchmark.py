@@ -0,0 +1,92 @@
+'''
+Allocations and time of accumulation loops over many AutoDiff terms.
+
+A loop like total = total + term creates a new AutoDiff object and new val, der and
+jacobian arrays for every term. total += term adds into the arrays of total instead,
+when nothing else references them. sumTerms and dotTerms copy the first term into an
+accumulator that no other object shares arrays with, and add every later term into
+its arrays in place; runs of terms with the same shapes are stacked and summed with
+one NumPy reduction. This counts the AutoDiff objects and result arrays created
+while summing the terms (by wrapping AutoDiff._fromArrays), the peak memory traced
+by tracemalloc, and the time per term.
+
+Run from the repository root with:
+	python benchmarks/inplace_benchmark.py
+'''
+import timeit
+import tracemalloc
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+import numpy as np
+from ADPYNE.AutoDiff import AutoDiff, sumTerms, dotTerms
+
+def make_terms(n_terms, n, scalar):
+	# Scalar terms have a 1 by n jacobian, vector terms an n by n one
+	x = AutoDiff(np.linspace(0.1, 0.9, n), 1, n=n, k=list(range(1, n + 1)))
+	terms = [(x[i % n] if scalar else x) * (i + 1) for i in range(n_terms)]
+	return terms, np.linspace(-1, 1, n_terms)
+
+def add_loop(terms, weights):
+	total = 0
+	for term in terms:
+		total = total + term
+	return total
+
+def iadd_loop(terms, weights):
+	# Multiplying by 1.0 gives total arrays of its own, so += can update them
+	total = terms[0] * 1.0
+	for term in terms[1:]:
+		total += term
+	return total
+
+def sum_terms(terms, weights):
+	return sumTerms(terms)
+
+def dot_loop(terms, weights):
+	total = 0
+	for weight, term in zip(weights, terms):
+		total = total + weight * term
+	return total
+
+def dot_terms(terms, weights):
+	return dotTerms(weights, terms)
+
+METHODS = [('total = total + term', add_loop), ('total += term', iadd_loop), ('sumTerms', sum_terms),
+	('total = total + w * term', dot_loop), ('dotTerms', dot_terms)]
+
+def count(method, terms, weights):
+	# AutoDiff objects and the distinct arrays handed to them while method runs
+	created = [0, 0]
+	fromArrays = AutoDiff.__dict__['_fromArrays']
+	def counting(cls, eval_value, der_value, n, jacobian_value, seed=None):
+		created[0] += 1
+		created[1] += len(set(id(a) for a in (eval_value, der_value, jacobian_value) if a is not None))
+		return fromArrays.__func__(cls, eval_value, der_value, n, jacobian_value, seed)
+	AutoDiff._fromArrays = classmethod(counting)
+	try:
+		tracemalloc.start()
+		method(terms, weights)
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+	finally:
+		AutoDiff._fromArrays = fromArrays
+	return created[0], created[1], peak
+
+def run(n_terms=2000, n=100, scalar=True, number=5, repeat=3):
+	terms, weights = make_terms(n_terms, n, scalar)
+	results = []
+	for name, method in METHODS:
+		objects, arrays, peak = count(method, terms, weights)
+		seconds = min(timeit.repeat(lambda: method(terms, weights), number=number, repeat=repeat)) / number
+		results.append((name, objects, arrays, peak, seconds))
+	return results
+
+if __name__ == '__main__':
+	n_terms, n = 2000, 100
+	for scalar in [True, False]:
+		print("\n{} {} terms with {} inputs".format(n_terms, 'scalar' if scalar else 'vector', n))
+		print("{:<28}{:>10}{:>10}{:>12}{:>12}".format("", "objects", "arrays", "peak KiB", "us/term"))
+		for name, objects, arrays, peak, seconds in run(n_terms, n, scalar):
+			print("{:<28}{:>10}{:>10}{:>12.1f}{:>12.2f}".format(name, objects, arrays, peak / 1024, 1e6 * seconds / n_terms))
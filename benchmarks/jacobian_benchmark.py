@@ -0,0 +1,62 @@
+'''
+Time of each Jacobian mode across input and output dimensions.
+
+jacobian(f, x) picks forward, reverse or sparse mode from the number of inputs n, the
+number of outputs m and the sparsity pattern of f, using the relative costs in
+ADPYNE/Jacobian.py. This times every mode on dense functions of several shapes and on
+a sparse (tridiagonal) system, and shows the mode jacobian chose next to the fastest one.
+Reverse mode is not timed for more than MAX_SWEEPS outputs, where it takes seconds.
+
+Run from the repository root with:
+	python benchmarks/jacobian_benchmark.py
+'''
+import timeit
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+import numpy as np
+from ADPYNE.Jacobian import jacobian
+import ADPYNE.elemFunctions as ef
+
+MODES = ['forward', 'reverse', 'sparse']
+SHAPES = [(10, 1), (10, 10), (10, 100), (100, 1), (100, 10), (100, 100), (1000, 1), (1000, 10), (3000, 1), (3000, 10)]
+SPARSE = [100, 1000, 3000]
+MAX_SWEEPS = 100
+
+def dense(n, m):
+	# Every output depends on every input
+	def f(x):
+		s = 0
+		for i in range(n):
+			s = s + ef.sin(x[i]) * x[(i + 1) % n]
+		return [s * (j + 1) + x[j % n]**2 for j in range(m)]
+	return f
+
+def tridiagonal(n):
+	def f(x):
+		return [(x[i-1] if i > 0 else 0) - 2*x[i] + (x[i+1] if i < n - 1 else 0) + ef.exp(x[i]) / 100 for i in range(n)]
+	return f
+
+def cases():
+	for n, m in SHAPES:
+		yield "dense", n, m, dense(n, m)
+	for n in SPARSE:
+		yield "tridiagonal", n, n, tridiagonal(n)
+
+def run(number=1, repeat=3):
+	for name, n, m, f in cases():
+		x = np.linspace(0.1, 0.9, n)
+		times = {}
+		for mode in MODES:
+			if (mode == 'sparse' and name == 'dense') or (mode == 'reverse' and m > MAX_SWEEPS):
+				continue
+			times[mode] = 1e3 * min(timeit.repeat(lambda: jacobian(f, x, mode), number=number, repeat=repeat)) / number
+		chosen = jacobian(f, x)[2]
+		yield name, n, m, times, chosen
+
+if __name__ == '__main__':
+	print("{:>12}{:>6}{:>6}".format("ms", "n", "m") + "".join("{:>10}".format(mode) for mode in MODES) + "{:>10}{:>10}".format("chosen", "fastest"))
+	for name, n, m, times, chosen in run():
+		cells = "".join("{:>10.2f}".format(times[mode]) if mode in times else "{:>10}".format("-") for mode in MODES)
+		print("{:>12}{:>6}{:>6}".format(name, n, m) + cells + "{:>10}{:>10}".format(chosen, min(times, key=times.get)))
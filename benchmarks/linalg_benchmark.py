@@ -0,0 +1,61 @@
+'''
+Least-squares objectives with the AutoDiff reductions and matrix products.
+
+sum((A @ x - b)**2) used to need one AutoDiff object per input and a Python loop
+over the entries of A, creating an intermediate object per multiply and add. With
+matmul and sum on a vector AutoDiff the same objective is a handful of array
+operations, and the jacobian goes through A in a single matrix product. This
+compares both with evaluating the value and analytic gradient 2 A^T (A x - b)
+in plain NumPy. Forward mode still carries an m by n jacobian through A, so the
+lazy mode, which skips der, is timed as well.
+
+Run from the repository root with:
+	python benchmarks/linalg_benchmark.py
+'''
+import timeit
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+import numpy as np
+from ADPYNE.AutoDiff import AutoDiff, sumTerms, dotTerms
+import ADPYNE.AutoDiff
+
+def problem(m, n):
+	rng = np.random.default_rng(0)
+	return rng.normal(size=(m, n)), rng.normal(size=(m, 1)), rng.normal(size=n)
+
+def loops(A, b, x0):
+	# One scalar AutoDiff variable per input, combined entry by entry
+	n = len(x0)
+	x = [AutoDiff(x0[j], 1, n=n, k=j + 1) for j in range(n)]
+	return sumTerms((dotTerms(A[i], x) - b[i, 0])**2 for i in range(len(A)))
+
+def vectorized(A, b, x0, lazy=False):
+	x = AutoDiff(x0, 1, n=len(x0), k=list(range(1, len(x0) + 1)), lazy=lazy)
+	return ADPYNE.AutoDiff.sum((A @ x - b)**2)
+
+def analytic(A, b, x0):
+	residual = A @ x0.reshape(-1, 1) - b
+	return residual.T @ residual, 2 * residual.T @ A
+
+def best(f, *args, repeat=5):
+	number = 1
+	while timeit.timeit(lambda: f(*args), number=number) < 0.05:
+		number *= 2
+	return min(timeit.repeat(lambda: f(*args), number=number, repeat=repeat)) / number
+
+def run(shapes=((50, 10), (200, 50), (1000, 200))):
+	results = []
+	for m, n in shapes:
+		A, b, x0 = problem(m, n)
+		assert np.allclose(loops(A, b, x0).jacobian, vectorized(A, b, x0).jacobian)
+		assert np.allclose(vectorized(A, b, x0).jacobian, analytic(A, b, x0)[1])
+		results.append((m, n, best(loops, A, b, x0), best(vectorized, A, b, x0), best(vectorized, A, b, x0, True),
+			best(analytic, A, b, x0)))
+	return results
+
+if __name__ == '__main__':
+	print("{:>6} {:>6} {:>12} {:>14} {:>12} {:>12} {:>9}".format("m", "n", "loops (ms)", "vector (ms)", "lazy (ms)", "numpy (ms)", "speedup"))
+	for m, n, slow, fast, lazy, reference in run():
+		print("{:>6} {:>6} {:>12.3f} {:>14.3f} {:>12.3f} {:>12.3f} {:>8.0f}x".format(m, n, 1e3 * slow, 1e3 * fast, 1e3 * lazy, 1e3 * reference, slow / fast))
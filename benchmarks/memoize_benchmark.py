@@ -0,0 +1,67 @@
+'''
+Repeated value and gradient requests with and without the Memoized cache.
+
+A backtracking line search asks for the value and gradient at the current point
+again on every iteration, at the accepted step that becomes the next point, and
+callbacks such as logging ask once more. Memoized answers every repeated point
+from its cache. This times one evaluation, one cache hit, and a gradient descent
+run with both.
+
+Run from the repository root with:
+	python benchmarks/memoize_benchmark.py
+'''
+import timeit
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+import numpy as np
+from ADPYNE.Memoize import Memoized, _evaluate
+from ADPYNE.AutoDiff import sumTerms
+
+def rosenbrock(x):
+	return sumTerms(100 * (x[i+1] - x[i]**2)**2 + (1 - x[i])**2 for i in range(len(x) - 1))
+
+class Uncached():
+	# The same interface as Memoized, evaluating every call
+	def __init__(self, f):
+		self.f = f
+		self.misses = 0
+
+	def __call__(self, x):
+		self.misses += 1
+		return _evaluate(self.f, np.asarray(x, dtype=float).ravel())
+
+def descend(objective, x, iterations=20):
+	# Gradient descent with a backtracking line search and a logging call per iteration
+	for i in range(iterations):
+		value, J = objective(x)
+		step = 1e-3
+		while objective(x - step * J[0])[0][0] > value[0] - 1e-4 * step * J[0] @ J[0]:
+			step /= 2
+		x = x - step * J[0]
+		objective(x)
+	return x
+
+def run(n=50, repeat=3):
+	x = np.linspace(-1, 1, n)
+	cached = Memoized(rosenbrock)
+	cached(x)
+	miss = min(timeit.repeat(lambda: _evaluate(rosenbrock, x), number=10, repeat=repeat)) / 10
+	hit = min(timeit.repeat(lambda: cached(x), number=1000, repeat=repeat)) / 1000
+	results = []
+	for wrapper in [Uncached, Memoized]:
+		# A new wrapper for every run, so no run starts with a filled cache
+		objectives = []
+		def descendFresh():
+			objectives.append(wrapper(rosenbrock))
+			descend(objectives[-1], x)
+		seconds = min(timeit.repeat(descendFresh, number=1, repeat=repeat))
+		results.append((seconds, objectives[-1].misses))
+	return miss, hit, results
+
+if __name__ == '__main__':
+	miss, hit, ((slow, slow_evaluations), (fast, fast_evaluations)) = run()
+	print("evaluation {:.3f} ms, cache hit {:.2f} us".format(1e3 * miss, 1e6 * hit))
+	print("gradient descent: {:.1f} ms with {} evaluations uncached, {:.1f} ms with {} evaluations cached".format(
+		1e3 * slow, slow_evaluations, 1e3 * fast, fast_evaluations))
@@ -0,0 +1,234 @@
+'''
+Benchmark suite for the hot paths of ADPYNE.
+
+Covers AutoDiff construction, each binary operator, each elementary function for
+AutoDiff, Dual and constant inputs, vectorize at growing m and n,
+makeHighestOrder/buildCoefficients at growing order, the Hessian class and the
+reductions and matrix products of vector AutoDiff objects. Every
+benchmark is timed with timeit (the best of several repeats of an autoranged
+number of calls) and the results are written as JSON together with the commit
+they were measured at, so runs can be compared across commits.
+
+Run from the repository root with:
+	python benchmarks/suite.py
+	python benchmarks/suite.py --filter elemFunctions.sin --output sin.json
+	python benchmarks/suite.py --compare benchmarks/results/<old commit>.json
+
+Without --output the results go to benchmarks/results/<commit>.json. With
+--compare every benchmark is printed next to its old time, and those more than
+--threshold slower are marked as regressions (the exit status is then 1).
+'''
+import argparse
+import json
+import platform
+import subprocess
+import time
+import timeit
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+import numpy as np
+from ADPYNE.AutoDiff import AutoDiff, vectorize
+import ADPYNE.AutoDiff
+from ADPYNE.Dual import Dual, makeHessianVars
+from ADPYNE.Hessian import Hessian
+import ADPYNE.elemFunctions as ef
+
+FUNCTIONS = ['sin', 'cos', 'tan', 'arcsin', 'arccos', 'arctan', 'sinh', 'cosh', 'tanh',
+	'arcsinh', 'arccosh', 'arctanh', 'exp', 'log', 'log10', 'sqrt', 'logistic']
+OPERATORS = {'add': lambda a, b: a + b, 'sub': lambda a, b: a - b, 'mul': lambda a, b: a * b,
+	'truediv': lambda a, b: a / b, 'pow': lambda a, b: a ** b}
+SHAPES = [(1, 1), (10, 10), (100, 10), (10, 100), (100, 100)]
+ORDERS = [2, 3, 4, 5, 6]
+
+# Every benchmark is a name and a function that sets it up and returns the call to time
+BENCHMARKS = {}
+
+def benchmark(name):
+	def register(setup):
+		BENCHMARKS[name] = setup
+		return setup
+	return register
+
+def _point(name):
+	# arccosh is only defined above 1, the other functions at 0.5
+	return 1.5 if name == 'arccosh' else 0.5
+
+# AutoDiff construction
+@benchmark('construction.scalar')
+def _():
+	return lambda: AutoDiff(1.5, 1)
+
+@benchmark('construction.seeded')
+def _():
+	return lambda: AutoDiff(1.5, 1, n=10, k=3)
+
+@benchmark('construction.vector')
+def _():
+	x = np.linspace(0, 1, 100)
+	return lambda: AutoDiff(x, 1)
+
+# Binary operators between two AutoDiff objects and with a constant
+def _operator(op, reflected):
+	x = AutoDiff(1.5, 1, n=3, k=1)
+	y = AutoDiff(0.5, 1, n=3, k=2)
+	if reflected:
+		return lambda: op(2.0, x)
+	return lambda: op(x, y)
+
+for _name, _op in OPERATORS.items():
+	benchmark('operator.{}'.format(_name))(lambda op=_op: _operator(op, False))
+	benchmark('operator.r{}'.format(_name))(lambda op=_op: _operator(op, True))
+
+# Elementary functions for each input kind
+def _elemFunction(name, kind):
+	func = getattr(ef, name)
+	x = _point(name)
+	value = {'AutoDiff': AutoDiff(x, 1, n=3, k=1), 'Dual': Dual(x, 1), 'constant': x}[kind]
+	return lambda: func(value)
+
+for _name in FUNCTIONS:
+	for _kind in ['AutoDiff', 'Dual', 'constant']:
+		benchmark('elemFunctions.{}.{}'.format(_name, _kind))(lambda name=_name, kind=_kind: _elemFunction(name, kind))
+
+# vectorize of m outputs of n variables
+def _vectorize(m, n):
+	x = AutoDiff(0.5, 1, n=n, k=1)
+	outputs = [x * (i + 1) for i in range(m)]
+	return lambda: vectorize(outputs, n)
+
+for _m, _n in SHAPES:
+	benchmark('vectorize.m{}.n{}'.format(_m, _n))(lambda m=_m, n=_n: _vectorize(m, n))
+
+# Nested Dual numbers of growing order
+def _makeHighestOrder(order):
+	x = Dual(0.5, 1)
+	return lambda: x.makeHighestOrder(order)
+
+def _buildCoefficients(order):
+	f = ef.sin(Dual(0.5, 1).makeHighestOrder(order)) * 3
+	return lambda: f.buildCoefficients(order)
+
+for _order in ORDERS:
+	benchmark('makeHighestOrder.order{}'.format(_order))(lambda order=_order: _makeHighestOrder(order))
+	benchmark('buildCoefficients.order{}'.format(_order))(lambda order=_order: _buildCoefficients(order))
+
+# Hessian class
+def _rosenbrock(x):
+	f = 0
+	for i in range(len(x) - 1):
+		f = f + 100 * (x[i+1] - x[i]**2)**2 + (1 - x[i])**2
+	return f
+
+@benchmark('Hessian.dual')
+def _():
+	def run():
+		x, y = makeHessianVars(Dual(1.5, np.array([1, 0])), Dual(0.5, np.array([0, 1])))
+		return Hessian(x**2 * y**3)
+	return run
+
+for _n in [2, 10, 50]:
+	benchmark('Hessian.rosenbrock.n{}'.format(_n))(lambda n=_n: (lambda: Hessian(_rosenbrock, np.linspace(0, 1, n))))
+
+# Reductions and matrix products of a vector of 100 variables
+MATRIX = np.linspace(-1, 1, 10000).reshape(100, 100)
+LINALG = {'sum': ADPYNE.AutoDiff.sum, 'prod': ADPYNE.AutoDiff.prod, 'norm': ADPYNE.AutoDiff.norm,
+	'matmul': lambda x: MATRIX @ x}
+
+def _linalg(func):
+	x = AutoDiff(np.linspace(0.5, 1.5, 100), 1, n=100, k=list(range(1, 101)))
+	return lambda: func(x)
+
+for _name, _func in LINALG.items():
+	benchmark('linalg.{}'.format(_name))(lambda func=_func: _linalg(func))
+
+def measure(call, repeat=5, budget=0.02):
+	'''
+	INPUTS
+	======
+	call: 		the function to time, called without arguments
+	repeat: 	the number of timing runs to take the best of
+	budget: 	the least time in seconds every timing run should take
+
+	RETURNS
+	=======
+	The best time of one call in seconds and the number of calls in every timing run.
+	'''
+	timer = timeit.Timer(call)
+	number = 1
+	while timer.timeit(number) < budget:
+		number *= 2
+	return min(timer.repeat(repeat=repeat, number=number)) / number, number
+
+def _commit():
+	try:
+		return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=parentdir, stderr=subprocess.DEVNULL).decode().strip()
+	except (OSError, subprocess.CalledProcessError):
+		return 'unknown'
+
+def run(names, repeat=5, budget=0.02):
+	results = {}
+	for name in names:
+		seconds, number = measure(BENCHMARKS[name](), repeat, budget)
+		results[name] = {'seconds': seconds, 'number': number, 'repeat': repeat}
+		print("{:<40}{:>12.3f} us".format(name, 1e6 * seconds), flush=True)
+	return {
+		'commit': _commit(),
+		'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+		'python': platform.python_version(),
+		'numpy': np.__version__,
+		'machine': platform.machine(),
+		'results': results,
+	}
+
+def compare(new, old, threshold):
+	'''
+	Print every benchmark in both runs with its old and new time, and return the
+	names of those that got slower by more than the threshold fraction.
+	'''
+	regressions = []
+	print("\n{:<40}{:>12}{:>12}{:>9}".format("compared with " + old.get('commit', '?'), "old us", "new us", "ratio"))
+	for name, result in new['results'].items():
+		if name not in old['results']:
+			continue
+		before = old['results'][name]['seconds']
+		ratio = result['seconds'] / before
+		mark = ''
+		if ratio > 1 + threshold:
+			regressions.append(name)
+			mark = '  slower'
+		print("{:<40}{:>12.3f}{:>12.3f}{:>9.2f}{}".format(name, 1e6 * before, 1e6 * result['seconds'], ratio, mark))
+	return regressions
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Time the hot paths of ADPYNE and record the results as JSON.")
+	parser.add_argument('--filter', default='', help="only run benchmarks whose name contains this text")
+	parser.add_argument('--output', help="JSON file to write, benchmarks/results/<commit>.json by default")
+	parser.add_argument('--compare', help="JSON file of an earlier run to compare with")
+	parser.add_argument('--threshold', type=float, default=0.2, help="fraction slower that counts as a regression")
+	parser.add_argument('--repeat', type=int, default=5, help="timing runs to take the best of")
+	parser.add_argument('--list', action='store_true', help="list the benchmark names and exit")
+	args = parser.parse_args(argv)
+
+	names = [name for name in BENCHMARKS if args.filter in name]
+	if args.list:
+		print("\n".join(names))
+		return 0
+	results = run(names, args.repeat)
+	output = args.output or os.path.join(currentdir, 'results', '{}.json'.format(results['commit']))
+	if os.path.dirname(output):
+		os.makedirs(os.path.dirname(output), exist_ok=True)
+	with open(output, 'w') as file:
+		json.dump(results, file, indent=1, sort_keys=True)
+	print("\nwrote {}".format(output))
+	if args.compare:
+		with open(args.compare) as file:
+			regressions = compare(results, json.load(file), args.threshold)
+		if regressions:
+			print("\n{} regression(s): {}".format(len(regressions), ", ".join(regressions)))
+			return 1
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,51 @@
+'''
+Setup cost of n independent input variables.
+
+Creating the inputs one at a time with AutoDiff(values[k-1], 1, n=n, k=k) gives
+every variable its own jacobian and derivative rows of n entries, which takes
+O(n^2) time and memory. variables(values) makes every row a read-only view of one
+seed times identity held in an array of length 2n - 1. This reports the time and
+the peak memory traced by tracemalloc for both.
+
+Run from the repository root with:
+	python benchmarks/variables_benchmark.py
+'''
+import timeit
+import tracemalloc
+import os,sys,inspect
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0,parentdir)
+import numpy as np
+from ADPYNE.AutoDiff import AutoDiff, variables
+
+def one_at_a_time(values):
+	n = len(values)
+	return [AutoDiff(values[k], 1, n=n, k=k + 1) for k in range(n)]
+
+def shared(values):
+	return variables(values)
+
+def peak(f, *args):
+	tracemalloc.start()
+	result = f(*args)
+	memory = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	del result
+	return memory
+
+def run(sizes=(100, 1000, 5000), repeat=3):
+	results = []
+	for n in sizes:
+		values = np.linspace(-1, 1, n)
+		row = [n]
+		for setup in [one_at_a_time, shared]:
+			row.append(min(timeit.repeat(lambda: setup(values), number=1, repeat=repeat)))
+			row.append(peak(setup, values))
+		results.append(row)
+	return results
+
+if __name__ == '__main__':
+	print("{:>6} {:>14} {:>15} {:>15} {:>16}".format("n", "AutoDiff (ms)", "AutoDiff (MiB)", "variables (ms)", "variables (MiB)"))
+	for n, slow, slow_memory, fast, fast_memory in run():
+		print("{:>6} {:>14.2f} {:>15.2f} {:>15.2f} {:>16.3f}".format(n, 1e3 * slow, slow_memory / 2**20, 1e3 * fast, fast_memory / 2**20))
@@ -20,9 +20,12 @@ setuptools.setup(
 	],
 	python_requires='>=3.6',
 	install_requires=[
-		'numpy>=1.16.4',
+		'numpy>=1.17',
 		'pytest>=5.2.1'
 	],
+	extras_require={
+		'sparse': ['scipy']
+	},
 	tests_require=[
 		'pytest>=5.2.1'
 	]